@@ -1,4 +1,5 @@
 #!/usr/bin/env python3
+import math
 import matplotlib.pyplot as plt
 from matplotlib.widgets import Slider
 import numpy as np
@@ -162,81 +163,104 @@ def update(val):
     draw_batches(ax, new_delta)
     fig.canvas.draw_idle()
 
+def op_white_intervals(duration, op_index, delta_min=1.0, delta_max=float('inf')):
+    """
+    Exact δ intervals where the start of operation number op_index (0 = hack,
+    1 = weaken, 2 = grow, 3 = weaken2) is white in every batch.
+
+    Batch i's op finishes at (4*i + op_index + 1)·δ, so start/δ = 4*i + op_index + 1
+    - duration/δ, and the start is white iff floor(start/δ) is even.  The 4*i
+    drops out (every batch agrees), and floor(k - x) = k - ceil(x), so the start
+    is white iff n = ceil(duration/δ) has the parity of op_index + 1.  Since
+    ceil(duration/δ) = n exactly for δ in [duration/n, duration/(n-1)), the answer
+    is those intervals for every such n (n = 1 gives [duration, ∞), the hack
+    case of white_interval), clipped to [delta_min, delta_max).
+
+    Returns a list of (lower, upper) tuples, lower-inclusive and upper-exclusive,
+    sorted by δ.
+    """
+    if duration < 0 or delta_min <= 0 or delta_max <= delta_min:
+        raise ValueError("need duration >= 0 and 0 < delta_min < delta_max")
+    if duration == 0:
+        # ceil(0/δ) = 0 for every δ: white everywhere or nowhere.
+        return [(delta_min, delta_max)] if op_index % 2 == 1 else []
+    n_lo = max(1, math.ceil(duration / delta_max))
+    n_hi = math.ceil(duration / delta_min)
+    n_lo += (n_lo - (op_index + 1)) % 2          # first n with the right parity
+    if n_lo > n_hi:
+        return []
+    n = np.arange(n_hi - (n_hi - n_lo) % 2, n_lo - 1, -2, dtype=np.float64)
+    with np.errstate(divide='ignore'):
+        upper = np.minimum(duration / (n - 1), delta_max)
+    lower = np.maximum(duration / n, delta_min)
+    keep = lower < upper
+    return list(zip(lower[keep].tolist(), upper[keep].tolist()))
+
+def feasible_delta_intervals(durations=None, ops=None, delta_min=1.0, delta_max=float('inf')):
+    """
+    Exact δ intervals where the start of every op in `ops` (default all of
+    op_order), in every batch, lands in white; `durations` maps op name to
+    duration (default op_durations).
+
+    Each op's white set is a union of lower-inclusive, upper-exclusive intervals
+    (op_white_intervals), so membership is constant between consecutive interval
+    endpoints: the intersection is found by testing every op at each endpoint
+    (one searchsorted per op) and merging the feasible runs.  The cost is
+    O(duration/delta_min · log) in NumPy, not a Python loop per δ.
+
+    Returns a list of (lower, upper) tuples, lower-inclusive and upper-exclusive,
+    sorted by δ.
+    """
+    durations = op_durations if durations is None else durations
+    ops = op_order if ops is None else ops
+    per_op = []
+    for op in ops:
+        iv = op_white_intervals(durations[op], op_order.index(op), delta_min, delta_max)
+        if not iv:
+            return []
+        per_op.append(np.array(iv, dtype=np.float64))
+    points = np.unique(np.concatenate([[delta_min, delta_max]] + [iv.ravel() for iv in per_op]))
+    starts, ends = points[:-1], points[1:]
+    ok = np.ones(starts.size, dtype=bool)
+    for iv in per_op:
+        k = np.searchsorted(iv[:, 0], starts, side='right') - 1
+        ok &= (k >= 0) & (starts < iv[np.maximum(k, 0), 1])
+    # Merge runs of feasible segments into intervals.
+    edge = np.diff(np.concatenate([[0], ok.astype(np.int8), [0]]))
+    first, last = np.flatnonzero(edge == 1), np.flatnonzero(edge == -1) - 1
+    return list(zip(starts[first].tolist(), ends[last].tolist()))
+
+def print_white_intervals(label, intervals, min_width=1.0):
+    """Print the intervals at least min_width ms wide (the narrow ones near δ = 0 are only counted)."""
+    print(f"Intervals (δ in ms) where {label} start is white:")
+    wide = [(lower, upper) for lower, upper in intervals if upper - lower >= min_width]
+    for lower, upper in wide:
+        print(f"  White: [{lower:.3f} ms, {upper:.3f} ms)")
+    if len(wide) < len(intervals):
+        print(f"  ... and {len(intervals) - len(wide)} intervals narrower than {min_width} ms")
+
 def compute_hack_red_intervals():
     """
-    Sweep candidate δ values (in ms) from 1 up to hack_time.
-    For each candidate δ, evaluate the state of the hack start (for batch 0).
-    
-    For batch 0, hack finish = δ and hack start = δ - hack_time.
-    Using get_bg_color_at, determine if that start falls in red or white.
-    Group contiguous δ values with the same state, and then print the intervals.
-    """
-    H = hack_time
-    state = None
-    intervals = []
-    start_val = None
-    for d in range(1, int(H) + 1):
-        delta_val = float(d)
-        # For batch 0 hack: finish = δ, start = δ - hack_time.
-        bg = get_bg_color_at(delta_val - H, delta_val)
-        if state is None:
-            state = bg
-            start_val = delta_val
-        elif bg != state:
-            intervals.append((state, start_val, delta_val - 1))
-            state = bg
-            start_val = delta_val
-    intervals.append((state, start_val, float(int(H))))
-    
-    # print("Intervals (δ in ms) where batch 0 hack start is red:")
-    # for st, start, end in intervals:
-    #     if st == "red":
-    #         print(f"  Red: [{start:.1f} ms, {end:.1f} ms]")
-    print("\nIntervals where batch 0 hack start is white:")
-    for st, start, end in intervals:
-        if st == "white":
-            print(f"  White: [{start:.1f} ms, {end:.1f} ms]")
+    δ intervals (in ms, from 1 up to hack_time) where the hack start is white
+    (every batch agrees), from op_white_intervals; the red ones are the gaps.
+    """
+    print()
+    print_white_intervals("hack", op_white_intervals(hack_time, 0, 1.0, hack_time))
 
 def compute_grow_white_intervals():
     """
-    Sweep candidate δ values (in ms) from 1 up to grow_time.
-    For each candidate δ, evaluate the state of the grow start (for batch 0).
-    
-    For batch 0, grow finish = 3·δ and grow start = 3·δ - grow_time.
-    Using get_bg_color_at, determine if that start falls in white (or red).
-    Group contiguous δ values with the same state, and then print the intervals.
-    """
-    G = grow_time
-    state = None
-    intervals = []
-    start_val = None
-    for d in range(1, int(G) + 1):
-        delta_val = float(d)
-        # For batch 0 grow: finish = 3δ, start = 3δ - grow_time.
-        bg = get_bg_color_at(3*delta_val - G, delta_val)
-        if state is None:
-            state = bg
-            start_val = delta_val
-        elif bg != state:
-            intervals.append((state, start_val, delta_val - 1))
-            state = bg
-            start_val = delta_val
-    intervals.append((state, start_val, float(int(G))))
-    
-    print("Intervals (δ in ms) where batch 0 grow start is white:")
-    for st, start, end in intervals:
-        if st == "white":
-            print(f"  White: [{start:.1f} ms, {end:.1f} ms]")
-    # print("\nIntervals where batch 0 grow start is red:")
-    # for st, start, end in intervals:
-    #     if st == "red":
-    #         print(f"  Red: [{start:.1f} ms, {end:.1f} ms]")
+    δ intervals (in ms, from 1 up to grow_time) where the grow start is white
+    (every batch agrees), from op_white_intervals.
+    """
+    print_white_intervals("grow", op_white_intervals(grow_time, 2, 1.0, grow_time))
 
 if __name__ == "__main__":
     # First, print the intervals for batch 0 hack and grow operations.
     compute_hack_red_intervals()
     print("\n" + "="*60 + "\n")
     compute_grow_white_intervals()
+    print("\n" + "="*60 + "\n")
+    print_white_intervals("every op", feasible_delta_intervals(delta_max=max(op_durations.values())))
     
     # Then set up the interactive visualization.
     fig, ax = plt.subplots(figsize=(12, 6))
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+δ / sleep-offset table for the in-game batcher (src/libraries/batchExecution.ts).
+
+For hack times on a geometric grid, pick the batch spacing δ with the rule of
+batch.py (every op start of every batch in a white phase): the midpoint of the
+first joint safe window (interval.py's joint_windows, smallest δ first) that is
+at least 2 * --slack ms wide, checked with feasibility_map.white_mask.  The sleep
+offsets follow calculateBatchTimings: hack, weaken1, grow, weaken2 finish at
+W - δ, W, W + δ, W + 2δ, so they sleep
+    hack = max(0, W - δ - H),  weaken1 = 0,  grow = max(0, W + δ - G),  weaken2 = 2δ
+(plus 4kδ for batch k).  weaken, grow and weaken2 take fixed multiples of the
+hack time (feasibility_map.OP_RATIOS).
+
+The table is columnar JSON written to src/data/batch-delta-table.txt by default:
+.txt under src/ is what the viteburner watch (src/**/*.{script,txt}) pushes, so
+the game has it as data/batch-delta-table.txt on home, and the batcher reads it
+with JSON.parse(ns.read(...)).  To look up hack time t: binary search hackTime
+for the last row r with hackTime[r] <= t and multiply that row's delta, lower,
+upper and sleeps by t / hackTime[r].  Every quantity is
+linear in the hack time at fixed ratios, so the scaled δ is still safe and its
+slack only grows (see lookup()).  Rows with no wide-enough window are null.
+
+    python delta_table.py --hack-min 50 --hack-max 3600000 --steps 512 --slack 2
+"""
+import argparse
+import bisect
+import json
+import math
+import os
+
+import numpy as np
+
+from feasibility_map import OP_RATIOS, white_mask
+from interval import hwgw_families, joint_windows
+
+REPO_ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+DEFAULT_OUT = os.path.join(REPO_ROOT, "src", "data", "batch-delta-table.txt")
+COLUMNS = ("delta", "lower", "upper", "hackSleep", "growSleep", "weaken2Sleep")
+
+
+def durations(hack_time, ratios=OP_RATIOS):
+    return {op: r * hack_time for op, r in ratios.items()}
+
+
+def best_window(hack_time, slack, delta_min, ratios=OP_RATIOS):
+    """First joint safe window (smallest δ) at least 2 * slack wide, or None."""
+    d = durations(hack_time, ratios)
+    # A family interval [T/n, T/(n-1)] is T/(n(n-1)) wide, so no window with
+    # n(n-1) > T/(2 * slack) can be wide enough; start the sweep past them
+    # (using the shortest duration, whose intervals are the widest).
+    t = min(d.values())
+    n_max = math.floor((1 + math.sqrt(1 + 2 * t / slack)) / 2)
+    start = max(delta_min, t / (n_max + 1))
+    families = hwgw_families(d["hack"], d["weaken"], d["grow"], d["weaken2"])
+    for w in joint_windows(families, start):
+        if w.width >= 2 * slack:
+            return w
+    return None
+
+
+def schedule(hack_time, delta, ratios=OP_RATIOS):
+    """Sleep offsets (hack, grow, weaken2) of batch 0, as calculateBatchTimings."""
+    d = durations(hack_time, ratios)
+    return (max(0.0, d["weaken"] - delta - d["hack"]),
+            max(0.0, d["weaken"] + delta - d["grow"]),
+            2 * delta)
+
+
+def build_table(hack_times, slack, delta_min, ratios=OP_RATIOS):
+    table = {"version": 1, "ratios": dict(ratios), "slack": slack, "deltaMin": delta_min,
+             "hackTime": [], **{c: [] for c in COLUMNS}}
+    for h in hack_times:
+        w = best_window(h, slack, delta_min, ratios)
+        row = None
+        if w is not None:
+            delta = (w.lower + w.upper) / 2
+            if not white_mask([h], [delta], ratios)[0, 0]:
+                raise AssertionError(f"hack_time={h}: δ={delta} from {w} fails the batch.py rule")
+            row = (delta, w.lower, w.upper) + schedule(h, delta, ratios)
+        table["hackTime"].append(round(h, 3))
+        for c, v in zip(COLUMNS, row or (None,) * len(COLUMNS)):
+            table[c].append(None if v is None else round(v, 3))
+    return table
+
+
+def lookup(table, hack_time):
+    """{column: value} for hack_time, as the batcher should compute it; None if
+    hack_time is below the table or its row has no window."""
+    r = bisect.bisect_right(table["hackTime"], hack_time) - 1
+    if r < 0 or table["delta"][r] is None:
+        return None
+    scale = hack_time / table["hackTime"][r]
+    return {c: table[c][r] * scale for c in COLUMNS}
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Precompute the batcher's δ / sleep-offset table.")
+    ap.add_argument("--hack-min", type=float, default=50.0, help="ms")
+    ap.add_argument("--hack-max", type=float, default=3600000.0, help="ms")
+    ap.add_argument("--steps", type=int, default=512, help="log-spaced hack times")
+    ap.add_argument("--slack", type=float, default=2.0, help="ms the chosen δ keeps from each window edge")
+    ap.add_argument("--delta-min", type=float, default=5.0, help="ms (DEFAULT_BATCH_DELAY_MS)")
+    ap.add_argument("--out", metavar="PATH", default=DEFAULT_OUT)
+    args = ap.parse_args()
+
+    hack_times = np.geomspace(args.hack_min, args.hack_max, args.steps).tolist()
+    table = build_table(hack_times, args.slack, args.delta_min)
+    with open(args.out, "w") as f:
+        json.dump(table, f, separators=(",", ":"))
+        f.write("\n")
+    missing = sum(v is None for v in table["delta"])
+    print(f"{len(hack_times)} rows ({missing} without a window), {os.path.getsize(args.out)} bytes -> {args.out}")
+    for h in (1000.0, 1270.5873382302843, 10000.0, 60000.0, 600000.0):
+        row = lookup(table, h)
+        if row:
+            print(f"  hack={h:>10.1f} ms  δ={row['delta']:.2f}  window=[{row['lower']:.2f}, {row['upper']:.2f}]  "
+                  f"sleeps hack={row['hackSleep']:.2f} grow={row['growSleep']:.2f} "
+                  f"weaken2={row['weaken2Sleep']:.2f}")
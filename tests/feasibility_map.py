@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Precomputed (hack_time × δ) feasibility map for HWGW batches.
+
+For every hack time on a grid and every δ on a grid, evaluate the red/white
+rule of batch.py's get_bg_color_at for the start of all four ops of every
+batch (batch i, op j finishes at (4*i + j + 1)·δ and starts its duration
+earlier), with the same float arithmetic, in NumPy.  The map is stored
+bit-packed along δ, together with a table of the best δ per hack time: the
+centre of the first run of at least `min_run` consecutive safe grid δ's, so the
+chosen δ keeps (min_run - 1) / 2 grid steps of slack on both sides.
+
+Durations are hack_time times OP_RATIOS (weaken and weaken2 take 4x, grow 3.2x
+the hack time), so feasibility only depends on δ / hack_time; the 2-D map is
+kept so other ratios can be plugged in.
+
+    python feasibility_map.py --hack-min 1000 --hack-max 600000 --hack-steps 512 --out map.npz
+"""
+import argparse
+
+import numpy as np
+
+OP_ORDER = ("hack", "weaken", "grow", "weaken2")
+OP_RATIOS = {"hack": 1.0, "weaken": 4.0, "grow": 3.2, "weaken2": 4.0}
+NUM_BATCHES = 5
+CHUNK_CELLS = 1 << 22   # grid cells evaluated per NumPy pass
+
+
+def white_mask(hack_times, deltas, ratios=OP_RATIOS, ops=OP_ORDER, num_batches=NUM_BATCHES):
+    """
+    bool array [len(hack_times), len(deltas)]: True where the start of every
+    op in `ops`, in each of the first num_batches batches, is white.
+
+    Same rule as get_bg_color_at: with r = start mod 4δ (np.mod has Python's
+    float % semantics), red is δ <= r < 2δ or 3δ <= r < 4δ.
+    """
+    hack_times = np.asarray(hack_times, dtype=np.float64)
+    deltas = np.asarray(deltas, dtype=np.float64)
+    out = np.empty((hack_times.size, deltas.size), dtype=bool)
+    rows = max(1, CHUNK_CELLS // max(1, deltas.size))
+    d = deltas[None, :]
+    period = 4 * d
+    for r0 in range(0, hack_times.size, rows):
+        h = hack_times[r0:r0 + rows, None]
+        ok = np.ones((h.shape[0], deltas.size), dtype=bool)
+        for j, op in enumerate(OP_ORDER):
+            if op not in ops:
+                continue
+            duration = ratios[op] * h
+            for i in range(num_batches):
+                r = np.mod((4 * i + j + 1) * d - duration, period)
+                ok &= ~(((d <= r) & (r < 2 * d)) | ((3 * d <= r) & (r < period)))
+        out[r0:r0 + rows] = ok
+    return out
+
+
+def best_deltas(mask, deltas, min_run=1):
+    """
+    Per row of `mask`: (best δ, lower, upper), where best δ is the centre of the
+    first run of at least min_run consecutive True cells and [lower, upper] is
+    the whole run containing it, all in δ units; NaN where no run is long enough.
+    """
+    deltas = np.asarray(deltas, dtype=np.float64)
+    n_rows, n = mask.shape
+    best = np.full((n_rows, 3), np.nan)
+    if n < min_run:
+        return best
+    # window_ok[:, k]: cells k .. k+min_run-1 are all True.
+    cs = np.concatenate([np.zeros((n_rows, 1), dtype=np.int64), np.cumsum(mask, axis=1)], axis=1)
+    window_ok = (cs[:, min_run:] - cs[:, :-min_run]) == min_run
+    has = window_ok.any(axis=1)
+    first = window_ok.argmax(axis=1)
+    for row in np.flatnonzero(has).tolist():
+        k = int(first[row])
+        end = k + int(np.argmin(mask[row, k:])) if not mask[row, k:].all() else n
+        best[row] = (deltas[k + (min_run - 1) // 2], deltas[k], deltas[end - 1])
+    return best
+
+
+def build_map(hack_times, deltas, min_run=1, ratios=OP_RATIOS, ops=OP_ORDER, num_batches=NUM_BATCHES):
+    """
+    The feasibility map as a dict of arrays (what save_map writes): hack_times,
+    deltas, packed (np.packbits of the mask along δ), and best ([len(hack_times), 3]
+    from best_deltas).
+    """
+    mask = white_mask(hack_times, deltas, ratios, ops, num_batches)
+    return {
+        "hack_times": np.asarray(hack_times, dtype=np.float64),
+        "deltas": np.asarray(deltas, dtype=np.float64),
+        "packed": np.packbits(mask, axis=1),
+        "best": best_deltas(mask, deltas, min_run),
+        "ratios": np.array([ratios[op] for op in OP_ORDER]),
+        "min_run": np.array(min_run),
+    }
+
+
+def unpack_mask(fmap):
+    """The boolean mask of a build_map / load_map result."""
+    return np.unpackbits(fmap["packed"], axis=1, count=fmap["deltas"].size).astype(bool)
+
+
+def save_map(path, fmap):
+    np.savez_compressed(path, **fmap)
+
+
+def load_map(path):
+    with np.load(path) as data:
+        return {k: data[k] for k in data.files}
+
+
+def lookup_delta(fmap, hack_time):
+    """
+    Best δ for a hack time between grid rows.  Every duration is a multiple of
+    the hack time, so the pattern only depends on δ / hack_time: the tabulated
+    best δ of the row below (then above) is scaled by hack_time / row hack time
+    and returned if a white_mask cell confirms it at hack_time; NaN if neither is.
+    """
+    hack_times = fmap["hack_times"]
+    k = int(np.searchsorted(hack_times, hack_time, side="right"))
+    ratios = dict(zip(OP_ORDER, fmap["ratios"].tolist()))
+    for row in (k - 1, k):
+        if 0 <= row < hack_times.size and not np.isnan(fmap["best"][row, 0]):
+            delta = float(fmap["best"][row, 0]) * hack_time / float(hack_times[row])
+            if white_mask([hack_time], [delta], ratios)[0, 0]:
+                return delta
+    return float("nan")
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Precompute the (hack_time x δ) HWGW feasibility map.")
+    ap.add_argument("--hack-min", type=float, default=1000.0, help="ms")
+    ap.add_argument("--hack-max", type=float, default=600000.0, help="ms")
+    ap.add_argument("--hack-steps", type=int, default=256, help="log-spaced hack times")
+    ap.add_argument("--delta-min", type=float, default=1.0, help="ms")
+    ap.add_argument("--delta-max", type=float, default=10000.0, help="ms")
+    ap.add_argument("--delta-step", type=float, default=1.0, help="ms")
+    ap.add_argument("--min-run", type=int, default=21, help="safe grid δ's the chosen δ sits in the middle of")
+    ap.add_argument("--batches", type=int, default=NUM_BATCHES)
+    ap.add_argument("--out", metavar="PATH", help="write the map (.npz)")
+    args = ap.parse_args()
+
+    hack_times = np.geomspace(args.hack_min, args.hack_max, args.hack_steps)
+    deltas = np.arange(args.delta_min, args.delta_max + args.delta_step / 2, args.delta_step)
+    fmap = build_map(hack_times, deltas, args.min_run, num_batches=args.batches)
+    mask = unpack_mask(fmap)
+    print(f"{hack_times.size} hack times x {deltas.size} δ's: {mask.mean():.1%} safe, "
+          f"{fmap['packed'].nbytes} bytes packed")
+    for h, (best, lower, upper) in zip(hack_times[::max(1, hack_times.size // 16)],
+                                       fmap["best"][::max(1, hack_times.size // 16)]):
+        print(f"  hack={h:>10.1f} ms  best δ={best:>8.1f} ms  run=[{lower:.1f}, {upper:.1f}]")
+    if args.out:
+        save_map(args.out, fmap)
+        print(f"saved {args.out}")
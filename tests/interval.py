@@ -1,4 +1,6 @@
+import heapq
 import math
+from collections import namedtuple
 
 def get_hack_interval(n, hack_time):
     """
@@ -38,61 +40,153 @@ def intersect_intervals(interval1, interval2):
 def get_cropped_intervals(n, hack_time):
     """
     Given a hack interval H(n) for index n, find all grow intervals G(m)
-    (with m chosen near 3.2*n) that intersect H(n).
+    that intersect H(n), with grow_time = 3.2 * hack_time.
 
-    The method is:
-      1. Set candidate m0 = round(3.2*n).
-      2. Search downward (decreasing m) until G(m) no longer overlaps H(n).
-      3. Search upward (increasing m) until G(m) no longer overlaps H(n).
-      4. For each m in the found range, compute the intersection
-         I = H(n) ∩ G(m).
+    The grow family is walked over the δ range of H(n) (IntervalFamily.intervals),
+    so only the overlapping G(m) are visited.
 
-    Returns a list of tuples (m, I) where I is the intersection interval.
+    Returns a list of tuples (m, I), by increasing m, where I is the intersection
+    interval.
     """
-    # Get the hack interval for n
-    H = get_hack_interval(n, hack_time)
-    
-    # Candidate m from the relation m ~ 3.2 * n.
-    candidate_m = max(1, round(3.2 * n))
-    
-    # Search downward: find the smallest m for which G(m) still overlaps H.
-    m_down = candidate_m
-    while m_down >= 1:
-        G = get_grow_interval(m_down, hack_time)
-        if intersect_intervals(H, G) is None:
-            break
-        m_down -= 1
-    m_min = m_down + 1  # last m that gave a nonempty intersection
-    
-    # Search upward: find the largest m for which G(m) overlaps H.
-    m_up = candidate_m + 1
+    lower, upper = get_hack_interval(n, hack_time)
+    grow = IntervalFamily("grow", 3.2 * hack_time)
+    return [(w.index // 2, (w.lower, w.upper)) for w in grow.intervals(lower, upper)][::-1]
+
+# --- Interval families and joint windows ---
+# An op of duration T that finishes at a multiple j·δ of the batch spacing
+# starts in a safe (white) phase on a family of δ intervals:
+#   odd family  (hack, grow; j odd):      [T/(2k+1), T/(2k)],   k = 0 gives [T, ∞)
+#   even family (weaken, weaken2; j even): [T/(2k+2), T/(2k+1)]
+# Both are [T/n, T/(n-1)] for n of one parity; `index` below is that n.
+Window = namedtuple("Window", ["lower", "upper", "index"])
+Window.width = property(lambda w: w.upper - w.lower)
+Window.__doc__ = """
+A δ interval [lower, upper].  For a family interval, index is its n; for a
+joint window, the tuple of every family's n.  The bounds are the closed-form
+T/n values: under batch.py's lower-inclusive, upper-exclusive phases an op
+starting exactly at a bound can already be red, so use a δ inside the window
+(delta_table.py and jitter_sim.py take the midpoint).
+"""
+
+class IntervalFamily:
+    """
+    The admissible-δ intervals [T/n, T/(n-1)] of one op with duration T, for
+    odd n (odd=True: hack, grow) or even n (odd=False: weaken, weaken2).
+    """
+    def __init__(self, name, duration, odd=True):
+        if duration <= 0:
+            raise ValueError(f"{name}: duration must be positive, got {duration}")
+        self.name = name
+        self.duration = duration
+        self.odd = odd
+
+    def interval(self, n):
+        """[T/n, T/(n-1)]; the upper bound is ∞ for n = 1."""
+        return (self.duration / n, self.duration / (n - 1) if n > 1 else float('inf'))
+
+    def intervals(self, delta_min, delta_max=float('inf')):
+        """
+        Yield the family's intervals clipped to [delta_min, delta_max] as
+        Windows, in increasing δ (decreasing n).  delta_min must be positive:
+        the intervals accumulate at δ = 0.
+        """
+        if delta_min <= 0:
+            raise ValueError("delta_min must be positive")
+        # Largest n whose interval reaches delta_min: T/(n-1) >= delta_min, i.e.
+        # floor(T/delta_min) + 1.  The float quotient can round just below an
+        # integer (3200 / (1000/55) = 175.999...), losing an interval that
+        # touches delta_min, so start one n of the same parity higher; intervals
+        # entirely below delta_min are dropped by the lower <= upper test.
+        n = math.floor(self.duration / delta_min) + 3
+        if n % 2 != (1 if self.odd else 0):
+            n -= 1
+        while n >= 1:
+            lower, upper = self.interval(n)
+            if lower > delta_max:
+                return
+            lower, upper = max(lower, delta_min), min(upper, delta_max)
+            if lower <= upper:
+                yield Window(lower, upper, n)
+            n -= 2
+
+    def __repr__(self):
+        return f"IntervalFamily({self.name!r}, {self.duration}, odd={self.odd})"
+
+def hwgw_families(hack_time, weaken_time, grow_time, weaken2_time=None):
+    """
+    The four families of an HWGW batch (finishes at 1δ, 2δ, 3δ, 4δ), for
+    arbitrary duration ratios; weaken2_time defaults to weaken_time.
+    """
+    return [
+        IntervalFamily("hack", hack_time, odd=True),
+        IntervalFamily("weaken", weaken_time, odd=False),
+        IntervalFamily("grow", grow_time, odd=True),
+        IntervalFamily("weaken2", weaken_time if weaken2_time is None else weaken2_time, odd=False),
+    ]
+
+def joint_windows(families, delta_min, delta_max=float('inf')):
+    """
+    Yield every δ window of positive width inside one interval of each family,
+    in increasing δ, as Windows whose index is the tuple of each family's n.
+    Intervals that only touch ([a, a]) are skipped: batch.py's half-open rule
+    puts some op start in red there.
+
+    A sweep over the families' interval streams: a min-heap keyed on each
+    family's current upper bound picks the family whose interval ends first,
+    the current intersection [max lowers, min uppers] is emitted if non-empty,
+    and that family advances to its next interval.  Every step either emits a
+    window or retires an interval, so the cost is O((windows + intervals
+    retired) · log F) for F families, with O(F) memory.
+    """
+    streams = [f.intervals(delta_min, delta_max) for f in families]
+    current = [next(s, None) for s in streams]
+    if not current or any(c is None for c in current):
+        return
+    heap = [(c.upper, i) for i, c in enumerate(current)]
+    heapq.heapify(heap)
     while True:
-        G = get_grow_interval(m_up, hack_time)
-        if intersect_intervals(H, G) is None:
-            break
-        m_up += 1
-    m_max = m_up - 1  # last m that worked
-    
-    # Collect the intersections for m in [m_min, m_max]
-    intersections = []
-    for m in range(m_min, m_max + 1):
+        upper, i = heap[0]
+        lower = max(c.lower for c in current)
+        if lower < upper:
+            yield Window(lower, upper, tuple(c.index for c in current))
+        nxt = next(streams[i], None)
+        if nxt is None:
+            return
+        current[i] = nxt
+        heapq.heapreplace(heap, (nxt.upper, i))
+
+def rank_by_throughput(windows, top=None):
+    """Windows allowing the smallest δ (most batches per second) first."""
+    windows = list(windows)
+    return heapq.nsmallest(top if top is not None else len(windows), windows, key=lambda w: w.lower)
+
+def rank_by_slack(windows, top=None):
+    """Widest windows (most timing slack around the chosen δ) first."""
+    windows = list(windows)
+    return heapq.nlargest(top if top is not None else len(windows), windows, key=lambda w: w.width)
+
+if __name__ == "__main__":
+    # --- Example usage ---
+    hack_time = 1270.5873382302843  # example hack_time value
+    n = 1  # example hack interval index
+
+    H = get_hack_interval(n, hack_time)
+    print(f"Hack interval for n={n}: {H}")
+
+    cropped_intervals = get_cropped_intervals(n, hack_time)
+    print(f"\nFor hack interval n={n}, the grow intervals that overlap (and their intersections) are:")
+    for m, inter in cropped_intervals:
         G = get_grow_interval(m, hack_time)
-        inter = intersect_intervals(H, G)
-        if inter is not None:
-            intersections.append((m, inter))
-    return intersections
-
-# --- Example usage ---
-hack_time = 1270.5873382302843  # example hack_time value
-n = 1  # example hack interval index
-
-H = get_hack_interval(n, hack_time)
-print(f"Hack interval for n={n}: {H}")
-
-cropped_intervals = get_cropped_intervals(n, hack_time)
-print(f"\nFor hack interval n={n}, the grow intervals that overlap (and their intersections) are:")
-for m, inter in cropped_intervals:
-    G = get_grow_interval(m, hack_time)
-    print(f"  For m={m}:")
-    print(f"    Grow interval G({m}) = {G}")
-    print(f"    Intersection with H({n}) = {inter}")
+        print(f"  For m={m}:")
+        print(f"    Grow interval G({m}) = {G}")
+        print(f"    Intersection with H({n}) = {inter}")
+
+    families = hwgw_families(hack_time, 4 * hack_time, 3.2 * hack_time)
+    windows = list(joint_windows(families, delta_min=1.0))
+    print(f"\n{len(windows)} joint HWGW windows for δ >= 1 ms (weaken = 4 * hack).")
+    print("Highest throughput (smallest δ):")
+    for w in rank_by_throughput(windows, 5):
+        print(f"  [{w.lower:.3f}, {w.upper:.3f}]  n={w.index}")
+    print("Most slack (widest):")
+    for w in rank_by_slack(windows, 5):
+        print(f"  [{w.lower:.3f}, {w.upper:.3f}]  width={w.width:.3f}  n={w.index}")
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Monte-Carlo jitter simulator for HWGW schedules.
+
+batch.py and batching-timing-test.py assume every op starts and finishes on
+schedule; the log in ops.py shows durations drifting by tens of ms and starts
+slipping.  This simulates the calculateBatchTimings schedule (batch k's hack,
+weaken1, grow, weaken2 finish at W - δ, W, W + δ, W + 2δ, plus 4kδ) with every
+start and every duration perturbed by a jitter distribution, many runs at once
+in NumPy, and counts per scored batch:
+
+  order  an op finishes before the op scheduled just ahead of it
+  red    an op starts while the target is disturbed: between a batch's actual
+         hack and weaken1 finishes, or its grow and weaken2 finishes (the red
+         phases of batch.py's get_bg_color_at, but from simulated times)
+
+Batches run back to back, so each run first simulates ceil(W / 4δ) warm-up
+batches (W = weaken time): by then the earliest scored op starts after the
+first scheduled hack finish and sees the red phases a continuous schedule
+would have.  Warm-up batches are simulated but not counted.
+
+δ candidates are ranked by expected safe throughput, batches/s * P(batch ok).
+Jitter is normal with given sigmas, or estimated from a log of (type, start,
+end) ops (ops.py's `operations` list, or a JSON array of the same triples):
+start slip is the residual of each HWGW slot's starts from a straight line,
+duration jitter the residual from the slot's mean duration.
+
+    python jitter_sim.py --hack-time 1270.59 --log ops.py --runs 200000
+    python jitter_sim.py --hack-time 10000 --deltas 480,1019 --start-sigma 15 --duration-sigma 5
+    python jitter_sim.py --hack-time 10000 --check
+"""
+import argparse
+import ast
+import json
+import math
+import sys
+
+import numpy as np
+
+from feasibility_map import OP_ORDER, OP_RATIOS, white_mask
+from interval import hwgw_families, joint_windows
+
+CHUNK_CELLS = 1 << 22   # simulated ops per NumPy pass
+SLOT_TYPES = ("H", "W", "G", "W")   # log op type of each HWGW slot
+
+
+class Jitter:
+    """A zero-centred jitter distribution (ms): 'normal' (scale = sigma),
+    'uniform' (scale = half-width) or 'empirical' (resamples `samples`)."""
+
+    def __init__(self, kind="normal", scale=0.0, samples=None):
+        if kind not in ("normal", "uniform", "empirical"):
+            raise ValueError(f"unknown jitter kind {kind!r}")
+        if kind == "empirical" and (samples is None or not len(samples)):
+            raise ValueError("empirical jitter needs samples")
+        self.kind = kind
+        self.scale = float(scale)
+        self.samples = None if samples is None else np.asarray(samples, dtype=np.float64)
+
+    def sample(self, rng, shape):
+        if self.kind == "normal":
+            return rng.normal(0.0, self.scale, shape) if self.scale else np.zeros(shape)
+        if self.kind == "uniform":
+            return rng.uniform(-self.scale, self.scale, shape)
+        return rng.choice(self.samples - self.samples.mean(), shape)
+
+    def std(self):
+        if self.kind == "normal":
+            return self.scale
+        if self.kind == "uniform":
+            return self.scale / math.sqrt(3)
+        return float(self.samples.std())
+
+    def __repr__(self):
+        return f"Jitter({self.kind}, std={self.std():.2f} ms)"
+
+
+def load_log(path):
+    """[(type, start, end)] from ops.py's `operations` list or a JSON array."""
+    with open(path) as f:
+        text = f.read()
+    if path.endswith(".py"):
+        for node in ast.parse(text).body:
+            if isinstance(node, ast.Assign) and any(getattr(t, "id", None) == "operations" for t in node.targets):
+                return [tuple(op) for op in ast.literal_eval(node.value)]
+        raise ValueError(f"{path}: no `operations = [...]` list")
+    return [tuple(op) for op in json.loads(text)]
+
+
+def estimate_jitter(ops, kind="empirical"):
+    """
+    (start Jitter, duration Jitter) from logged ops.  Ops are sorted by start and
+    cut into HWGW batches; per slot, start residuals come from a least-squares
+    line over the batch index and duration residuals from the slot mean.
+    kind='normal' fits the residuals' standard deviations instead.
+    """
+    ops = sorted(ops, key=lambda op: op[1])
+    n = len(ops) // 4
+    if n < 2:
+        raise ValueError("need at least two HWGW batches in the log")
+    starts, durs = [], []
+    for slot, want in enumerate(SLOT_TYPES):
+        batch_ops = ops[slot:4 * n:4]
+        if any(op[0] != want for op in batch_ops):
+            raise ValueError(f"log is not in HWGW order at slot {slot}")
+        s = np.array([op[1] for op in batch_ops], dtype=np.float64)
+        d = np.array([op[2] - op[1] for op in batch_ops], dtype=np.float64)
+        k = np.arange(n)
+        slope, icept = np.polyfit(k, s - s[0], 1)
+        starts.append(s - s[0] - (slope * k + icept))
+        durs.append(d - d.mean())
+    starts, durs = np.concatenate(starts), np.concatenate(durs)
+    if kind == "normal":
+        return Jitter("normal", starts.std()), Jitter("normal", durs.std())
+    return Jitter("empirical", samples=starts), Jitter("empirical", samples=durs)
+
+
+def warmup_batches(delta, durations):
+    """Batches before batch k = ceil(W / 4δ), whose ops (the earliest, weaken1,
+    starts at 4kδ) all start after batch 0's hack finish at W - δ."""
+    return math.ceil(durations["weaken"] / (4 * delta))
+
+
+def simulate(delta, durations, num_batches, start_jitter, duration_jitter, runs, rng, warmup=None):
+    """
+    Simulate `runs` windows of num_batches scored batches, each preceded by
+    `warmup` unscored ones (default warmup_batches()).  Returns per-batch rates
+    {"order", "red", "fail"} (fail = either) averaged over the scored batches.
+    `durations` maps OP_ORDER names to planned durations (ms).
+    """
+    if warmup is None:
+        warmup = warmup_batches(delta, durations)
+    total_batches = warmup + num_batches
+    dur = np.array([durations[op] for op in OP_ORDER])
+    k = np.repeat(np.arange(total_batches), 4)
+    j = np.tile(np.arange(4), total_batches)
+    finish = durations["weaken"] + (4 * k + j - 1) * delta        # planned, slot order
+    start = finish - dur[j]
+    span = finish.max() - start.min() + 1e3 * (1 + dur.max())
+    counts = {"order": 0, "red": 0, "fail": 0}
+    done = 0
+    while done < runs:
+        m = max(1, min(CHUNK_CELLS // start.size, runs - done))
+        s = start + start_jitter.sample(rng, (m, start.size))
+        f = s + dur[j] + duration_jitter.sample(rng, (m, start.size))
+        # order: each op must finish after the op scheduled just before it.
+        late = np.zeros((m, start.size), dtype=bool)
+        late[:, 1:] = f[:, 1:] <= f[:, :-1]
+        # red: +1 at a batch's hack / grow finish, -1 at its weaken1 / weaken2 finish.
+        ev_t = f - (s.min(axis=1, keepdims=True))
+        ev_w = np.tile(np.array([1, -1, 1, -1], dtype=np.int64), total_batches)
+        order = np.argsort(ev_t, axis=1, kind="stable")
+        ev_t = np.take_along_axis(ev_t, order, axis=1)
+        depth = np.cumsum(ev_w[order], axis=1)
+        # One global searchsorted: offset each run by a span no time can reach.
+        offset = (np.arange(m) * span)[:, None]
+        flat_t = (ev_t + offset).ravel()
+        q = (s - s.min(axis=1, keepdims=True) + offset).ravel()
+        idx = np.searchsorted(flat_t, q, side="right") - 1
+        run_first = (np.arange(m) * start.size).repeat(start.size)
+        red = ((idx >= run_first) & (depth.ravel()[np.maximum(idx, 0)] > 0)).reshape(m, -1)
+        per_batch = lambda x: x.reshape(m, total_batches, 4)[:, warmup:].any(axis=2)
+        o, r = per_batch(late), per_batch(red)
+        counts["order"] += int(o.sum()); counts["red"] += int(r.sum()); counts["fail"] += int((o | r).sum())
+        done += m
+    total = runs * num_batches
+    return {name: c / total for name, c in counts.items()}
+
+
+def candidate_deltas(durations, delta_min, count, min_width):
+    """Midpoints of the first `count` joint safe windows (interval.py) at least
+    min_width ms wide, plus batching-timing-test.py's (H/2 + H/3) / 2."""
+    fams = hwgw_families(durations["hack"], durations["weaken"], durations["grow"], durations["weaken2"])
+    out = []
+    for w in joint_windows(fams, delta_min):
+        if w.width >= min_width:
+            out.append((w.lower + w.upper) / 2)
+            if len(out) >= count:
+                break
+    h = durations["hack"]
+    return sorted(set(out + [(h / 2 + h / 3) / 2]))
+
+
+def rank(deltas, durations, start_jitter, duration_jitter, runs, num_batches=None, seed=0):
+    """[(delta, safe batches/s, rates)] by decreasing safe throughput.  By default a
+    run scores as many batches as are in flight at once, ceil(weaken / 4δ) + 1,
+    after the warm-up batches."""
+    rows = []
+    for delta in deltas:
+        nb = num_batches or min(256, math.ceil(durations["weaken"] / (4 * delta)) + 1)
+        rates = simulate(delta, durations, nb, start_jitter, duration_jitter, max(1, runs // nb),
+                         np.random.default_rng(seed))
+        rows.append((delta, 1000.0 / (4 * delta) * (1 - rates["fail"]), rates))
+    return sorted(rows, key=lambda r: -r[1])
+
+
+def check_zero_jitter(durations, deltas, num_batches=8):
+    """
+    Without jitter every scored batch must fail exactly when batch.py's rule
+    (feasibility_map.white_mask) calls δ unsafe: rates {"red": 1.0} for unsafe
+    and {"red": 0.0} for safe δ, and never "order".  Returns the offending
+    [(delta, safe, rates)], empty if all agree.
+    """
+    zero = Jitter("normal", 0.0)
+    ratios = {op: durations[op] / durations["hack"] for op in OP_ORDER}
+    safe = white_mask([durations["hack"]], deltas, ratios)[0]
+    bad = []
+    for delta, ok in zip(deltas, safe.tolist()):
+        rates = simulate(delta, durations, num_batches, zero, zero, 1, np.random.default_rng(0))
+        if rates["order"] or rates["red"] != (0.0 if ok else 1.0):
+            bad.append((delta, ok, rates))
+    return bad
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Monte-Carlo jitter simulator for HWGW schedules.")
+    ap.add_argument("--hack-time", type=float, default=1270.5873382302843, help="ms")
+    ap.add_argument("--deltas", help="comma-separated δ's (ms); default: safe-window midpoints")
+    ap.add_argument("--delta-min", type=float, default=5.0, help="ms, for the default candidates")
+    ap.add_argument("--candidates", type=int, default=12)
+    ap.add_argument("--min-width", type=float, default=1.0, help="ms, for the default candidates")
+    ap.add_argument("--log", metavar="PATH", help="estimate jitter from ops (ops.py or JSON)")
+    ap.add_argument("--dist", choices=("empirical", "normal"), default="empirical",
+                    help="with --log: resample the residuals or fit normals")
+    ap.add_argument("--start-sigma", type=float, default=10.0, help="ms, without --log")
+    ap.add_argument("--duration-sigma", type=float, default=5.0, help="ms, without --log")
+    ap.add_argument("--runs", type=int, default=1000000, help="simulated batches per δ")
+    ap.add_argument("--batches", type=int, help="scored batches per run (default: all in flight)")
+    ap.add_argument("--check", action="store_true",
+                    help="check zero-jitter verdicts against batch.py's rule (the δ's, or a grid) and exit")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    durations = {op: r * args.hack_time for op, r in OP_RATIOS.items()}
+    if args.check:
+        deltas = ([float(d) for d in args.deltas.split(",")] if args.deltas else
+                  np.linspace(args.delta_min, args.hack_time, 400).tolist()
+                  + candidate_deltas(durations, args.delta_min, args.candidates, args.min_width))
+        bad = check_zero_jitter(durations, deltas)
+        for delta, ok, rates in bad:
+            print(f"  δ={delta:.4f} ({'safe' if ok else 'unsafe'} by batch.py): {rates}")
+        print(f"zero-jitter check, hack={args.hack_time:.2f} ms, {len(deltas)} δ's: "
+              f"{'OK' if not bad else f'{len(bad)} disagree'}")
+        sys.exit(1 if bad else 0)
+    if args.log:
+        start_j, dur_j = estimate_jitter(load_log(args.log), args.dist)
+    else:
+        start_j, dur_j = Jitter("normal", args.start_sigma), Jitter("normal", args.duration_sigma)
+    deltas = ([float(d) for d in args.deltas.split(",")] if args.deltas else
+              candidate_deltas(durations, args.delta_min, args.candidates, args.min_width))
+    print(f"hack={args.hack_time:.2f} ms  start jitter {start_j}  duration jitter {dur_j}  "
+          f"{args.runs} batches per δ")
+    print(f"{'δ (ms)':>10} {'safe/s':>8} {'P(fail)':>9} {'P(order)':>9} {'P(red)':>9}")
+    for delta, safe, rates in rank(deltas, durations, start_j, dur_j, args.runs, args.batches, args.seed):
+        print(f"{delta:>10.2f} {safe:>8.3f} {rates['fail']:>9.4f} {rates['order']:>9.4f} {rates['red']:>9.4f}")
@@ -0,0 +1,54 @@
+/**
+ * KingOfTheHill generator + oracle as a batch process, for the cross-port
+ * differential check (tests/koth_tune/python/diff_ports.py).
+ *
+ * Run: node tests/kingOfTheHillOracleWorker.mjs --seed 0x4b6f7468 --start 1 --count 1000 --difficulty 60 --probes 8
+ *
+ * stdin:  count * probes little-endian int64 attempted integers (problem-major)
+ * stdout: count float64 passwords, then count * probes float64 altitudes
+ * stderr: one JSON line {"generateMs", "oracleMs"}
+ */
+
+import { generateAssignmentAt, getKingOfTheHillAltitude, toServer } from "./kingOfTheHillCore.mjs"
+
+function parseArgs(argv) {
+  const args = { seed: 0x4b6f7468, start: 1, count: 0, difficulty: 60, probes: 0 }
+  for (let i = 2; i < argv.length; i++) {
+    const key = argv[i].replace(/^--/, "")
+    if (key in args && argv[i + 1] !== undefined) args[key] = Number(argv[++i])
+  }
+  return args
+}
+
+async function readStdin() {
+  const chunks = []
+  for await (const chunk of process.stdin) chunks.push(chunk)
+  return Buffer.concat(chunks)
+}
+
+const { seed, start, count, difficulty, probes } = parseArgs(process.argv)
+const input = await readStdin()
+if (input.length !== count * probes * 8) {
+  process.stderr.write(`expected ${count * probes * 8} bytes of probes, got ${input.length}\n`)
+  process.exit(2)
+}
+const xs = new BigInt64Array(input.buffer, input.byteOffset, count * probes)
+
+let t0 = performance.now()
+const assignments = []
+for (let i = 0; i < count; i++) assignments.push(generateAssignmentAt(seed >>> 0, start + i, difficulty).assignment)
+const generateMs = performance.now() - t0
+
+const out = new Float64Array(count + count * probes)
+t0 = performance.now()
+for (let i = 0; i < count; i++) {
+  const server = toServer(assignments[i])
+  out[i] = Number(assignments[i].password)
+  for (let k = 0; k < probes; k++) {
+    out[count + i * probes + k] = getKingOfTheHillAltitude(server, xs[i * probes + k].toString())
+  }
+}
+const oracleMs = performance.now() - t0
+
+process.stdout.write(Buffer.from(out.buffer))
+process.stderr.write(JSON.stringify({ generateMs, oracleMs }) + "\n")
@@ -1,10 +1,13 @@
 import math
+import os
 from koth_gen import (
-    generate_assignments, altitude, true_layout, gaussian_width, numeric_range,
+    altitude, altitude_many, true_layout, gaussian_width, numeric_range,
     hill_count, DEFAULT_SEED, DEFAULT_DIFFICULTY, KOTH_HILL_SPACING_WIDTHS,
 )
+from koth_harness import DEFAULT_CORPUS, load_assignments
 
-rows = generate_assignments(DEFAULT_SEED, 10000, DEFAULT_DIFFICULTY)
+rows = load_assignments(DEFAULT_SEED, 10000, DEFAULT_DIFFICULTY,
+                        os.environ.get("KOTH_CORPUS", DEFAULT_CORPUS))
 
 # 1) oracle sanity: altitude at the true password is exactly the peak (10000)
 bad = 0
@@ -30,17 +33,14 @@ for r in rows:
     L = r["passwordLength"]
     lo, hi = numeric_range(L)
     span = hi - lo
-    alts = []
-    for f in FRACS:
-        x = round(lo + span * f)
-        alts.append(altitude(r["password"], r["difficulty"], x))
-    best_abs = max(abs(a) for a in alts)
+    alts = altitude_many(r["password"], r["difficulty"], [round(lo + span * f) for f in FRACS])
+    best_abs = float(abs(alts).max())
     if best_abs == 0.0:
         fail_any_nonzero += 1
     if best_abs < worst_best_abs:
         worst_best_abs = best_abs
         worst_row = r
-    if max(alts) <= 0:
+    if alts.max() <= 0:
         best_alt_is_negative += 1
 
 print("problems where NO grid point had non-zero altitude:", fail_any_nonzero)
@@ -1,39 +1,100 @@
+import argparse
+import cProfile
+import functools
 import multiprocessing
-import statistics
+import os
 import time
 
-from koth_gen import DEFAULT_SEED, generate_assignments
-from solver import solve
+from koth_gen import DEFAULT_SEED, difficulty_class, difficulty_classes
+from koth_harness import (DEFAULT_CORPUS, GuessStats, PerfCounters, PhaseStats, cprofile_stats,
+                          load_assignment_batches, merge_cprofile_stats)
+from solver import PHASES, STAGES, solve, solve_many
 
 N = 100000
 DIFF_MIN = 1
 DIFF_MAX = 60
-
-
-def bench_diff(diff):
-    rows = generate_assignments(DEFAULT_SEED, N, diff)
+CHUNK = 5000
+# Prebuilt with `koth_harness.py --build-corpus`; generated on the fly if absent.
+CORPUS = os.environ.get("KOTH_CORPUS", DEFAULT_CORPUS)
+
+
+@functools.lru_cache(maxsize=None)
+def chunk_assignments(start, count, corpus, difficulties):
+    """Rows start..start+count-1 of every benchmarked difficulty, generated in one
+    pass (or mapped from the corpus); a worker reuses them for every difficulty
+    of the same row range it is handed.  Tasks arrive ordered by cost, not by
+    range, so the cache is unbounded (~10 bytes per row per password length)."""
+    return load_assignment_batches(DEFAULT_SEED, count, difficulties, corpus, start=start)
+
+
+def bench_chunk(task):
+    """Solve rows start..start+count-1 of one difficulty.
+
+    With `profile` the chunk also returns its PerfCounters and cProfile stats
+    (both None otherwise) for the parent to merge.
+    """
+    diff, start, count, corpus, difficulties, profile, lockstep = task
+    prof = PerfCounters() if profile else None
+    cprof = cProfile.Profile() if profile else None
+    t_gen = time.perf_counter_ns()
+    rows = chunk_assignments(start, count, corpus, difficulties)[diff]
+    if prof is not None:
+        prof.add("generate", time.perf_counter_ns() - t_gen)
+        cprof.enable()
     t0 = time.time()
-    guesses = []
-    unsolved_count = 0
-    for r in rows:
-        res = solve(r)
+    stats = GuessStats()
+    phases = PhaseStats()
+    if prof is not None:
+        results = (_timed_solve(r, prof) for r in rows)
+    elif lockstep:
+        results = solve_many(rows)
+    else:
+        results = map(solve, rows)
+    for res in results:
         if res["solved"]:
-            guesses.append(res["guesses"])
+            stats.add(res["guesses"])
         else:
-            unsolved_count += 1
+            stats.unsolved += 1
+        phases.add(res)
     dt = time.time() - t0
-    return diff, sorted(guesses), unsolved_count, dt
-
-
-def format_row(diff, guesses, unsolved_count, dt):
-    if guesses:
-        n = len(guesses)
-        avg = statistics.mean(guesses)
-        median = guesses[n // 2]
-        lo = guesses[0]
-        hi = guesses[-1]
-        p95 = guesses[int(0.95 * n)]
-        p99 = guesses[int(0.99 * n)]
+    if cprof is not None:
+        cprof.disable()
+    return diff, count, stats.compact(), phases, dt, prof, cprof and cprofile_stats(cprof)
+
+
+def _timed_solve(r, prof):
+    t_solve = time.perf_counter_ns()
+    res = solve(r, prof=prof)
+    prof.add("solve", time.perf_counter_ns() - t_solve)
+    return res
+
+
+def make_tasks(difficulties, n, chunk, corpus, profile=False, lockstep=False):
+    """Split every difficulty into (difficulty, start, count) chunks, costliest first.
+
+    Longer passwords and more hills mean more probes per solve, so those chunks
+    are queued first; the pool hands out one chunk at a time, so idle workers keep
+    pulling the cheap ones and the run does not end waiting on a single difficulty.
+    """
+    difficulties = tuple(difficulties)
+    tasks = []
+    for diff in difficulties:
+        for start in range(1, n + 1, chunk):
+            tasks.append((diff, start, min(chunk, n - start + 1), corpus, difficulties, profile, lockstep))
+    tasks.sort(key=lambda t: (difficulty_class(t[0]), t[2]), reverse=True)
+    return tasks
+
+
+def format_row(diff, stats, dt):
+    unsolved_count = stats.unsolved
+    n = stats.solved
+    if n:
+        avg = stats.mean()
+        median = stats.median()
+        lo = stats.min()
+        hi = stats.max()
+        p95 = stats.percentile(0.95)
+        p99 = stats.percentile(0.99)
         return (
             f"{diff:>4}  {n:>6}  {unsolved_count:>8}  "
             f"{avg:>7.2f}  {median:>6}  {lo:>5}  {hi:>5}  {p95:>5}  {p99:>5}  {dt:>5.1f}s"
@@ -44,55 +105,133 @@ def format_row(diff, guesses, unsolved_count, dt):
     )
 
 
-def print_progress(done, total):
+PHASE_ABBREV = {"cluster_sweep": "cluster"}
+LATE_STAGES = STAGES[STAGES.index("fallback"):]
+
+
+def phase_header():
+    cols = "  ".join(f"{PHASE_ABBREV.get(p, p):>8}" for p in PHASES)
+    reach = "  ".join(f"{'>=' + s:>10}" for s in LATE_STAGES)
+    return f"{'diff':>4}  {cols}  {reach}"
+
+
+def format_phase_row(diff, phases):
+    """Average guesses per problem in each phase, then the share of problems
+    whose solve reached the fallback / recovery / backstop stage."""
+    cols = "  ".join(f"{phases.avg_guesses(p):>8.3f}" for p in PHASES)
+    reach = "  ".join(
+        f"{sum(phases.exit_share(s) for s in LATE_STAGES[i:]):>10.3%}" for i in range(len(LATE_STAGES)))
+    return f"{diff:>4}  {cols}  {reach}"
+
+
+def print_progress(done, total, width=60):
     pct = done / total * 100
-    bar = "#" * done + "." * (total - done)
+    filled = done * width // total
+    bar = "#" * filled + "." * (width - filled)
     print(f"\r  [{bar}] {done}/{total}  ({pct:.0f}%)", end="", flush=True)
 
 
 if __name__ == "__main__":
     multiprocessing.freeze_support()
 
+    ap = argparse.ArgumentParser(description="Per-difficulty benchmark of solver.solve.")
+    ap.add_argument("--n", type=int, default=N, help="problems per difficulty")
+    ap.add_argument("--diff-min", type=int, default=DIFF_MIN)
+    ap.add_argument("--diff-max", type=int, default=DIFF_MAX)
+    ap.add_argument("--workers", type=int, default=multiprocessing.cpu_count())
+    ap.add_argument("--chunk", type=int, default=CHUNK, help="problems per pool task")
+    ap.add_argument("--corpus", default=CORPUS)
+    ap.add_argument("--no-collapse", action="store_true",
+                    help="solve every difficulty instead of once per (password length, hill count) class")
+    ap.add_argument("--lockstep", action="store_true",
+                    help="solve each chunk with solver.solve_many (same results, one batched "
+                         "oracle call per round; ignored with --profile)")
+    ap.add_argument("--profile", action="store_true",
+                    help="time the oracle and solver phases in every worker; print merged counters "
+                         "and the top cProfile functions")
+    args = ap.parse_args()
+
     hdr = (
         f"{'diff':>4}  {'solved':>6}  {'unsolved':>8}  {'avg':>7}  "
         f"{'median':>6}  {'min':>5}  {'max':>5}  {'p95':>5}  {'p99':>5}  {'time':>6}"
     )
     sep = "-" * len(hdr)
-    total = DIFF_MAX - DIFF_MIN + 1
-    difficulties = list(range(DIFF_MIN, DIFF_MAX + 1))
-
-    print(f"Benchmark  N={N} per difficulty  workers={multiprocessing.cpu_count()}")
+    difficulties = list(range(args.diff_min, args.diff_max + 1))
+    # Difficulties only matter through (password length, hill count), so each
+    # class is solved once and its row repeated for every member difficulty.
+    if args.no_collapse:
+        rep = {d: d for d in difficulties}
+    else:
+        rep = {d: ds[0] for ds in difficulty_classes(difficulties).values() for d in ds}
+    solved_diffs = sorted(set(rep.values()))
+    tasks = make_tasks(solved_diffs, args.n, max(1, args.chunk), args.corpus, args.profile,
+                       args.lockstep)
+    total = len(tasks)
+
+    print(f"Benchmark  N={args.n} per difficulty  workers={args.workers}  "
+          f"chunk={args.chunk} ({total} tasks, {len(solved_diffs)} distinct of "
+          f"{len(difficulties)} difficulties)")
     print(sep)
     print(hdr)
     print(sep)
 
     t_total = time.time()
-    results = {}
+    results = {diff: GuessStats() for diff in solved_diffs}
+    phase_results = {diff: PhaseStats() for diff in solved_diffs}
+    seconds = {diff: 0.0 for diff in solved_diffs}
+    rows_done = {diff: 0 for diff in solved_diffs}
     done = 0
+    perf = PerfCounters()
+    cprofiles = []
 
     # Do not use apply_async callbacks to collect results: on Windows the callback
     # can still be pending when wait() returns, so rows go missing from output.
-    with multiprocessing.Pool() as pool:
-        for diff, guesses, unsolved_count, dt in pool.imap_unordered(bench_diff, difficulties):
-            results[diff] = (guesses, unsolved_count, dt)
+    with multiprocessing.Pool(args.workers) as pool:
+        for diff, count, stats, phases, dt, prof, cstats in pool.imap_unordered(bench_chunk, tasks):
+            results[diff].merge(stats)
+            phase_results[diff].merge(phases)
+            seconds[diff] += dt
+            rows_done[diff] += count
+            if prof is not None:
+                perf.merge(prof)
+                cprofiles.append(cstats)
             done += 1
             print_progress(done, total)
 
     print()
 
-    missing = [d for d in difficulties if d not in results]
+    missing = [d for d in difficulties if rows_done[rep[d]] != args.n]
     if missing:
         print(f"ERROR: missing results for difficulties: {missing}")
         raise SystemExit(1)
 
     failed = False
     for diff in difficulties:
-        guesses, unsolved_count, dt = results[diff]
-        if unsolved_count:
+        if results[rep[diff]].unsolved:
             failed = True
-        print(format_row(diff, guesses, unsolved_count, dt))
+        print(format_row(diff, results[rep[diff]], seconds[rep[diff]]))
 
     print(sep)
-    print(f"Total wall time: {time.time() - t_total:.1f}s")
+    phase_hdr = phase_header()
+    print()
+    print("Per-phase guesses per problem; share of problems reaching the late stages")
+    print("-" * len(phase_hdr))
+    print(phase_hdr)
+    print("-" * len(phase_hdr))
+    for diff in difficulties:
+        print(format_phase_row(diff, phase_results[rep[diff]]))
+    print("-" * len(phase_hdr))
+    if args.profile:
+        solves = sum(results[d].solved + results[d].unsolved for d in solved_diffs)
+        probes = sum(sum(phase_results[d].guesses.values()) for d in solved_diffs)
+        print()
+        print("profile (perf_counter_ns, summed over workers):")
+        for line in perf.report(solves, probes):
+            print("  " + line)
+        print()
+        print("top functions by cumulative time (all workers):")
+        merge_cprofile_stats(cprofiles).sort_stats("cumulative").print_stats(15)
+    print(f"Total wall time: {time.time() - t_total:.1f}s  (time column = summed worker seconds "
+          f"of the class a difficulty was solved as)")
     if failed:
         raise SystemExit(1)
@@ -1,28 +1,51 @@
-import time, statistics, multiprocessing
-from koth_gen import generate_assignments, DEFAULT_SEED
+import time, multiprocessing, os, queue
+from koth_gen import DEFAULT_SEED, difficulty_classes
+from koth_harness import DEFAULT_CORPUS, GuessStats, ProgressMonitor, ProgressTicker, load_assignments
 from solver import solve
 
-N = int(__import__("os").environ.get("N", "10000"))
+N = int(os.environ.get("N", "10000"))
 DIFF_MIN = 1
 DIFF_MAX = 60
+CORPUS = os.environ.get("KOTH_CORPUS", DEFAULT_CORPUS)
+# Live reporting / early abort (0 / unset = off).
+PROGRESS_EVERY = int(os.environ.get("PROGRESS_EVERY", "0"))
+PROGRESS_SECS = float(os.environ.get("PROGRESS_SECS", "0"))
+STOP_ON_UNSOLVED = os.environ.get("STOP_ON_UNSOLVED", "") not in ("", "0")
+MAX_AVG = float(os.environ["MAX_AVG"]) if os.environ.get("MAX_AVG") else None
+# With an abort criterion set, workers report at least this often (printing or not).
+ABORT_FLUSH_EVERY = 250
+ABORT_FLUSH_SECS = 1.0
+
+_progress_queue = None
+
+def _init_worker(q):
+    global _progress_queue
+    _progress_queue = q
 
 def bench_diff(diff):
-    rows = generate_assignments(DEFAULT_SEED, N, diff)
+    rows = load_assignments(DEFAULT_SEED, N, diff, CORPUS)
+    every, secs = PROGRESS_EVERY, min(1.0, PROGRESS_SECS) if PROGRESS_SECS else 0.0
+    if STOP_ON_UNSOLVED or MAX_AVG is not None:
+        every = min(every or ABORT_FLUSH_EVERY, ABORT_FLUSH_EVERY)
+        secs = min(secs or ABORT_FLUSH_SECS, ABORT_FLUSH_SECS)
+    ticker = ProgressTicker(lambda stats, probes: _progress_queue.put((diff, stats, probes)), every, secs)
     t0 = time.time()
-    guesses = []; unsolved_count = 0
+    stats = GuessStats()
     for r in rows:
         res = solve(r)
-        if res["solved"]: guesses.append(res["guesses"])
-        else: unsolved_count += 1
+        if res["solved"]: stats.add(res["guesses"])
+        else: stats.unsolved += 1
+        ticker.add(res)
+    ticker.flush()
     dt = time.time() - t0
-    return diff, sorted(guesses), unsolved_count, dt
+    return diff, stats.compact(), dt
 
-def format_row(diff, guesses, unsolved_count, dt):
-    if guesses:
-        n = len(guesses)
-        avg = statistics.mean(guesses); median = guesses[n//2]
-        lo = guesses[0]; hi = guesses[-1]
-        p95 = guesses[int(0.95*n)]; p99 = guesses[int(0.99*n)]
+def format_row(diff, stats, dt):
+    n = stats.solved; unsolved_count = stats.unsolved
+    if n:
+        avg = stats.mean(); median = stats.median()
+        lo = stats.min(); hi = stats.max()
+        p95 = stats.percentile(0.95); p99 = stats.percentile(0.99)
         return (f"{diff:>4}  {n:>6}  {unsolved_count:>8}  {avg:>7.2f}  {median:>6}  "
                 f"{lo:>5}  {hi:>5}  {p95:>5}  {p99:>5}  {dt:>5.1f}s")
     return (f"{diff:>4}  {0:>6}  {unsolved_count:>8}  {'—':>7}  {'—':>6}  {'—':>5}  {'—':>5}  {'—':>5}  {'—':>5}  {dt:>5.1f}s")
@@ -31,10 +54,41 @@ if __name__ == "__main__":
     HDR = (f"{'diff':>4}  {'solved':>6}  {'unsolved':>8}  {'avg':>7}  {'median':>6}  "
            f"{'min':>5}  {'max':>5}  {'p95':>5}  {'p99':>5}  {'time':>6}")
     print(f"Benchmark  N={N} per difficulty")
-    print("-"*len(HDR)); print(HDR); print("-"*len(HDR))
+    diffs = range(DIFF_MIN, DIFF_MAX+1)
+    # Solve each (password length, hill count) class once; its members share the row.
+    members = {ds[0]: ds for ds in difficulty_classes(diffs).values()}
+    rep = {d: r for r, ds in members.items() for d in ds}
+    print(f"  {len(members)} distinct (password length, hill count) classes of {len(diffs)} difficulties")
+    monitor = ProgressMonitor(N * len(diffs), PROGRESS_EVERY, PROGRESS_SECS, STOP_ON_UNSOLVED, MAX_AVG,
+                              label="  progress ")
     results = {}
-    with multiprocessing.Pool() as pool:
-        for diff, g, u, dt in pool.map(bench_diff, range(DIFF_MIN, DIFF_MAX+1)):
-            results[diff] = (g, u, dt)
-    for diff in range(DIFF_MIN, DIFF_MAX+1):
-        g,u,dt = results[diff]; print(format_row(diff,g,u,dt))
+    aborted = None
+    with multiprocessing.Manager() as manager:
+        q = manager.Queue()
+        with multiprocessing.Pool(initializer=_init_worker, initargs=(q,)) as pool:
+            pending = pool.imap_unordered(bench_diff, sorted(members))
+            while len(results) < len(members) and not aborted:
+                try:
+                    while True:
+                        diff, stats, probes = q.get(timeout=0.1)
+                        for _ in members[diff]:
+                            monitor.add(stats, probes)
+                        aborted = monitor.abort_reason()
+                        if aborted: break
+                except queue.Empty:
+                    pass
+                try:
+                    while not aborted:
+                        diff, stats, dt = pending.next(timeout=0)
+                        results[diff] = (stats, dt)
+                except (multiprocessing.TimeoutError, StopIteration):
+                    pass
+            if aborted:
+                pool.terminate()
+    if aborted:
+        print(f"ABORTED: {aborted}")
+        print(monitor.line())
+        raise SystemExit(1)
+    print("-"*len(HDR)); print(HDR); print("-"*len(HDR))
+    for diff in diffs:
+        stats, dt = results[rep[diff]]; print(format_row(diff, stats, dt))
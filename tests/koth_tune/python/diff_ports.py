@@ -0,0 +1,310 @@
+"""
+Differential check + throughput of the generator/oracle ports:
+
+  python        koth_gen.py (scalar HillLayout oracle; the reference)
+  python-batch  koth_gen.LayoutBatch (vectorized, exact exp)
+  cpp           tests/koth_tune/src via koth_cpp (needs the koth_capi library)
+  ts            tests/kingOfTheHillCore.mjs via node tests/kingOfTheHillOracleWorker.mjs
+
+The same (seed, index, difficulty) rows and the same attempted integers x are
+streamed through every available backend chunk by chunk.  The first password
+and the first altitude that differ from the reference are reported with their
+distance in ulps, plus assignments/s and probes/s per backend.
+
+Any password mismatch fails.  The Python backends must be bit-identical
+(EXACT).  The C++ and JS ports use their own exp(), and JS squares with pow
+((x - c) ** 2), so their altitudes are checked against altitude_tolerance, a
+per-probe bound on how those last-bit differences propagate through the
+Gaussian sum; only altitudes outside it count as failures, every nonzero
+difference is still reported (in ulps, and as a fraction of the bound).
+
+    python diff_ports.py --n 20000 --diff-min 1 --diff-max 60
+    python diff_ports.py --n 100000 --backends python,cpp --stop-at-first
+    python diff_ports.py --exact                    # demand bit-identical ports
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import time
+
+import numpy as np
+
+from koth_gen import (
+    DEFAULT_SEED, KOTH_HILL_SPACING_WIDTHS, KOTH_NEAR_ZONE_FRACTION, KOTH_PEAK_HEIGHT, LayoutBatch,
+    gaussian_width, generate_assignment_at, generate_assignment_batch, hill_count, hill_layout, numeric_range,
+)
+
+BACKENDS = ("python", "python-batch", "cpp", "ts")
+PROBES = 12
+EXACT = ("python", "python-batch")   # must match the reference bit for bit
+# altitude_tolerance, in units of u = 2**-53: TOL_ARG * u * z of relative error per
+# term from its exponent z (2 ulps of z), TOL_TERM * u from exp() and the height
+# product, plus 2 * u per hill from the additions.
+TOL_ARG = 4
+TOL_TERM = 6
+CHUNK = 5000
+TESTS_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+TS_WORKER = os.path.join(TESTS_DIR, "kingOfTheHillOracleWorker.mjs")
+
+
+def ulp_distance(a, b):
+    """Number of representable float64s between a and b (0 = bit-identical)."""
+    def ordered(v):
+        i = np.asarray(v, dtype=np.float64).view(np.int64)
+        return np.where(i < 0, np.int64(-2 ** 63) - i, i)
+    with np.errstate(over="ignore"):
+        return np.abs(ordered(a) - ordered(b))
+
+
+def altitude_tolerance(layouts, xs):
+    """
+    [count, probes] bound on |port - reference| for the altitudes at xs.  An
+    altitude is sum_i t_i, t_i = h_i * exp(-z_i), z_i = (x - c_i)^2 / w^2, and the
+    ports compute the same terms in the same order, so with u = 2**-53:
+
+      z_i        the ports' squares (dx * dx vs pow) and quotients can differ by
+                 2 ulps of z_i; exp() turns that into a relative error
+                 TOL_ARG * u * z_i of t_i, which grows with z_i (up to ~745,
+                 where exp underflows): the large-ulp outliers far from a hill
+      t_i        each exp() is within 1 ulp and h * e rounds once, on both sides:
+                 TOL_TERM * u * |t_i|
+      sum        each addition rounds once on both sides, 2 * u * sum |t_i| per
+                 hill; heights can be negative, so the terms can cancel and the
+                 error scales with sum |t_i|, not with the altitude
+
+    plus 4 subnormal ulps per term for terms near underflow.  Near the password
+    the altitude is the single peak term.  Over difficulties 1..60 (20000 rows
+    each) the worst differences use 0.34 of the bound for both ports (ts up to
+    8192 ulps); at TOL_ARG = 4 they would pass with TOL_TERM = 3.2 (ts), 1.7 (cpp).
+    """
+    rows = np.arange(xs.shape[0])
+    x = xs.astype(np.float64)
+    dx = x[:, :, None] - layouts.centers[rows, None, :]
+    z = dx * dx / layouts.w2[rows, None, None]
+    t = np.abs(layouts.heights[rows, None, :]) * np.exp(-z)
+    sum_tz, sum_t = (t * z).sum(axis=2), t.sum(axis=2)
+    p = layouts.p[rows, None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        near = (p != 0) & (np.abs((xs - p) / p) < KOTH_NEAR_ZONE_FRACTION)
+    q = (x - p) ** 2 / layouts.w2[rows, None]
+    peak = KOTH_PEAK_HEIGHT * np.exp(-q)
+    sum_tz = np.where(near, peak * q, sum_tz)
+    sum_t = np.where(near, peak, sum_t)
+    hills = layouts.centers.shape[1]
+    tiny = np.finfo(np.float64).smallest_subnormal
+    return 2.0 ** -53 * (TOL_ARG * sum_tz + (TOL_TERM + 2 * hills) * sum_t) + 4 * (hills + 1) * tiny
+
+
+def probe_points(passwords, lengths, probes, rng):
+    """[count, probes] attempted integers: the password and near-zone offsets
+    (where the ports' arithmetic differs most), hill-spacing multiples, and
+    uniform points over the range."""
+    count = passwords.size
+    xs = np.empty((count, probes), dtype=np.int64)
+    widths = np.array([gaussian_width(int(L)) for L in lengths], dtype=np.int64)
+    lo = np.array([numeric_range(int(L))[0] for L in lengths], dtype=np.int64)
+    hi = np.array([numeric_range(int(L))[1] for L in lengths], dtype=np.int64)
+    near = np.maximum(1, (passwords * KOTH_NEAR_ZONE_FRACTION).astype(np.int64))
+    for k in range(probes):
+        kind = k % 4
+        if k == 0:
+            x = passwords
+        elif kind == 1:
+            x = passwords + (rng.random(count) * 2 - 1) * near
+        elif kind == 2:
+            x = passwords + rng.integers(-4, 5, count) * KOTH_HILL_SPACING_WIDTHS * widths \
+                + (rng.random(count) - 0.5) * widths
+        else:
+            x = lo + rng.random(count) * (hi - lo)
+        xs[:, k] = np.clip(np.round(x), lo, hi)
+    return xs
+
+
+# ---------------------------------------------------------------------------
+# backends: run(seed, start, count, difficulty, xs) -> (passwords, alts, gen_s, oracle_s)
+# ---------------------------------------------------------------------------
+def run_python(seed, start, count, difficulty, xs):
+    t0 = time.perf_counter()
+    rows = [generate_assignment_at(seed, start + i, difficulty) for i in range(count)]
+    gen_s = time.perf_counter() - t0
+    alts = np.empty(xs.shape, dtype=np.float64)
+    t0 = time.perf_counter()
+    for i, r in enumerate(rows):
+        lay = hill_layout(r["password"], difficulty)
+        alts[i] = [lay.altitude(x) for x in xs[i].tolist()]
+    oracle_s = time.perf_counter() - t0
+    return np.array([int(r["password"]) for r in rows], dtype=np.int64), alts, gen_s, oracle_s
+
+
+def run_python_batch(seed, start, count, difficulty, xs):
+    t0 = time.perf_counter()
+    batch = generate_assignment_batch(seed, count, difficulty, start)
+    gen_s = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    layouts = LayoutBatch.from_passwords(batch.passwords, batch.lengths, np.full(count, hill_count(difficulty)))
+    rows = np.arange(count)
+    alts = np.column_stack([layouts.altitude(rows, xs[:, k]) for k in range(xs.shape[1])])
+    oracle_s = time.perf_counter() - t0
+    return batch.passwords, alts, gen_s, oracle_s
+
+
+def run_cpp(seed, start, count, difficulty, xs):
+    import koth_cpp
+    t0 = time.perf_counter()
+    passwords = koth_cpp.generate_passwords(seed, count, difficulty, start)
+    gen_s = time.perf_counter() - t0
+    alts = np.empty(xs.shape, dtype=np.float64)
+    t0 = time.perf_counter()
+    for i, p in enumerate(passwords.tolist()):
+        alts[i] = koth_cpp.altitude_many(str(p), difficulty, xs[i])
+    oracle_s = time.perf_counter() - t0
+    return passwords, alts, gen_s, oracle_s
+
+
+def run_ts(seed, start, count, difficulty, xs):
+    cmd = ["node", TS_WORKER, "--seed", str(seed), "--start", str(start), "--count", str(count),
+           "--difficulty", str(difficulty), "--probes", str(xs.shape[1])]
+    proc = subprocess.run(cmd, input=np.ascontiguousarray(xs, dtype="<i8").tobytes(),
+                          capture_output=True, check=True)
+    out = np.frombuffer(proc.stdout, dtype="<f8")
+    timing = json.loads(proc.stderr.decode().strip().splitlines()[-1])
+    return (out[:count].astype(np.int64), out[count:].reshape(xs.shape),
+            timing["generateMs"] / 1e3, timing["oracleMs"] / 1e3)
+
+
+RUNNERS = {"python": run_python, "python-batch": run_python_batch, "cpp": run_cpp, "ts": run_ts}
+
+
+def available_backends(names):
+    out = []
+    for name in names:
+        if name == "cpp":
+            import koth_cpp
+            if not koth_cpp.available():
+                print("cpp: skipped (koth_capi library not built; see koth_cpp.py)")
+                continue
+        if name == "ts" and not (shutil.which("node") and os.path.exists(TS_WORKER)):
+            print("ts: skipped (node or tests/kingOfTheHillCore.mjs bundle not found)")
+            continue
+        out.append(name)
+    return out
+
+
+class BackendReport:
+    """Per-backend totals and the first mismatches against the reference."""
+
+    def __init__(self, name, exact=True):
+        self.name = name
+        self.exact = exact
+        self.rows = 0
+        self.probes = 0
+        self.gen_s = 0.0
+        self.oracle_s = 0.0
+        self.pw_mismatches = 0
+        self.alt_mismatches = 0
+        self.max_ulps = 0
+        self.max_tol_frac = 0.0
+        self.over_tolerance = 0
+        self.first_pw = None
+        self.first_alt = None
+
+    def compare(self, difficulty, start, xs, ref_pw, ref_alt, pw, alt, tol):
+        bad_pw = np.flatnonzero(pw != ref_pw)
+        self.pw_mismatches += bad_pw.size
+        if bad_pw.size and self.first_pw is None:
+            i = int(bad_pw[0])
+            self.first_pw = (difficulty, start + i, int(ref_pw[i]), int(pw[i]))
+        same = pw == ref_pw
+        ulps = ulp_distance(ref_alt[same], alt[same])
+        bad = np.argwhere(ulps > 0)
+        self.alt_mismatches += len(bad)
+        if len(bad):
+            frac = np.abs(alt[same] - ref_alt[same]) / tol[same]
+            self.over_tolerance += int((ulps > 0).sum() if self.exact else (frac > 1).sum())
+            self.max_ulps = max(self.max_ulps, int(ulps.max()))
+            self.max_tol_frac = max(self.max_tol_frac, float(frac.max()))
+            if self.first_alt is None:
+                r, k = bad[0]
+                i = int(np.flatnonzero(same)[r])
+                self.first_alt = (difficulty, start + i, int(ref_pw[i]), int(xs[i, k]),
+                                  float(ref_alt[i, k]), float(alt[i, k]), int(ulps[r, k]))
+
+    def mismatched(self):
+        """Any password mismatch, or an altitude off by more than allowed: any
+        difference for an exact backend, else outside altitude_tolerance."""
+        return bool(self.pw_mismatches or self.over_tolerance)
+
+    def lines(self, reference):
+        out = [f"{self.name:<13} {self.rows / max(self.gen_s, 1e-9):>14,.0f} asg/s "
+               f"{self.probes / max(self.oracle_s, 1e-9):>14,.0f} probes/s   "
+               + ("reference" if self.name == reference else
+                  f"password mismatches={self.pw_mismatches}  altitude mismatches={self.alt_mismatches}"
+                  f"  max ulps={self.max_ulps}  max err/tolerance={self.max_tol_frac:.3f}"
+                  f"  {'inexact' if self.exact else 'over tolerance'}={self.over_tolerance}")]
+        if self.first_pw:
+            d, idx, want, got = self.first_pw
+            out.append(f"    first password mismatch: difficulty={d} index={idx} {reference}={want} {self.name}={got}")
+        if self.first_alt:
+            d, idx, p, x, want, got, ulps = self.first_alt
+            out.append(f"    first altitude mismatch: difficulty={d} index={idx} password={p} x={x} "
+                       f"{reference}={want!r} {self.name}={got!r} ({ulps} ulps)")
+        return out
+
+
+def run(seed, n, difficulties, backends, probes=PROBES, chunk=CHUNK, stop_at_first=False, exact=False):
+    """`exact`: hold every backend to bit identity, not just EXACT."""
+    reports = {b: BackendReport(b, exact or b in EXACT) for b in backends}
+    rng = np.random.default_rng(seed)
+    for diff in difficulties:
+        for start in range(1, n + 1, chunk):
+            count = min(chunk, n - start + 1)
+            batch = generate_assignment_batch(seed, count, diff, start)
+            xs = probe_points(batch.passwords, batch.lengths, probes, rng)
+            layouts = LayoutBatch.from_passwords(batch.passwords, batch.lengths, np.full(count, hill_count(diff)))
+            tol = altitude_tolerance(layouts, xs)
+            ref = None
+            for b in backends:
+                pw, alt, gen_s, oracle_s = RUNNERS[b](seed, start, count, diff, xs)
+                rep = reports[b]
+                rep.rows += count; rep.probes += xs.size
+                rep.gen_s += gen_s; rep.oracle_s += oracle_s
+                if ref is None:
+                    ref = (pw, alt)
+                else:
+                    rep.compare(diff, start, xs, ref[0], ref[1], pw, alt, tol)
+            if stop_at_first and any(r.mismatched() for r in reports.values()):
+                return reports
+    return reports
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Bit-for-bit differential check of the KotH ports.")
+    ap.add_argument("--n", type=int, default=10000, help="rows per difficulty")
+    ap.add_argument("--seed", type=lambda s: int(s, 0), default=DEFAULT_SEED)
+    ap.add_argument("--diff-min", type=int, default=60)
+    ap.add_argument("--diff-max", type=int, default=None)
+    ap.add_argument("--probes", type=int, default=PROBES, help="attempted integers per row")
+    ap.add_argument("--chunk", type=int, default=CHUNK)
+    ap.add_argument("--backends", default=",".join(BACKENDS),
+                    help="comma-separated; the first one is the reference")
+    ap.add_argument("--stop-at-first", action="store_true", help="stop after the first mismatching chunk")
+    ap.add_argument("--exact", action="store_true",
+                    help="fail on any altitude difference, not just those outside altitude_tolerance")
+    args = ap.parse_args()
+
+    backends = available_backends([b for b in args.backends.split(",") if b])
+    unknown = [b for b in backends if b not in RUNNERS]
+    if unknown:
+        raise SystemExit(f"unknown backends: {unknown} (choose from {', '.join(BACKENDS)})")
+    diffs = range(args.diff_min, (args.diff_max if args.diff_max is not None else args.diff_min) + 1)
+    print(f"seed={hex(args.seed)}  difficulties={diffs.start}..{diffs.stop - 1}  n={args.n}  "
+          f"probes/row={args.probes}  backends={','.join(backends)}")
+    reports = run(args.seed, args.n, diffs, backends, args.probes, max(1, args.chunk), args.stop_at_first,
+                  args.exact)
+    for rep in reports.values():
+        for line in rep.lines(backends[0]):
+            print(line)
+    if any(r.mismatched() for r in reports.values()):
+        raise SystemExit(1)
@@ -0,0 +1,142 @@
+"""
+Consistency-filter solver: keeps every password still consistent with the
+observed (x, altitude) pairs and probes where the survivors disagree most.
+
+The oracle is a deterministic function of the password, so for a short length
+the whole candidate space numeric_range(L) (<= 900k integers for L <= 6) fits
+in one LayoutBatch.  Each answer filters the live candidates with one
+vectorized oracle pass; the next x is the one, among a small pool (live
+candidates and an even grid), whose altitudes split a sample of the survivors
+into the smallest expected remaining set (sum of class sizes squared / n).
+The first probe does not depend on the problem, so it and the altitudes of all
+candidates at it are computed once per (length, hill count) and the first
+filter is a binary search.
+
+Filtering uses np.exp (LayoutBatch exact=False) with a relative tolerance of
+RTOL instead of exact equality, so the last-ulp differences from math.exp can
+only keep a few extra candidates, never drop the password.  This is a
+reference for how many guesses a near-optimal strategy needs, not a fast
+solver: building the candidate space for L=6 takes seconds (once per process).
+Longer passwords are handed to solver.solve_steps.
+
+    python koth_harness.py --solver filter_solver:solve --difficulty 30 --n 2000
+    python koth_harness.py --compare solver:solve filter_solver:solve --difficulty 30
+"""
+import functools
+
+import numpy as np
+
+from koth_gen import LayoutBatch, hill_count, numeric_range
+import solver
+from solver import Session, _res
+
+MAX_LENGTH = 6      # candidate space of numeric_range(6): 900k layouts, ~130 MB at 9 hills
+SAMPLE = 20000      # survivors a probe's split is scored on
+POOL = 16           # probe positions scored per guess
+RTOL = 1e-12
+
+PHASES = solver.PHASES + ("filter",)
+PHASE_FILTER = len(solver.PHASES)
+
+
+class FilterSession(Session):
+    PHASES = PHASES
+
+
+@functools.lru_cache(maxsize=2)
+def candidate_space(password_length, hc):
+    """LayoutBatch of every password in numeric_range(password_length)."""
+    lo, hi = numeric_range(password_length)
+    p = np.arange(lo, hi + 1, dtype=np.int64)
+    return LayoutBatch.from_passwords(p, np.full(p.size, password_length), np.full(p.size, hc))
+
+
+def _altitudes(batch, rows, x):
+    return batch.altitude(rows, np.full(rows.size, x, dtype=np.int64), exact=False)
+
+
+def _split_score(batch, sample, x):
+    """Expected number of sample candidates left after probing x."""
+    _, counts = np.unique(_altitudes(batch, sample, x), return_counts=True)
+    return float(np.dot(counts, counts)) / sample.size
+
+
+def _consistent(alts, a):
+    return np.abs(alts - a) <= RTOL * abs(a) + 1e-300
+
+
+def _best_probe(batch, live, lo, hi, rng, probed=()):
+    """x from the pool with the best split of (a sample of) `live`; ties go to
+    the earlier pool entry, and live candidates come first (they may hit)."""
+    if live.size <= POOL:
+        pool = batch.p[live].tolist()
+        sample = live
+    else:
+        pool = batch.p[rng.choice(live, POOL // 2, replace=False)].tolist()
+        pool += np.linspace(lo, hi, POOL // 2).round().astype(np.int64).tolist()
+        sample = rng.choice(live, SAMPLE, replace=False) if live.size > SAMPLE else live
+    pool = [x for x in dict.fromkeys(pool) if x not in probed] or [int(batch.p[live[0]])]
+    scores = [_split_score(batch, sample, x) for x in pool]
+    return pool[int(np.argmin(scores))]
+
+
+@functools.lru_cache(maxsize=None)
+def _opening(password_length, hc):
+    """(first x, altitude of every candidate at x sorted, candidate order)."""
+    batch = candidate_space(password_length, hc)
+    lo, hi = numeric_range(password_length)
+    everyone = np.arange(batch.p.size)
+    x0 = _best_probe(batch, everyone, lo, hi, np.random.default_rng(0))
+    alts = _altitudes(batch, everyone, x0)
+    order = np.argsort(alts, kind="stable")
+    return x0, alts[order], order
+
+
+def _opening_survivors(password_length, hc, a):
+    _, alts, order = _opening(password_length, hc)
+    tol = RTOL * abs(a) + 1e-300
+    return order[np.searchsorted(alts, a - tol, side="left"):np.searchsorted(alts, a + tol, side="right")]
+
+
+def solve_steps(password_length, difficulty, cap=600, trace=None, prof=None):
+    """solver.solve_steps-style generator (see solver.drive)."""
+    L = password_length
+    if L > MAX_LENGTH:
+        return (yield from solver.solve_steps(L, difficulty, cap, trace, prof))
+    hc = hill_count(difficulty)
+    lo, hi = numeric_range(L)
+    batch = candidate_space(L, hc)
+    sess = FilterSession(lo, hi, cap=cap, trace=trace, prof=prof)
+    sess.stage = "filter"; sess.set_phase(PHASE_FILTER)
+    rng = np.random.default_rng(0)
+
+    x = _opening(L, hc)[0]
+    a = yield from sess.probe(x)
+    if sess.solved or a is None:
+        return _res(sess)
+    live = _opening_survivors(L, hc, a)
+    while live.size:
+        x = _best_probe(batch, live, lo, hi, rng, sess.samples)
+        a = yield from sess.probe(x)
+        if sess.solved or a is None:
+            break
+        live = live[_consistent(_altitudes(batch, live, x), a)]
+    res = _res(sess)
+    if not sess.solved and not live.size:
+        res["reason"] = "no-consistent-candidate"
+    return res
+
+
+def solve(assignment, cap=600, trace=None, prof=None):
+    if prof is None:
+        return solver.drive(assignment, lambda L, d: solve_steps(L, d, cap, trace, None))
+    prof.switch(PHASES[PHASE_FILTER])
+    try:
+        return solver.drive(assignment, lambda L, d: solve_steps(L, d, cap, trace, prof), prof)
+    finally:
+        prof.switch(None)
+
+
+def solve_many(assignments, cap=600, exact=True):
+    """Lockstep batch solve (solver.drive_many); same results as solve()."""
+    return solver.drive_many(assignments, lambda L, d: solve_steps(L, d, cap), exact)
@@ -0,0 +1,163 @@
+"""
+ctypes binding to the C++ generator / oracle / solvers (tests/koth_tune/src,
+koth_capi target).  Build the library once with
+
+    cmake --preset koth-tune-release -S tests/koth_tune
+    cmake --build tests/koth_tune/build --config Release --target koth_capi
+
+or point KOTH_CPP_LIB at it.  Used by `koth_harness.py --oracle cpp` and
+`--solver cpp:<variant>`.
+"""
+import ctypes
+import functools
+import os
+
+import numpy as np
+
+CAPI_VERSION = 1
+_BUILD_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "build")
+_LIB_NAMES = ("libkoth_capi.so", "libkoth_capi.dylib", "koth_capi.dll")
+
+_i64_p = np.ctypeslib.ndpointer(dtype=np.int64, flags="C_CONTIGUOUS")
+_i32_p = np.ctypeslib.ndpointer(dtype=np.int32, flags="C_CONTIGUOUS")
+_f64_p = np.ctypeslib.ndpointer(dtype=np.float64, flags="C_CONTIGUOUS")
+
+
+def library_path():
+    """KOTH_CPP_LIB, else the first koth_capi library found under tests/koth_tune/build."""
+    env = os.environ.get("KOTH_CPP_LIB")
+    if env:
+        return env
+    for sub in ("", "Release"):
+        for name in _LIB_NAMES:
+            path = os.path.join(_BUILD_DIR, sub, name)
+            if os.path.exists(path):
+                return os.path.normpath(path)
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def lib():
+    path = library_path()
+    if path is None:
+        raise FileNotFoundError(
+            "koth_capi library not found; build it with `cmake --build tests/koth_tune/build "
+            "--config Release --target koth_capi` or set KOTH_CPP_LIB")
+    so = ctypes.CDLL(path)
+    so.koth_api_version.restype = ctypes.c_int
+    if so.koth_api_version() != CAPI_VERSION:
+        raise RuntimeError(f"{path}: koth_capi version {so.koth_api_version()}, expected {CAPI_VERSION}; rebuild it")
+    so.koth_altitude.argtypes = [ctypes.c_char_p, ctypes.c_int, ctypes.c_int64]
+    so.koth_altitude.restype = ctypes.c_double
+    so.koth_altitude_many.argtypes = [ctypes.c_char_p, ctypes.c_int, _i64_p, ctypes.c_int64, _f64_p]
+    so.koth_altitude_many.restype = None
+    so.koth_generate_passwords.argtypes = [ctypes.c_uint32, ctypes.c_int, ctypes.c_int, ctypes.c_int, _i64_p]
+    so.koth_generate_passwords.restype = None
+    so.koth_solver_variant_count.restype = ctypes.c_int
+    so.koth_solver_variant_name.argtypes = [ctypes.c_int]
+    so.koth_solver_variant_name.restype = ctypes.c_char_p
+    so.koth_set_tuned_config.argtypes = [ctypes.c_char_p]
+    so.koth_set_tuned_config.restype = ctypes.c_int
+    so.koth_solve.argtypes = [ctypes.c_char_p, ctypes.c_int, ctypes.c_int, ctypes.c_int,
+                              ctypes.POINTER(ctypes.c_int32), ctypes.POINTER(ctypes.c_int64),
+                              ctypes.POINTER(ctypes.c_double)]
+    so.koth_solve.restype = ctypes.c_int
+    so.koth_solve_many.argtypes = [_i64_p, ctypes.c_int64, ctypes.c_int, ctypes.c_int, ctypes.c_int,
+                                   _i32_p, _i32_p]
+    so.koth_solve_many.restype = ctypes.c_int
+    return so
+
+
+def available():
+    try:
+        lib()
+    except (OSError, RuntimeError):
+        return False
+    return True
+
+
+# ---------------------------------------------------------------------------
+# oracle / generator
+# ---------------------------------------------------------------------------
+def altitude(password_str, difficulty, x):
+    return lib().koth_altitude(password_str.encode(), difficulty, int(x))
+
+
+def altitude_many(password_str, difficulty, xs):
+    xs = np.ascontiguousarray(xs, dtype=np.int64)
+    out = np.empty(xs.shape, dtype=np.float64)
+    lib().koth_altitude_many(password_str.encode(), difficulty, xs.ravel(), xs.size, out.ravel())
+    return out
+
+
+def generate_passwords(seed, count, difficulty, start=1):
+    """int64 passwords of rows start..start+count-1 (== koth_gen.generate_assignment_batch)."""
+    out = np.empty(count, dtype=np.int64)
+    lib().koth_generate_passwords(seed & 0xFFFFFFFF, start, count, difficulty, out)
+    return out
+
+
+class CppLayout:
+    """HillLayout stand-in answering through getKingOfTheHillAltitude (which
+    replays the WHRNG on every call, as the game does)."""
+    __slots__ = ("p", "pw", "difficulty")
+
+    def __init__(self, password_str, difficulty):
+        self.pw = password_str.encode()
+        self.p = int(password_str)
+        self.difficulty = difficulty
+
+    def altitude(self, x):
+        return lib().koth_altitude(self.pw, self.difficulty, x)
+
+    def altitude_many(self, xs):
+        return altitude_many(self.pw.decode(), self.difficulty, xs)
+
+
+# ---------------------------------------------------------------------------
+# solvers
+# ---------------------------------------------------------------------------
+def variants():
+    so = lib()
+    return [so.koth_solver_variant_name(i).decode() for i in range(so.koth_solver_variant_count())]
+
+
+def set_tuned_config(path):
+    """Load a *.best.json for the ladder_snipe_tuned variant."""
+    if not lib().koth_set_tuned_config(os.fsencode(path)):
+        raise ValueError(f"{path}: could not load tuning")
+
+
+def _variant_index(name):
+    names = variants()
+    if name not in names:
+        raise ValueError(f"unknown C++ solver variant {name!r}; choose from {', '.join(names)}")
+    return names.index(name)
+
+
+def solver(name="ladder_snipe"):
+    """solve(assignment, cap=600) -> {"solved", "guesses", "best_x", "best_alt"} running
+    the C++ variant `name` (see variants())."""
+    index = _variant_index(name)
+    so = lib()
+
+    def solve(assignment, cap=600):
+        guesses = ctypes.c_int32()
+        best_x = ctypes.c_int64()
+        best_alt = ctypes.c_double()
+        solved = so.koth_solve(assignment["password"].encode(), assignment["difficulty"], cap, index,
+                               ctypes.byref(guesses), ctypes.byref(best_x), ctypes.byref(best_alt))
+        return {"solved": bool(solved), "guesses": guesses.value,
+                "best_x": best_x.value, "best_alt": best_alt.value}
+
+    solve.__name__ = f"cpp_{name}"
+    return solve
+
+
+def solve_many(passwords, difficulty, name="ladder_snipe", cap=600):
+    """(solved bool array, guesses int32 array) for int64 passwords of one difficulty."""
+    passwords = np.ascontiguousarray(passwords, dtype=np.int64)
+    solved = np.empty(passwords.size, dtype=np.int32)
+    guesses = np.empty(passwords.size, dtype=np.int32)
+    lib().koth_solve_many(passwords, passwords.size, difficulty, cap, _variant_index(name), solved, guesses)
+    return solved.astype(bool), guesses
@@ -6,8 +6,11 @@ altitude oracle, mirroring:
 
 Only the *generator* + *oracle* are ported here. The solver lives in solver.py.
 """
+import functools
 import math
 
+import numpy as np
+
 # ---- constants (verified against koth_common.hpp / solverCore.ts) ----
 KOTH_PEAK_HEIGHT              = 10000
 KOTH_NEAR_ZONE_FRACTION      = 0.03
@@ -87,9 +90,7 @@ def get_password_seeded(length, rng):
 
 
 def build_assignment(difficulty, rng):
-    raw_len = 1.0 + difficulty / ASSIGNMENT_PASSWORD_LENGTH_DIVISOR
-    password_length = int(min(raw_len, float(ASSIGNMENT_PASSWORD_LENGTH_CAP)))
-    password = get_password_seeded(password_length, rng)
+    password = get_password_seeded(assignment_password_length(difficulty), rng)
     return {
         "difficulty": difficulty,
         "password": password,
@@ -103,8 +104,105 @@ def generate_assignment_at(seed, index, difficulty):
     return build_assignment(difficulty, mulberry32(rng_seed))
 
 
+def assignment_password_length(difficulty):
+    """Requested digit count for a difficulty (before leading-zero stripping)."""
+    raw_len = 1.0 + difficulty / ASSIGNMENT_PASSWORD_LENGTH_DIVISOR
+    return int(min(raw_len, float(ASSIGNMENT_PASSWORD_LENGTH_CAP)))
+
+
+def mulberry32_lanes(seeds, steps):
+    """Vectorized mulberry32: (steps, lanes) array of draws, one lane per seed."""
+    state = np.asarray(seeds, dtype=np.uint32).copy()
+    out = np.empty((steps, state.size), dtype=np.float64)
+    with np.errstate(over="ignore"):
+        for k in range(steps):
+            state += np.uint32(0x6d2b79f5)
+            t = state.copy()
+            t = (t ^ (t >> np.uint32(15))) * (t | np.uint32(1))
+            t = t ^ (t + ((t ^ (t >> np.uint32(7))) * (t | np.uint32(61))))
+            t ^= t >> np.uint32(14)
+            out[k] = t / 4294967296.0
+    return out
+
+
+class AssignmentBatch:
+    """Array-backed assignments: `passwords` (int64), `lengths` (uint8) and
+    `difficulties` (int16), one row per 1-based index.  Indexing/iterating yields
+    the same dicts as generate_assignment_at, built lazily per row."""
+    __slots__ = ("passwords", "lengths", "difficulties")
+
+    def __init__(self, passwords, lengths, difficulties):
+        self.passwords = passwords
+        self.lengths = lengths
+        self.difficulties = difficulties
+
+    def __len__(self):
+        return len(self.passwords)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return AssignmentBatch(self.passwords[i], self.lengths[i], self.difficulties[i])
+        return {
+            "difficulty": int(self.difficulties[i]),
+            "password": str(int(self.passwords[i])),
+            "passwordLength": int(self.lengths[i]),
+        }
+
+    def __iter__(self):
+        for pw, length, diff in zip(self.passwords.tolist(), self.lengths.tolist(),
+                                    self.difficulties.tolist()):
+            yield {"difficulty": diff, "password": str(pw), "passwordLength": length}
+
+
+def _password_lengths(passwords):
+    """Decimal digit count of each (non-negative) password; 0 has one digit."""
+    lengths = np.ones(passwords.shape, dtype=np.uint8)
+    for k in range(1, ASSIGNMENT_MAX_SAFE_PASSWORD_DIGITS):
+        lengths += passwords >= 10 ** k
+    return lengths
+
+
+def _password_digits(difficulty):
+    """Digits of the mulberry32 stream that make up the password (after truncation)."""
+    capped = max(1, min(assignment_password_length(difficulty), 50))
+    return min(capped, ASSIGNMENT_MAX_SAFE_PASSWORD_DIGITS)
+
+
+def generate_assignment_batches(seed, count, difficulties, start=1):
+    """{difficulty: AssignmentBatch} of rows start..start+count-1 for every difficulty.
+
+    A row's digit stream depends only on (seed, index); a difficulty just decides
+    how many leading digits make the password.  So the longest stream is drawn
+    once and every shorter password is a prefix of it.
+    """
+    difficulties = list(difficulties)
+    if not difficulties:
+        return {}
+    wanted = {}
+    for d in difficulties:
+        wanted.setdefault(_password_digits(d), []).append(d)
+    i = np.arange(start - 1, start - 1 + count, dtype=np.uint64)
+    lanes = ((np.uint64(seed) + i * np.uint64(ASSIGNMENT_SEED_STRIDE)) & np.uint64(MASK32)).astype(np.uint32)
+    draws = mulberry32_lanes(lanes, max(wanted))
+    digits = np.minimum(9, np.floor(draws * 10.0)).astype(np.int64)
+    out = {}
+    passwords = np.zeros(count, dtype=np.int64)
+    for k in range(max(wanted)):
+        passwords = passwords * 10 + digits[k]
+        if k + 1 in wanted:
+            lengths = _password_lengths(passwords)
+            for d in wanted[k + 1]:
+                out[d] = AssignmentBatch(passwords, lengths, np.full(count, d, dtype=np.int16))
+    return out
+
+
+def generate_assignment_batch(seed, count, difficulty, start=1):
+    """Rows start..start+count-1 of generate_assignments, as an AssignmentBatch."""
+    return generate_assignment_batches(seed, count, [difficulty], start)[difficulty]
+
+
 def generate_assignments(seed, count, difficulty):
-    return [generate_assignment_at(seed, i + 1, difficulty) for i in range(count)]
+    return generate_assignment_batch(seed, count, difficulty)
 
 
 # ---------------------------------------------------------------------------
@@ -114,6 +212,24 @@ def hill_count(difficulty):
     return min(difficulty // KOTH_HILL_DIFFICULTY_DIVISOR, KOTH_HILL_DIFFICULTY_CAP) * 2 + 1
 
 
+def difficulty_class(difficulty):
+    """(requested password length, hill count): everything a difficulty changes.
+
+    Two difficulties in the same class generate the same passwords for a seed and
+    index and get the same oracle, so any solver sees identical problems.
+    """
+    return assignment_password_length(difficulty), hill_count(difficulty)
+
+
+def difficulty_classes(difficulties):
+    """{class: [difficulties...]} in first-seen order; the first difficulty of
+    each list is the one to actually run."""
+    classes = {}
+    for d in difficulties:
+        classes.setdefault(difficulty_class(d), []).append(d)
+    return classes
+
+
 def gaussian_width(password_length):
     return 10 ** max(password_length - KOTH_GAUSS_WIDTH_LENGTH_OFFSET, 0) + KOTH_GAUSS_WIDTH_PLUS
 
@@ -126,32 +242,244 @@ def numeric_range(password_length):
     return lo, hi
 
 
-def _alt_given_specs(x, location, height, width):
-    dx = x - location
-    return height * math.exp((dx * dx / (width * width)) * -1.0)
+def _near_zone_bounds(p):
+    """Inclusive integer [lo, hi] with abs((x-p)/p) < KOTH_NEAR_ZONE_FRACTION ((1, 0) if none)."""
+    if p == 0:
+        return 1, 0
+    r = int(p * KOTH_NEAR_ZONE_FRACTION)
+    lo, hi = p - r - 2, p + r + 2
+    while abs((lo - p) / p) >= KOTH_NEAR_ZONE_FRACTION:
+        lo += 1
+    while abs((hi - p) / p) >= KOTH_NEAR_ZONE_FRACTION:
+        hi -= 1
+    return lo, hi
+
+
+# ---------------------------------------------------------------------------
+# hill layout: the WHRNG replay is identical for every probe against the same
+# password, so draw it once and evaluate all probes against the cached result.
+# ---------------------------------------------------------------------------
+class HillLayout:
+    __slots__ = ("p", "pw_hill_index", "width", "w2", "centers", "heights",
+                 "near_lo", "near_hi", "_centers_np", "_heights_np")
+
+    def __init__(self, password_str, hc):
+        p = int(password_str)
+        rng = WHRNG(p)
+        pw_hill_index = int(math.floor(rng.random() * (hc - 2))) + 1
+        width = gaussian_width(len(password_str))
+        centers = []
+        heights = []
+        for i in range(hc):
+            loc_off = (i - pw_hill_index) * width * KOTH_HILL_SPACING_WIDTHS * (
+                rng.random() * KOTH_LOCATION_JITTER_SCALE + KOTH_LOCATION_JITTER_BASE
+            )
+            ht_off = abs((i - pw_hill_index) * KOTH_HEIGHT_OFFSET_BASE) * (
+                rng.random() * KOTH_HEIGHT_JITTER_SCALE + KOTH_HEIGHT_JITTER_BASE
+            )
+            centers.append(p + loc_off)
+            heights.append(KOTH_PEAK_HEIGHT - ht_off)
+        self.p = p
+        self.pw_hill_index = pw_hill_index
+        self.width = width
+        self.w2 = width * width
+        self.centers = tuple(centers)
+        self.heights = tuple(heights)
+        self.near_lo, self.near_hi = _near_zone_bounds(p)
+        self._centers_np = None
+        self._heights_np = None
+
+    def in_near_zone(self, x):
+        """abs((x - p) / p) < KOTH_NEAR_ZONE_FRACTION for integer x (probes are
+        integers), as the precomputed inclusive bounds: the float test is
+        monotone in |x - p|, so it holds on exactly [near_lo, near_hi]."""
+        return self.near_lo <= x <= self.near_hi
+
+    def altitude(self, x):
+        """Bit-identical to the uncached oracle (same terms, same summation order)."""
+        w2 = self.w2
+        if self.in_near_zone(x):
+            dx = x - self.p
+            return KOTH_PEAK_HEIGHT * math.exp((dx * dx / w2) * -1.0)
+        alt = 0.0
+        for c, h in zip(self.centers, self.heights):
+            dx = x - c
+            alt += h * math.exp((dx * dx / w2) * -1.0)
+        return alt
+
+    def altitude_many(self, xs):
+        """Vectorized altitude(); equal up to exp() rounding (np.exp vs math.exp can
+        differ in the last ulp), so use it for analysis, not for bit-exact parity."""
+        if self._centers_np is None:
+            self._centers_np = np.array(self.centers, dtype=np.float64)
+            self._heights_np = np.array(self.heights, dtype=np.float64)
+        xs = np.asarray(xs, dtype=np.float64)
+        alt = np.zeros(xs.shape, dtype=np.float64)
+        for c, h in zip(self._centers_np, self._heights_np):
+            dx = xs - c
+            alt += h * np.exp((dx * dx / self.w2) * -1.0)
+        if self.p != 0:
+            near = np.abs((xs - self.p) / self.p) < KOTH_NEAR_ZONE_FRACTION
+            dx = xs[near] - self.p
+            alt[near] = KOTH_PEAK_HEIGHT * np.exp((dx * dx / self.w2) * -1.0)
+        return alt
+
+
+def whrng_lanes(passwords, steps):
+    """Vectorized WHRNG: (steps, lanes) array of draws, one lane per password.
+    Only fmod/mul/div/add are involved, so every draw is bit-identical to WHRNG."""
+    s = np.fmod(np.asarray(passwords, dtype=np.float64) / 1000.0, 30000.0)
+    s1, s2, s3 = s, s.copy(), s.copy()
+    out = np.empty((steps, s.size), dtype=np.float64)
+    for k in range(steps):
+        s1 = np.fmod(171.0 * s1, 30269.0)
+        s2 = np.fmod(172.0 * s2, 30307.0)
+        s3 = np.fmod(170.0 * s3, 30323.0)
+        out[k] = np.fmod(s1 / 30269.0 + s2 / 30307.0 + s3 / 30323.0, 1.0)
+    return out
+
+
+def hill_layout_arrays(passwords, lengths, hc):
+    """HillLayout for many passwords at once -> (pw_hill_index, centers, heights),
+    centers/heights shaped [lanes, hc] and bit-identical to HillLayout."""
+    passwords = np.asarray(passwords, dtype=np.int64)
+    width = 10 ** np.maximum(np.asarray(lengths, dtype=np.int64) - KOTH_GAUSS_WIDTH_LENGTH_OFFSET, 0) \
+        + KOTH_GAUSS_WIDTH_PLUS
+    draws = whrng_lanes(passwords, 1 + 2 * hc)
+    pw_index = np.floor(draws[0] * (hc - 2)).astype(np.int64) + 1
+    centers = np.empty((passwords.size, hc), dtype=np.float64)
+    heights = np.empty((passwords.size, hc), dtype=np.float64)
+    p = passwords.astype(np.float64)
+    for i in range(hc):
+        k = i - pw_index
+        loc_off = (k * width * KOTH_HILL_SPACING_WIDTHS) * (
+            draws[1 + 2 * i] * KOTH_LOCATION_JITTER_SCALE + KOTH_LOCATION_JITTER_BASE
+        )
+        ht_off = np.abs(k * KOTH_HEIGHT_OFFSET_BASE) * (
+            draws[2 + 2 * i] * KOTH_HEIGHT_JITTER_SCALE + KOTH_HEIGHT_JITTER_BASE
+        )
+        centers[:, i] = p + loc_off
+        heights[:, i] = KOTH_PEAK_HEIGHT - ht_off
+    return pw_index, centers, heights
+
+
+# Largest integer below which int->float64 is exact, so float division of two
+# such ints rounds like Python's exact int/int true division.
+_EXACT_INT = 2 ** 53
+
+
+def _exp_exact(args):
+    """math.exp elementwise (bit-identical to the scalar oracle, unlike np.exp)."""
+    flat = args.ravel()
+    return np.fromiter(map(math.exp, flat.tolist()), dtype=np.float64, count=flat.size).reshape(args.shape)
+
+
+class LayoutBatch:
+    """Many HillLayouts as padded arrays, to answer one probe per layout per call.
+
+    `altitude(rows, xs)` evaluates layout rows[k] at xs[k] with the same terms and
+    summation order as HillLayout.altitude; with `exact` (default) exp() is
+    math.exp, so the answers are bit-identical to the scalar oracle.
+    """
+    __slots__ = ("p", "w2", "w2_int", "centers", "heights")
+
+    def __init__(self, p, w2_int, centers, heights):
+        self.p = np.asarray(p, dtype=np.int64)
+        self.w2_int = np.asarray(w2_int, dtype=np.int64)
+        self.w2 = self.w2_int.astype(np.float64)
+        self.centers = centers          # [n, max hills]; padding hills have height 0
+        self.heights = heights
+
+    @classmethod
+    def from_layouts(cls, layouts):
+        n = len(layouts)
+        k = max((len(lay.centers) for lay in layouts), default=1)
+        centers = np.zeros((n, k), dtype=np.float64)
+        heights = np.zeros((n, k), dtype=np.float64)
+        for i, lay in enumerate(layouts):
+            centers[i, :len(lay.centers)] = lay.centers
+            heights[i, :len(lay.heights)] = lay.heights
+        return cls([lay.p for lay in layouts], [lay.w2 for lay in layouts], centers, heights)
+
+    @classmethod
+    def from_passwords(cls, passwords, lengths, hill_counts):
+        """Built with hill_layout_arrays (one WHRNG pass per hill count), no HillLayouts."""
+        passwords = np.asarray(passwords, dtype=np.int64)
+        lengths = np.asarray(lengths, dtype=np.int64)
+        hill_counts = np.asarray(hill_counts, dtype=np.int64)
+        k = int(hill_counts.max()) if hill_counts.size else 1
+        centers = np.zeros((passwords.size, k), dtype=np.float64)
+        heights = np.zeros((passwords.size, k), dtype=np.float64)
+        for hc in np.unique(hill_counts).tolist():
+            sel = np.flatnonzero(hill_counts == hc)
+            _, c, h = hill_layout_arrays(passwords[sel], lengths[sel], hc)
+            centers[sel, :hc] = c
+            heights[sel, :hc] = h
+        width = 10 ** np.maximum(lengths - KOTH_GAUSS_WIDTH_LENGTH_OFFSET, 0) + KOTH_GAUSS_WIDTH_PLUS
+        return cls(passwords, width * width, centers, heights)
+
+    def altitude(self, rows, xs, exact=True):
+        exp = _exp_exact if exact else np.exp
+        xs = np.asarray(xs, dtype=np.int64)
+        p = self.p[rows]
+        w2 = self.w2[rows]
+        dx = xs.astype(np.float64)[:, None] - self.centers[rows]
+        e = exp((dx * dx / w2[:, None]) * -1.0)
+        heights = self.heights[rows]
+        alt = np.zeros(xs.shape, dtype=np.float64)
+        for j in range(heights.shape[1]):
+            alt += heights[:, j] * e[:, j]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            near = (p != 0) & (np.abs((xs - p) / p) < KOTH_NEAR_ZONE_FRACTION)
+        if near.any():
+            idx = np.flatnonzero(near)
+            d = xs[idx] - p[idx]
+            w2i = self.w2_int[rows][idx]
+            if np.all(np.abs(d) < 94906265) and np.all(w2i < _EXACT_INT):   # d*d < 2**53
+                q = (d * d).astype(np.float64) / w2i.astype(np.float64)
+            else:
+                q = np.array([(int(a) * int(a)) / int(b) for a, b in zip(d, w2i)], dtype=np.float64)
+            alt[idx] = KOTH_PEAK_HEIGHT * exp(q * -1.0)
+        return alt
+
+
+@functools.lru_cache(maxsize=4096)
+def _cached_layout(password_str, hc):
+    return HillLayout(password_str, hc)
+
+
+_cpp_layouts = None   # set_oracle("cpp"): answer through koth_cpp instead
+
+
+def hill_layout(password_str, difficulty):
+    """Cached HillLayout; keyed on hill count since difficulty only enters through it."""
+    if _cpp_layouts is not None:
+        return _cpp_layouts(password_str, difficulty)
+    return _cached_layout(password_str, hill_count(difficulty))
+
+
+def set_oracle(name):
+    """Answer hill_layout()/altitude() with the "python" port (default) or the C++
+    oracle ("cpp", through koth_cpp; needs the koth_capi library)."""
+    global _cpp_layouts
+    if name == "python":
+        _cpp_layouts = None
+    elif name == "cpp":
+        import koth_cpp
+        koth_cpp.lib()
+        _cpp_layouts = koth_cpp.CppLayout
+    else:
+        raise ValueError(f"unknown oracle {name!r} (python, cpp)")
 
 
 def altitude(password_str, difficulty, x):
     """Oracle: altitude(x) for attempted integer x.  Mirrors getKingOfTheHillAltitude."""
-    p = int(password_str)
-    rng = WHRNG(p)
-    hc = hill_count(difficulty)
-    pw_hill_index = int(math.floor(rng.random() * (hc - 2))) + 1
-    width = gaussian_width(len(password_str))
+    return hill_layout(password_str, difficulty).altitude(x)
 
-    if p != 0 and abs((x - p) / p) < KOTH_NEAR_ZONE_FRACTION:
-        return _alt_given_specs(x, p, KOTH_PEAK_HEIGHT, width)
 
-    alt = 0.0
-    for i in range(hc):
-        loc_off = (i - pw_hill_index) * width * KOTH_HILL_SPACING_WIDTHS * (
-            rng.random() * KOTH_LOCATION_JITTER_SCALE + KOTH_LOCATION_JITTER_BASE
-        )
-        ht_off = abs((i - pw_hill_index) * KOTH_HEIGHT_OFFSET_BASE) * (
-            rng.random() * KOTH_HEIGHT_JITTER_SCALE + KOTH_HEIGHT_JITTER_BASE
-        )
-        alt += _alt_given_specs(x, p + loc_off, KOTH_PEAK_HEIGHT - ht_off, width)
-    return alt
+def altitude_many(password_str, difficulty, xs):
+    """Vectorized altitude() over an array of attempted integers."""
+    return hill_layout(password_str, difficulty).altitude_many(xs)
 
 
 # ---------------------------------------------------------------------------
@@ -159,21 +487,10 @@ def altitude(password_str, difficulty, x):
 # solver is NOT allowed to call this).
 # ---------------------------------------------------------------------------
 def true_layout(password_str, difficulty):
-    p = int(password_str)
-    rng = WHRNG(p)
-    hc = hill_count(difficulty)
-    pw_hill_index = int(math.floor(rng.random() * (hc - 2))) + 1
-    width = gaussian_width(len(password_str))
-    hills = []
-    for i in range(hc):
-        loc_off = (i - pw_hill_index) * width * KOTH_HILL_SPACING_WIDTHS * (
-            rng.random() * KOTH_LOCATION_JITTER_SCALE + KOTH_LOCATION_JITTER_BASE
-        )
-        ht_off = abs((i - pw_hill_index) * KOTH_HEIGHT_OFFSET_BASE) * (
-            rng.random() * KOTH_HEIGHT_JITTER_SCALE + KOTH_HEIGHT_JITTER_BASE
-        )
-        hills.append({"i": i, "center": p + loc_off, "height": KOTH_PEAK_HEIGHT - ht_off})
-    return {"p": p, "pw_hill_index": pw_hill_index, "width": width, "hills": hills}
+    lay = hill_layout(password_str, difficulty)
+    hills = [{"i": i, "center": c, "height": h}
+             for i, (c, h) in enumerate(zip(lay.centers, lay.heights))]
+    return {"p": lay.p, "pw_hill_index": lay.pw_hill_index, "width": lay.width, "hills": hills}
 
 
 if __name__ == "__main__":
@@ -31,9 +31,19 @@ Usage
 
     # or, from the shell:
     #   python koth_harness.py --self-check          # validate oracle + Phase-1 scan
+    #   python koth_harness.py --build-corpus --n 100000   # mmap corpus for benchmarks
     #   python koth_harness.py --solver my_solver:solve --n 10000
+    #   python koth_harness.py --compare solver:solve my_solver:solve --n 100000
 """
+import functools
+import inspect
 import math
+import os
+import struct
+import sys
+import time
+
+import numpy as np
 
 # ============================================================================
 # constants  (verified against koth_common.hpp / solverCore.ts)
@@ -116,9 +126,7 @@ def get_password_seeded(length, rng):
 
 
 def build_assignment(difficulty, rng):
-    raw_len = 1.0 + difficulty / ASSIGNMENT_PASSWORD_LENGTH_DIVISOR
-    password_length = int(min(raw_len, float(ASSIGNMENT_PASSWORD_LENGTH_CAP)))
-    password = get_password_seeded(password_length, rng)
+    password = get_password_seeded(assignment_password_length(difficulty), rng)
     return {
         "difficulty": difficulty,
         "password": password,
@@ -133,8 +141,106 @@ def generate_assignment_at(seed, index, difficulty):
     return build_assignment(difficulty, mulberry32(rng_seed))
 
 
+def assignment_password_length(difficulty):
+    """Requested digit count for a difficulty (before leading-zero stripping)."""
+    raw_len = 1.0 + difficulty / ASSIGNMENT_PASSWORD_LENGTH_DIVISOR
+    return int(min(raw_len, float(ASSIGNMENT_PASSWORD_LENGTH_CAP)))
+
+
+def mulberry32_lanes(seeds, steps):
+    """Vectorized mulberry32: (steps, lanes) array of draws, one lane per seed."""
+    state = np.asarray(seeds, dtype=np.uint32).copy()
+    out = np.empty((steps, state.size), dtype=np.float64)
+    with np.errstate(over="ignore"):
+        for k in range(steps):
+            state += np.uint32(0x6d2b79f5)
+            t = state.copy()
+            t = (t ^ (t >> np.uint32(15))) * (t | np.uint32(1))
+            t = t ^ (t + ((t ^ (t >> np.uint32(7))) * (t | np.uint32(61))))
+            t ^= t >> np.uint32(14)
+            out[k] = t / 4294967296.0
+    return out
+
+
+class AssignmentBatch:
+    """Array-backed assignments: `passwords` (int64), `lengths` (uint8) and
+    `difficulties` (int16), one row per 1-based index.  Indexing/iterating yields
+    the same dicts as generate_assignment_at, built lazily per row."""
+    __slots__ = ("passwords", "lengths", "difficulties")
+
+    def __init__(self, passwords, lengths, difficulties):
+        self.passwords = passwords
+        self.lengths = lengths
+        self.difficulties = difficulties
+
+    def __len__(self):
+        return len(self.passwords)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return AssignmentBatch(self.passwords[i], self.lengths[i], self.difficulties[i])
+        return {
+            "difficulty": int(self.difficulties[i]),
+            "password": str(int(self.passwords[i])),
+            "passwordLength": int(self.lengths[i]),
+        }
+
+    def __iter__(self):
+        for pw, length, diff in zip(self.passwords.tolist(), self.lengths.tolist(),
+                                    self.difficulties.tolist()):
+            yield {"difficulty": diff, "password": str(pw), "passwordLength": length}
+
+
+def _password_lengths(passwords):
+    """Decimal digit count of each (non-negative) password; 0 has one digit."""
+    lengths = np.ones(passwords.shape, dtype=np.uint8)
+    for k in range(1, ASSIGNMENT_MAX_SAFE_PASSWORD_DIGITS):
+        lengths += passwords >= 10 ** k
+    return lengths
+
+
+def _password_digits(difficulty):
+    """Digits of the mulberry32 stream that make up the password (after truncation)."""
+    capped = max(1, min(assignment_password_length(difficulty), 50))
+    return min(capped, ASSIGNMENT_MAX_SAFE_PASSWORD_DIGITS)
+
+
+def generate_assignment_batches(seed, count, difficulties, start=1):
+    """{difficulty: AssignmentBatch} of rows start..start+count-1 for every difficulty.
+
+    A row's digit stream depends only on (seed, index); a difficulty just decides
+    how many leading digits make the password.  So the longest stream is drawn
+    once and every shorter password is a prefix of it.
+    """
+    difficulties = list(difficulties)
+    if not difficulties:
+        return {}
+    wanted = {}
+    for d in difficulties:
+        wanted.setdefault(_password_digits(d), []).append(d)
+    i = np.arange(start - 1, start - 1 + count, dtype=np.uint64)
+    lanes = ((np.uint64(seed) + i * np.uint64(ASSIGNMENT_SEED_STRIDE)) & np.uint64(MASK32)).astype(np.uint32)
+    draws = mulberry32_lanes(lanes, max(wanted))
+    digits = np.minimum(9, np.floor(draws * 10.0)).astype(np.int64)
+    out = {}
+    passwords = np.zeros(count, dtype=np.int64)
+    for k in range(max(wanted)):
+        passwords = passwords * 10 + digits[k]
+        if k + 1 in wanted:
+            lengths = _password_lengths(passwords)
+            for d in wanted[k + 1]:
+                out[d] = AssignmentBatch(passwords, lengths, np.full(count, d, dtype=np.int16))
+    return out
+
+
+def generate_assignment_batch(seed, count, difficulty, start=1):
+    """Rows start..start+count-1 of generate_assignments, as an AssignmentBatch."""
+    return generate_assignment_batches(seed, count, [difficulty], start)[difficulty]
+
+
 def generate_assignments(seed=DEFAULT_SEED, count=10000, difficulty=DEFAULT_DIFFICULTY):
-    return [generate_assignment_at(seed, i + 1, difficulty) for i in range(count)]
+    """Array-backed batch; index/iterate it for the {"difficulty", "password", "passwordLength"} dicts."""
+    return generate_assignment_batch(seed, count, difficulty)
 
 
 # ============================================================================
@@ -153,35 +259,129 @@ def numeric_range(password_length):
     return (10 ** (password_length - 1), 10 ** password_length - 1)
 
 
-def _alt_given_specs(x, location, height, width):
-    dx = x - location
-    return height * math.exp((dx * dx / (width * width)) * -1.0)
+def _near_zone_bounds(p):
+    """Inclusive integer [lo, hi] with abs((x-p)/p) < KOTH_NEAR_ZONE_FRACTION ((1, 0) if none)."""
+    if p == 0:
+        return 1, 0
+    r = int(p * KOTH_NEAR_ZONE_FRACTION)
+    lo, hi = p - r - 2, p + r + 2
+    while abs((lo - p) / p) >= KOTH_NEAR_ZONE_FRACTION:
+        lo += 1
+    while abs((hi - p) / p) >= KOTH_NEAR_ZONE_FRACTION:
+        hi -= 1
+    return lo, hi
 
 
 # ============================================================================
 # altitude oracle  (mirrors getKingOfTheHillAltitude)
+#
+# The WHRNG replay is identical for every probe against the same password, so
+# the hill layout is drawn once per (password, hill count) and cached.
 # ============================================================================
+class HillLayout:
+    """Hill centres/heights of one password, plus the integer near-zone bounds."""
+    __slots__ = ("p", "pw_hill_index", "width", "w2", "centers", "heights",
+                 "near_lo", "near_hi", "_centers_np", "_heights_np")
+
+    def __init__(self, password_str, hc):
+        p = int(password_str)
+        rng = WHRNG(p)
+        pw_hill_index = int(math.floor(rng.random() * (hc - 2))) + 1
+        width = gaussian_width(len(password_str))
+        centers = []
+        heights = []
+        for i in range(hc):
+            loc_off = (i - pw_hill_index) * width * KOTH_HILL_SPACING_WIDTHS * (
+                rng.random() * KOTH_LOCATION_JITTER_SCALE + KOTH_LOCATION_JITTER_BASE
+            )
+            ht_off = abs((i - pw_hill_index) * KOTH_HEIGHT_OFFSET_BASE) * (
+                rng.random() * KOTH_HEIGHT_JITTER_SCALE + KOTH_HEIGHT_JITTER_BASE
+            )
+            centers.append(p + loc_off)
+            heights.append(KOTH_PEAK_HEIGHT - ht_off)
+        self.p = p
+        self.pw_hill_index = pw_hill_index
+        self.width = width
+        self.w2 = width * width
+        self.centers = tuple(centers)
+        self.heights = tuple(heights)
+        self.near_lo, self.near_hi = _near_zone_bounds(p)
+        self._centers_np = None
+        self._heights_np = None
+
+    def in_near_zone(self, x):
+        """abs((x - p) / p) < KOTH_NEAR_ZONE_FRACTION for integer x (probes are
+        integers), as the precomputed inclusive bounds: the float test is
+        monotone in |x - p|, so it holds on exactly [near_lo, near_hi]."""
+        return self.near_lo <= x <= self.near_hi
+
+    def altitude(self, x):
+        """Bit-identical to the uncached oracle (same terms, same summation order)."""
+        w2 = self.w2
+        if self.in_near_zone(x):
+            dx = x - self.p
+            return KOTH_PEAK_HEIGHT * math.exp((dx * dx / w2) * -1.0)
+        alt = 0.0
+        for c, h in zip(self.centers, self.heights):
+            dx = x - c
+            alt += h * math.exp((dx * dx / w2) * -1.0)
+        return alt
+
+    def altitude_many(self, xs):
+        """Vectorized altitude(); equal up to exp() rounding (np.exp vs math.exp can
+        differ in the last ulp), so use it for analysis, not for bit-exact parity."""
+        if self._centers_np is None:
+            self._centers_np = np.array(self.centers, dtype=np.float64)
+            self._heights_np = np.array(self.heights, dtype=np.float64)
+        xs = np.asarray(xs, dtype=np.float64)
+        alt = np.zeros(xs.shape, dtype=np.float64)
+        for c, h in zip(self._centers_np, self._heights_np):
+            dx = xs - c
+            alt += h * np.exp((dx * dx / self.w2) * -1.0)
+        if self.p != 0:
+            near = np.abs((xs - self.p) / self.p) < KOTH_NEAR_ZONE_FRACTION
+            dx = xs[near] - self.p
+            alt[near] = KOTH_PEAK_HEIGHT * np.exp((dx * dx / self.w2) * -1.0)
+        return alt
+
+
+@functools.lru_cache(maxsize=4096)
+def _cached_layout(password_str, hc):
+    return HillLayout(password_str, hc)
+
+
+_cpp_layouts = None   # set_oracle("cpp"): answer through koth_cpp instead
+
+
+def hill_layout(password_str, difficulty):
+    """Cached HillLayout; keyed on hill count since difficulty only enters through it."""
+    if _cpp_layouts is not None:
+        return _cpp_layouts(password_str, difficulty)
+    return _cached_layout(password_str, hill_count(difficulty))
+
+
+def set_oracle(name):
+    """Answer hill_layout()/altitude() with the "python" port (default) or the C++
+    oracle ("cpp", through koth_cpp; needs the koth_capi library)."""
+    global _cpp_layouts
+    if name == "python":
+        _cpp_layouts = None
+    elif name == "cpp":
+        import koth_cpp
+        koth_cpp.lib()
+        _cpp_layouts = koth_cpp.CppLayout
+    else:
+        raise ValueError(f"unknown oracle {name!r} (python, cpp)")
+
+
 def altitude(password_str, difficulty, x):
     """Altitude feedback for an attempted integer x against the given password."""
-    p = int(password_str)
-    rng = WHRNG(p)
-    hc = hill_count(difficulty)
-    pw_hill_index = int(math.floor(rng.random() * (hc - 2))) + 1
-    width = gaussian_width(len(password_str))
+    return hill_layout(password_str, difficulty).altitude(x)
 
-    if p != 0 and abs((x - p) / p) < KOTH_NEAR_ZONE_FRACTION:
-        return _alt_given_specs(x, p, KOTH_PEAK_HEIGHT, width)
 
-    alt = 0.0
-    for i in range(hc):
-        loc_off = (i - pw_hill_index) * width * KOTH_HILL_SPACING_WIDTHS * (
-            rng.random() * KOTH_LOCATION_JITTER_SCALE + KOTH_LOCATION_JITTER_BASE
-        )
-        ht_off = abs((i - pw_hill_index) * KOTH_HEIGHT_OFFSET_BASE) * (
-            rng.random() * KOTH_HEIGHT_JITTER_SCALE + KOTH_HEIGHT_JITTER_BASE
-        )
-        alt += _alt_given_specs(x, p + loc_off, KOTH_PEAK_HEIGHT - ht_off, width)
-    return alt
+def altitude_many(password_str, difficulty, xs):
+    """Vectorized altitude() over an array of attempted integers."""
+    return hill_layout(password_str, difficulty).altitude_many(xs)
 
 
 def auth(password_str, difficulty, attempted):
@@ -193,16 +393,23 @@ def auth(password_str, difficulty, attempted):
 # optional probe session (convenience; solvers may use their own)
 # ============================================================================
 class ProbeSession:
-    """Counts distinct probes and flags success on an exact hit."""
-    def __init__(self, assignment, cap=5000):
+    """Counts distinct probes and flags success on an exact hit.
+
+    Solvers may set `phase` (a small int) before probing; with a ProbeTrace in
+    `trace` every counted probe is recorded as (guess#, phase, x, altitude).
+    """
+    def __init__(self, assignment, cap=5000, trace=None):
         self.pw = assignment["password"]
         self.p = int(self.pw)
         self.diff = assignment["difficulty"]
+        self.layout = hill_layout(self.pw, self.diff)
         self.lo, self.hi = numeric_range(assignment["passwordLength"])
         self.cap = cap
         self.samples = {}
         self.guesses = 0
         self.solved = False
+        self.phase = 0
+        self.trace = trace
 
     def probe(self, x):
         xi = int(round(x))
@@ -216,77 +423,855 @@ class ProbeSession:
         if xi == self.p:
             self.solved = True
             self.samples[xi] = math.inf
+            if self.trace is not None:
+                self.trace.record(self.phase, xi, math.inf, self.guesses)
             return math.inf
-        a = altitude(self.pw, self.diff, xi)
+        a = self.layout.altitude(xi)
         self.samples[xi] = a
+        if self.trace is not None:
+            self.trace.record(self.phase, xi, a, self.guesses)
         return a
 
 
+# ============================================================================
+# probe tracing  (opt-in; sessions only pay an `is not None` check without it)
+#
+# Trace file layout: a 32-byte little-endian header, then `count + 1` uint32
+# record offsets (problem k owns records[offsets[k]:offsets[k+1]]), then the
+# packed TRACE_DTYPE records of every problem back to back.
+# ============================================================================
+TRACE_DTYPE   = np.dtype([("guess", "<u2"), ("phase", "u1"), ("x", "<i8"), ("alt", "<f8")])
+TRACE_MAGIC   = b"KOTHTRCE"
+TRACE_VERSION = 1
+TRACE_HEADER  = struct.Struct("<8sIIiiI4x")
+
+
+class ProbeTrace:
+    """Preallocated per-problem probe buffer; reuse it across problems via reset()."""
+    __slots__ = ("buf", "n")
+
+    def __init__(self, capacity=600):
+        self.buf = np.zeros(capacity, dtype=TRACE_DTYPE)
+        self.n = 0
+
+    def reset(self):
+        self.n = 0
+
+    def record(self, phase, x, alt, guess):
+        if self.n == self.buf.size:
+            self.buf = np.concatenate([self.buf, np.zeros(self.buf.size, dtype=TRACE_DTYPE)])
+        self.buf[self.n] = (guess, phase, x, alt)
+        self.n += 1
+
+    def records(self):
+        return self.buf[:self.n]
+
+
+def write_traces(path, traces, seed=DEFAULT_SEED, difficulty=DEFAULT_DIFFICULTY, start=1):
+    """Write a list of per-problem record arrays (rows start, start+1, ...)."""
+    offsets = np.zeros(len(traces) + 1, dtype="<u4")
+    offsets[1:] = np.cumsum([len(t) for t in traces])
+    with open(path, "wb") as f:
+        f.write(TRACE_HEADER.pack(TRACE_MAGIC, TRACE_VERSION, seed & MASK32, difficulty, start, len(traces)))
+        f.write(offsets.tobytes())
+        for t in traces:
+            f.write(np.ascontiguousarray(t, dtype=TRACE_DTYPE).tobytes())
+
+
+def read_traces(path):
+    """-> (header dict, offsets, records); records memory-mapped, zero-copy."""
+    with open(path, "rb") as f:
+        magic, version, seed, difficulty, start, count = TRACE_HEADER.unpack(f.read(TRACE_HEADER.size))
+    if magic != TRACE_MAGIC or version != TRACE_VERSION:
+        raise ValueError(f"{path}: not a version-{TRACE_VERSION} KotH trace file")
+    offsets = np.memmap(path, dtype="<u4", mode="r", offset=TRACE_HEADER.size, shape=(count + 1,))
+    n_records = int(offsets[-1])
+    records = np.memmap(path, dtype=TRACE_DTYPE, mode="r",
+                        offset=TRACE_HEADER.size + offsets.nbytes, shape=(n_records,)) \
+        if n_records else np.zeros(0, dtype=TRACE_DTYPE)
+    header = {"seed": seed, "difficulty": difficulty, "start": start, "count": count}
+    return header, offsets, records
+
+
+# ============================================================================
+# persistent corpus  (memory-mapped; built once, shared by every process)
+#
+# File layout: a 64-byte little-endian header, then C-ordered arrays, each
+# starting on a 64-byte boundary:
+#     passwords    int64   [n_diff, count]
+#     lengths      uint8   [n_diff, count]
+#   with hills only:
+#     pw_index     int8    [n_diff, count]
+#     centers      float64 [n_diff, count, KOTH_MAX_HILLS]   (NaN past hill_count)
+#     heights      float64 [n_diff, count, KOTH_MAX_HILLS]
+# Row d - diff_min, column i - 1 holds generate_assignment_at(seed, i, d).
+# ============================================================================
+CORPUS_MAGIC     = b"KOTHCORP"
+CORPUS_VERSION   = 1            # bump whenever the generator/oracle port changes
+CORPUS_HEADER    = struct.Struct("<8sIIiiqI28x")
+CORPUS_ALIGN     = 64
+DEFAULT_CORPUS   = os.path.join(os.path.dirname(os.path.abspath(__file__)), "default.corpus")
+KOTH_MAX_HILLS   = KOTH_HILL_DIFFICULTY_CAP * 2 + 1
+
+
+def whrng_lanes(passwords, steps):
+    """Vectorized WHRNG: (steps, lanes) array of draws, one lane per password.
+    Only fmod/mul/div/add are involved, so every draw is bit-identical to WHRNG."""
+    s = np.fmod(np.asarray(passwords, dtype=np.float64) / 1000.0, 30000.0)
+    s1, s2, s3 = s, s.copy(), s.copy()
+    out = np.empty((steps, s.size), dtype=np.float64)
+    for k in range(steps):
+        s1 = np.fmod(171.0 * s1, 30269.0)
+        s2 = np.fmod(172.0 * s2, 30307.0)
+        s3 = np.fmod(170.0 * s3, 30323.0)
+        out[k] = np.fmod(s1 / 30269.0 + s2 / 30307.0 + s3 / 30323.0, 1.0)
+    return out
+
+
+def hill_layout_arrays(passwords, lengths, hc):
+    """HillLayout for many passwords at once -> (pw_hill_index, centers, heights),
+    centers/heights shaped [lanes, hc] and bit-identical to HillLayout."""
+    passwords = np.asarray(passwords, dtype=np.int64)
+    width = 10 ** np.maximum(np.asarray(lengths, dtype=np.int64) - KOTH_GAUSS_WIDTH_LENGTH_OFFSET, 0) \
+        + KOTH_GAUSS_WIDTH_PLUS
+    draws = whrng_lanes(passwords, 1 + 2 * hc)
+    pw_index = np.floor(draws[0] * (hc - 2)).astype(np.int64) + 1
+    centers = np.empty((passwords.size, hc), dtype=np.float64)
+    heights = np.empty((passwords.size, hc), dtype=np.float64)
+    p = passwords.astype(np.float64)
+    for i in range(hc):
+        k = i - pw_index
+        loc_off = (k * width * KOTH_HILL_SPACING_WIDTHS) * (
+            draws[1 + 2 * i] * KOTH_LOCATION_JITTER_SCALE + KOTH_LOCATION_JITTER_BASE
+        )
+        ht_off = np.abs(k * KOTH_HEIGHT_OFFSET_BASE) * (
+            draws[2 + 2 * i] * KOTH_HEIGHT_JITTER_SCALE + KOTH_HEIGHT_JITTER_BASE
+        )
+        centers[:, i] = p + loc_off
+        heights[:, i] = KOTH_PEAK_HEIGHT - ht_off
+    return pw_index, centers, heights
+
+
+def _aligned(offset):
+    return -(-offset // CORPUS_ALIGN) * CORPUS_ALIGN
+
+
+def _corpus_arrays(n_diff, count, hills):
+    """(name, dtype, shape, offset) for every array, plus the total file size."""
+    specs = [("passwords", np.int64, (n_diff, count)), ("lengths", np.uint8, (n_diff, count))]
+    if hills:
+        specs += [("pw_index", np.int8, (n_diff, count)),
+                  ("centers", np.float64, (n_diff, count, KOTH_MAX_HILLS)),
+                  ("heights", np.float64, (n_diff, count, KOTH_MAX_HILLS))]
+    out = []
+    offset = _aligned(CORPUS_HEADER.size)
+    for name, dtype, shape in specs:
+        out.append((name, dtype, shape, offset))
+        offset = _aligned(offset + np.dtype(dtype).itemsize * math.prod(shape))
+    return out, offset
+
+
+def build_corpus(path=DEFAULT_CORPUS, seed=DEFAULT_SEED, count=100000, diff_min=1, diff_max=60,
+                 hills=False, verbose=True):
+    """Write rows 1..count for every difficulty in [diff_min, diff_max] to `path`.
+
+    With `hills`, the true hill layout of every row is stored as well (9 centres +
+    9 heights per row, so ~150 bytes/row; ~860 MB for 60 x 100k).
+    """
+    n_diff = diff_max - diff_min + 1
+    specs, size = _corpus_arrays(n_diff, count, hills)
+    with open(path, "wb") as f:
+        f.write(CORPUS_HEADER.pack(CORPUS_MAGIC, CORPUS_VERSION, seed & MASK32,
+                                   diff_min, diff_max, count, int(hills)))
+        f.truncate(size)
+    arrays = {name: np.memmap(path, dtype=dtype, mode="r+", offset=offset, shape=shape)
+              for name, dtype, shape, offset in specs}
+    batches = generate_assignment_batches(seed, count, range(diff_min, diff_max + 1))
+    layouts = {}
+    for row, diff in enumerate(range(diff_min, diff_max + 1)):
+        batch = batches[diff]
+        arrays["passwords"][row] = batch.passwords
+        arrays["lengths"][row] = batch.lengths
+        if hills:
+            hc = hill_count(diff)
+            key = (_password_digits(diff), hc)
+            if key not in layouts:
+                layouts[key] = hill_layout_arrays(batch.passwords, batch.lengths, hc)
+            pw_index, centers, heights = layouts[key]
+            arrays["pw_index"][row] = pw_index
+            arrays["centers"][row, :, :hc] = centers
+            arrays["centers"][row, :, hc:] = np.nan
+            arrays["heights"][row, :, :hc] = heights
+            arrays["heights"][row, :, hc:] = np.nan
+    for a in arrays.values():
+        a.flush()
+    if verbose:
+        print(f"wrote {path}: seed={hex(seed)} difficulties={diff_min}..{diff_max} "
+              f"count={count} hills={hills} ({size / 1e6:.1f} MB)")
+    return path
+
+
+class Corpus:
+    """Read-only, memory-mapped view of a corpus file (zero-copy in every process)."""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            head = f.read(CORPUS_HEADER.size)
+        if len(head) < CORPUS_HEADER.size:
+            raise ValueError(f"{path}: truncated corpus header")
+        magic, version, seed, diff_min, diff_max, count, hills = CORPUS_HEADER.unpack(head)
+        if magic != CORPUS_MAGIC:
+            raise ValueError(f"{path}: not a KotH corpus file")
+        if version != CORPUS_VERSION:
+            raise ValueError(f"{path}: corpus version {version}, expected {CORPUS_VERSION}; rebuild it")
+        self.path = path
+        self.seed = seed
+        self.diff_min = diff_min
+        self.diff_max = diff_max
+        self.count = count
+        self.hills = bool(hills)
+        specs, _ = _corpus_arrays(diff_max - diff_min + 1, count, self.hills)
+        for name, dtype, shape, offset in specs:
+            setattr(self, name, np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=shape))
+
+    def covers(self, seed, count, difficulty, start=1):
+        return (self.seed == (seed & MASK32) and start >= 1 and start - 1 + count <= self.count
+                and self.diff_min <= difficulty <= self.diff_max)
+
+    def assignments(self, difficulty, count=None, start=1):
+        """AssignmentBatch view of rows start..start+count-1 (no copy of the mapped arrays)."""
+        row = difficulty - self.diff_min
+        count = self.count - (start - 1) if count is None else count
+        cols = slice(start - 1, start - 1 + count)
+        return AssignmentBatch(self.passwords[row, cols], self.lengths[row, cols],
+                               np.full(count, difficulty, dtype=np.int16))
+
+    def true_layout(self, difficulty, index):
+        """Stored hill layout of the 1-based row `index` (corpus built with hills)."""
+        if not self.hills:
+            raise ValueError(f"{self.path}: corpus was built without hills")
+        row, col, hc = difficulty - self.diff_min, index - 1, hill_count(difficulty)
+        p = int(self.passwords[row, col])
+        hills = [{"i": i, "center": float(c), "height": float(h)}
+                 for i, (c, h) in enumerate(zip(self.centers[row, col, :hc], self.heights[row, col, :hc]))]
+        return {"p": p, "pw_hill_index": int(self.pw_index[row, col]),
+                "width": gaussian_width(int(self.lengths[row, col])), "hills": hills}
+
+
+@functools.lru_cache(maxsize=None)
+def open_corpus(path=DEFAULT_CORPUS):
+    return Corpus(path)
+
+
+def load_assignments(seed=DEFAULT_SEED, count=10000, difficulty=DEFAULT_DIFFICULTY, corpus=DEFAULT_CORPUS,
+                     start=1):
+    """Rows start..start+count-1 of generate_assignments(seed, ..., difficulty),
+    served from the corpus file at `corpus` when it exists and covers them."""
+    if corpus and os.path.exists(corpus):
+        c = open_corpus(corpus)
+        if c.covers(seed, count, difficulty, start):
+            return c.assignments(difficulty, count, start)
+    return generate_assignment_batch(seed, count, difficulty, start)
+
+
+def load_assignment_batches(seed=DEFAULT_SEED, count=10000, difficulties=(DEFAULT_DIFFICULTY,),
+                            corpus=DEFAULT_CORPUS, start=1):
+    """{difficulty: load_assignments(...)} for several difficulties; rows the corpus
+    does not cover come from one shared generation pass."""
+    out = {}
+    if corpus and os.path.exists(corpus):
+        c = open_corpus(corpus)
+        out = {d: c.assignments(d, count, start) for d in difficulties if c.covers(seed, count, d, start)}
+    out.update(generate_assignment_batches(seed, count, [d for d in difficulties if d not in out], start))
+    return out
+
+
 # ============================================================================
 # benchmark tools
 # ============================================================================
-def _percentile(sorted_vals, q):
-    if not sorted_vals:
+class GuessStats:
+    """Mergeable exact statistics over small non-negative guess counts.
+
+    Guesses are bounded ints (<= the solver cap), so an integer-count histogram
+    is exact: percentiles come from the cumulative counts with the same
+    `sorted[min(n-1, int(q*n))]` indexing a full sorted list would use, while the
+    state stays O(cap) however many problems are added or merged.
+    """
+    __slots__ = ("counts", "unsolved")
+
+    def __init__(self, counts=None, unsolved=0):
+        self.counts = np.zeros(64, dtype=np.int64) if counts is None else np.asarray(counts, dtype=np.int64)
+        self.unsolved = unsolved
+
+    def _grow(self, size):
+        if size > self.counts.size:
+            grown = np.zeros(max(size, 2 * self.counts.size), dtype=np.int64)
+            grown[:self.counts.size] = self.counts
+            self.counts = grown
+
+    def add(self, guesses):
+        if guesses >= self.counts.size:
+            self._grow(guesses + 1)
+        self.counts[guesses] += 1
+
+    def add_many(self, guesses):
+        guesses = np.asarray(guesses, dtype=np.int64)
+        if guesses.size:
+            self._grow(int(guesses.max()) + 1)
+            self.counts += np.bincount(guesses, minlength=self.counts.size)
+
+    def merge(self, other):
+        self._grow(other.counts.size)
+        self.counts[:other.counts.size] += other.counts
+        self.unsolved += other.unsolved
+        return self
+
+    def compact(self):
+        """Copy with trailing zero counts trimmed (what workers send to the parent)."""
+        nz = np.flatnonzero(self.counts)
+        size = int(nz[-1]) + 1 if nz.size else 0
+        return GuessStats(self.counts[:size].copy(), self.unsolved)
+
+    @property
+    def solved(self):
+        return int(self.counts.sum())
+
+    def mean(self):
+        n = self.solved
+        return int(np.dot(self.counts, np.arange(self.counts.size))) / n if n else None
+
+    def min(self):
+        nz = np.flatnonzero(self.counts)
+        return int(nz[0]) if nz.size else None
+
+    def max(self):
+        nz = np.flatnonzero(self.counts)
+        return int(nz[-1]) if nz.size else None
+
+    def nth(self, idx):
+        """Value at 0-based position `idx` of the sorted guesses."""
+        return int(np.searchsorted(np.cumsum(self.counts), idx, side="right"))
+
+    def percentile(self, q):
+        n = self.solved
+        return self.nth(min(n - 1, int(q * n))) if n else None
+
+    def median(self):
+        n = self.solved
+        return self.nth(n // 2) if n else None
+
+    def histogram(self, bucket=5):
+        hist = {}
+        for g in np.flatnonzero(self.counts).tolist():
+            key = (g // bucket) * bucket
+            hist[key] = hist.get(key, 0) + int(self.counts[g])
+        return hist
+
+
+class PhaseStats:
+    """Mergeable per-phase guess accounting over solver results.
+
+    Uses the optional "phase_guesses" ({phase: guesses}) and "exit_stage" keys
+    of a result; solvers without them contribute only to `problems`.
+    """
+    __slots__ = ("problems", "guesses", "reached", "exits")
+
+    def __init__(self):
+        self.problems = 0
+        self.guesses = {}   # phase -> total guesses spent in it
+        self.reached = {}   # phase -> problems that spent >= 1 guess in it
+        self.exits = {}     # exit stage -> problems
+
+    def add(self, res):
+        self.problems += 1
+        for phase, g in (res.get("phase_guesses") or {}).items():
+            if g:
+                self.guesses[phase] = self.guesses.get(phase, 0) + g
+                self.reached[phase] = self.reached.get(phase, 0) + 1
+        stage = res.get("exit_stage")
+        if stage is not None:
+            self.exits[stage] = self.exits.get(stage, 0) + 1
+
+    def merge(self, other):
+        self.problems += other.problems
+        for mine, theirs in ((self.guesses, other.guesses), (self.reached, other.reached),
+                             (self.exits, other.exits)):
+            for k, v in theirs.items():
+                mine[k] = mine.get(k, 0) + v
+        return self
+
+    def avg_guesses(self, phase):
+        return self.guesses.get(phase, 0) / self.problems if self.problems else 0.0
+
+    def reach_share(self, phase):
+        return self.reached.get(phase, 0) / self.problems if self.problems else 0.0
+
+    def exit_share(self, stage):
+        return self.exits.get(stage, 0) / self.problems if self.problems else 0.0
+
+    def table(self, phases=None):
+        """Lines of a phase | guesses/problem | share of guesses | problems reaching table."""
+        phases = phases or sorted(self.guesses, key=self.guesses.get, reverse=True)
+        total = sum(self.guesses.values()) or 1
+        lines = [f"{'phase':<13}  {'g/problem':>9}  {'share':>6}  {'reached':>8}"]
+        for ph in phases:
+            lines.append(f"{ph:<13}  {self.avg_guesses(ph):>9.3f}  {self.guesses.get(ph, 0) / total:>6.1%}  "
+                         f"{self.reach_share(ph):>8.3%}")
+        if self.exits:
+            lines.append("exit stage: " + "  ".join(
+                f"{st}={n} ({n / self.problems:.3%})" for st, n in sorted(self.exits.items(), key=lambda kv: -kv[1])))
+        return lines
+
+
+class PerfCounters:
+    """Opt-in perf_counter_ns accumulators (name -> ns, calls); mergeable.
+
+    Besides plain `add(name, ns)` it keeps a phase clock: `switch(phase)` charges
+    the time since the previous switch to the previous phase and returns it, so a
+    solver can attribute its own (exclusive) time per phase.  `exclude(ns)` drops
+    time already charged elsewhere (e.g. the oracle) from the running phase.
+    """
+    __slots__ = ("ns", "calls", "_phase", "_mark")
+
+    def __init__(self):
+        self.ns = {}
+        self.calls = {}
+        self._phase = None
+        self._mark = 0
+
+    def add(self, name, ns, calls=1):
+        self.ns[name] = self.ns.get(name, 0) + ns
+        self.calls[name] = self.calls.get(name, 0) + calls
+
+    def switch(self, phase):
+        now = time.perf_counter_ns()
+        prev = self._phase
+        if prev is not None:
+            self.add("phase:" + prev, now - self._mark, 0)
+        self._phase = phase
+        self._mark = now
+        return prev
+
+    def exclude(self, ns):
+        self._mark += ns
+
+    def merge(self, other):
+        for name, ns in other.ns.items():
+            self.add(name, ns, other.calls.get(name, 0))
+        return self
+
+    def report(self, solves, probes):
+        """Lines: total/share/per-solve time of every counter, then ns/probe and ns/solve."""
+        total = sum(ns for name, ns in self.ns.items() if not name.startswith("phase:")) or 1
+        lines = [f"{'counter':<22}  {'total ms':>10}  {'calls':>9}  {'ns/call':>9}  {'ns/solve':>9}"]
+        for name in sorted(self.ns, key=self.ns.get, reverse=True):
+            ns, calls = self.ns[name], self.calls.get(name, 0)
+            lines.append(f"{name:<22}  {ns / 1e6:>10.1f}  {calls:>9}  "
+                         f"{(ns / calls if calls else 0):>9.0f}  {ns / max(1, solves):>9.0f}")
+        oracle = self.ns.get("oracle", 0)
+        solve_ns = self.ns.get("solve", 0)
+        probes = self.calls.get("oracle") or probes
+        lines.append(f"ns/probe (oracle) = {oracle / max(1, probes):.0f}   "
+                     f"ns/solve = {solve_ns / max(1, solves):.0f}   "
+                     f"oracle share of solve = {oracle / max(1, solve_ns):.1%}   "
+                     f"generate share = {self.ns.get('generate', 0) / total:.1%}")
+        return lines
+
+
+class _PstatsHolder:
+    """Lets pstats.Stats load a plain stats dict (e.g. one returned by a worker)."""
+    def __init__(self, stats):
+        self.stats = stats
+
+    def create_stats(self):
+        pass
+
+
+def cprofile_stats(profile):
+    """Picklable stats dict of a cProfile.Profile (send this back from workers)."""
+    profile.create_stats()
+    return profile.stats
+
+
+def merge_cprofile_stats(stats_dicts):
+    """pstats.Stats over several workers' cprofile_stats() dicts (None if empty)."""
+    import pstats
+    merged = None
+    for st in stats_dicts:
+        if merged is None:
+            merged = pstats.Stats(_PstatsHolder(st))
+        else:
+            merged.add(_PstatsHolder(st))
+    return merged
+
+
+class ProgressMonitor:
+    """Rolling solved/avg/p99/throughput report, fed with GuessStats deltas.
+
+    Prints a line every `every` problems and/or `secs` seconds.  `abort_reason()`
+    is set once a regression is certain: the first unsolved problem (with
+    `stop_on_unsolved`), or an average over all `total` problems that must end
+    above `max_avg` even if every remaining problem took a single guess.
+    """
+
+    def __init__(self, total, every=0, secs=0.0, stop_on_unsolved=False, max_avg=None,
+                 label="", out=print):
+        self.total = total
+        self.every = every
+        self.secs = secs
+        self.stop_on_unsolved = stop_on_unsolved
+        self.max_avg = max_avg
+        self.label = label
+        self.out = out
+        self.stats = GuessStats()
+        self.guess_total = 0
+        self.probes = 0
+        self.t0 = time.perf_counter()
+        self._last_t = self.t0
+        self._last_done = 0
+
+    @property
+    def done(self):
+        return self.stats.solved + self.stats.unsolved
+
+    @property
+    def enabled(self):
+        return bool(self.every or self.secs)
+
+    def add(self, stats, probes):
+        """Merge a worker's GuessStats delta."""
+        self.stats.merge(stats)
+        self.guess_total += int(np.dot(stats.counts, np.arange(stats.counts.size)))
+        self.probes += probes
+        self.maybe_report()
+
+    def add_result(self, res):
+        """Record one solve result in-process."""
+        guesses = int(res.get("guesses", 0))
+        if res.get("solved"):
+            self.stats.add(guesses)
+            self.guess_total += guesses
+        else:
+            self.stats.unsolved += 1
+        self.probes += guesses
+        self.maybe_report()
+
+    def abort_reason(self):
+        if self.stop_on_unsolved and self.stats.unsolved:
+            return f"{self.stats.unsolved} unsolved"
+        if self.max_avg is not None and self.stats.solved:
+            remaining = self.total - self.done
+            best_case = (self.guess_total + remaining) / (self.stats.solved + remaining)
+            if best_case > self.max_avg:
+                return f"avg >= {best_case:.4f} > {self.max_avg}"
         return None
-    idx = min(len(sorted_vals) - 1, int(q * len(sorted_vals)))
-    return sorted_vals[idx]
+
+    def line(self):
+        dt = max(1e-9, time.perf_counter() - self.t0)
+        s = self.stats
+        avg = f"{s.mean():.3f}" if s.solved else "-"
+        p99 = s.percentile(0.99) if s.solved else "-"
+        return (f"{self.label}{self.done}/{self.total}  solved={s.solved}  unsolved={s.unsolved}  "
+                f"avg={avg}  p99={p99}  {self.done / dt:,.0f} solves/s  {self.probes / dt:,.0f} probes/s")
+
+    def maybe_report(self, force=False):
+        if not (self.enabled or force):
+            return
+        now = time.perf_counter()
+        if (force or (self.every and self.done - self._last_done >= self.every)
+                or (self.secs and now - self._last_t >= self.secs)):
+            self.out(self.line())
+            self._last_t = now
+            self._last_done = self.done
+
+
+class ProgressTicker:
+    """Worker-side half of ProgressMonitor: batches per-problem results and
+    flushes a GuessStats delta to `sink(stats, probes)` every `every` problems
+    and/or `secs` seconds (e.g. a multiprocessing queue's put)."""
+
+    def __init__(self, sink, every=0, secs=0.0):
+        self.sink = sink
+        self.every = every
+        self.secs = secs
+        self._reset()
+
+    def _reset(self):
+        self.delta = GuessStats()
+        self.probes = 0
+        self.count = 0
+        self._t = time.perf_counter()
+
+    def add(self, res):
+        if res.get("solved"):
+            self.delta.add(int(res["guesses"]))
+        else:
+            self.delta.unsolved += 1
+        self.probes += int(res.get("guesses", 0))
+        self.count += 1
+        if ((self.every and self.count >= self.every)
+                or (self.secs and time.perf_counter() - self._t >= self.secs)):
+            self.flush()
+
+    def flush(self):
+        if self.count:
+            self.sink(self.delta.compact(), self.probes)
+        self._reset()
 
 
 def run_benchmark(solve_fn, n=10000, seed=DEFAULT_SEED, difficulty=DEFAULT_DIFFICULTY,
-                  cap=400, bucket=5, verbose=True):
+                  cap=400, bucket=5, verbose=True, corpus=DEFAULT_CORPUS,
+                  progress_every=0, progress_secs=0.0, stop_on_unsolved=False, max_avg=None,
+                  profile=False, cprofile=None):
     """Run `solve_fn` over `n` generated problems and report statistics.
 
     `solve_fn(assignment, cap=...)` must return {"solved": bool, "guesses": int}.
-    Returns a dict of aggregate stats; prints a summary when verbose.
+    Returns a dict of aggregate stats; prints a summary when verbose.  With
+    `progress_every`/`progress_secs` a rolling line is printed while running;
+    `stop_on_unsolved`/`max_avg` end the run early once it has certainly
+    regressed (stats then cover the problems done so far, see "aborted").
+
+    `profile` times corpus loading, every solve and (for solvers accepting a
+    `prof=` PerfCounters) the oracle and each solver phase; `cprofile` writes a
+    pstats file of the run to that path.
     """
-    import time
-    rows = generate_assignments(seed, n, difficulty)
+    prof = PerfCounters() if profile else None
+    t_gen = time.perf_counter_ns()
+    rows = load_assignments(seed, n, difficulty, corpus)
+    if prof is not None:
+        prof.add("generate", time.perf_counter_ns() - t_gen)
+        if "prof" in inspect.signature(solve_fn).parameters:
+            solve_fn = functools.partial(solve_fn, prof=prof)
+    cprof = None
+    if cprofile:
+        import cProfile
+        cprof = cProfile.Profile()
+        cprof.enable()
+    monitor = ProgressMonitor(n, progress_every, progress_secs, stop_on_unsolved, max_avg,
+                              out=print if verbose else (lambda _line: None))
     t0 = time.time()
-    guesses = []
+    acc = monitor.stats
+    phases = PhaseStats()
     unsolved = []
+    aborted = None
     for i, r in enumerate(rows):
+        t_solve = time.perf_counter_ns()
         try:
             res = solve_fn(r, cap=cap)
         except TypeError:
             res = solve_fn(r)
-        if res.get("solved"):
-            guesses.append(int(res["guesses"]))
-        else:
+        if prof is not None:
+            prof.add("solve", time.perf_counter_ns() - t_solve)
+        monitor.add_result(res)
+        phases.add(res)
+        if not res.get("solved"):
             unsolved.append((i + 1, r["password"], res.get("reason")))
+        aborted = monitor.abort_reason()
+        if aborted:
+            break
     dt = time.time() - t0
+    if cprof is not None:
+        cprof.disable()
+        cprof.dump_stats(cprofile)
 
-    gs = sorted(guesses)
+    solved = acc.solved
     stats = {
         "n": n, "seed": seed, "difficulty": difficulty,
-        "solved": len(gs), "unsolved": len(unsolved),
+        "solved": solved, "unsolved": len(unsolved),
         "time_s": dt,
-        "avg": (sum(gs) / len(gs)) if gs else None,
-        "median": (gs[len(gs) // 2]) if gs else None,
-        "min": gs[0] if gs else None,
-        "max": gs[-1] if gs else None,
-        "p95": _percentile(gs, 0.95),
-        "p99": _percentile(gs, 0.99),
+        "avg": acc.mean(),
+        "median": acc.median(),
+        "min": acc.min(),
+        "max": acc.max(),
+        "p95": acc.percentile(0.95),
+        "p99": acc.percentile(0.99),
         "unsolved_list": unsolved,
+        "guess_stats": acc,
+        "phases": phases,
+        "perf": prof,
+        "aborted": aborted,
     }
-    if gs:
-        from collections import Counter
-        hist = Counter((g // bucket) * bucket for g in gs)
-        stats["histogram"] = dict(sorted(hist.items()))
+    if solved:
+        stats["histogram"] = acc.histogram(bucket)
 
     if verbose:
         print(f"N={n}  seed={hex(seed)}  difficulty={difficulty}")
+        if aborted:
+            print(f"ABORTED after {solved + len(unsolved)} problems: {aborted}")
         print(f"solved={stats['solved']}  unsolved={stats['unsolved']}  time={dt:.1f}s")
-        if gs:
+        if solved:
             print(f"avg={stats['avg']:.3f}  median={stats['median']}  min={stats['min']}  "
                   f"max={stats['max']}  p95={stats['p95']}  p99={stats['p99']}")
             print(f"histogram (guess-bucket:count): {stats['histogram']}")
+        if phases.guesses:
+            print("per-phase guesses:")
+            for line in phases.table():
+                print("  " + line)
+        if prof is not None:
+            print("profile (perf_counter_ns):")
+            for line in prof.report(acc.solved + acc.unsolved, monitor.probes):
+                print("  " + line)
+        if cprof is not None:
+            import pstats
+            print(f"cProfile written to {cprofile}; top functions by cumulative time:")
+            pstats.Stats(cprofile).sort_stats("cumulative").print_stats(15)
         if unsolved:
             head = unsolved[:20]
             print(f"UNSOLVED ({len(unsolved)}): {head}{' ...' if len(unsolved) > 20 else ''}")
     return stats
 
 
-def self_check(n=10000, seed=DEFAULT_SEED, difficulty=DEFAULT_DIFFICULTY, verbose=True):
+class PairedTest:
+    """Sequential test on paired per-problem differences d = guesses_b - guesses_a.
+
+    A mixture SPRT (normal mixture over the mean difference, mixing variance =
+    the running sample variance) gives an always-valid (1 - alpha) confidence
+    interval mean(d) +/- radius(): it may be checked after every problem and
+    stopped on at any time without inflating the error rate.  The run is
+    decided once the interval excludes 0 (one solver is better) or lies inside
+    +/- margin (no difference worth measuring).
+    """
+    __slots__ = ("alpha", "margin", "n", "mean", "m2", "wins_a", "wins_b")
+
+    def __init__(self, alpha=0.05, margin=0.05):
+        self.alpha = alpha
+        self.margin = margin
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.wins_a = 0
+        self.wins_b = 0
+
+    def add_many(self, d):
+        """Merge a chunk of differences (Chan et al. parallel mean/variance update)."""
+        d = np.asarray(d, dtype=np.float64)
+        if not d.size:
+            return
+        n_b = d.size; mean_b = float(d.mean()); m2_b = float(((d - mean_b) ** 2).sum())
+        n = self.n + n_b
+        delta = mean_b - self.mean
+        self.mean += delta * n_b / n
+        self.m2 += m2_b + delta * delta * self.n * n_b / n
+        self.n = n
+        self.wins_a += int((d > 0).sum())
+        self.wins_b += int((d < 0).sum())
+
+    def variance(self):
+        return self.m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    def radius(self):
+        n = self.n
+        if n < 2:
+            return math.inf
+        var = self.variance()
+        return math.sqrt(2.0 * var * (1 + n) / (n * n) * (math.log(1 / self.alpha) + 0.5 * math.log(1 + n)))
+
+    def decision(self):
+        """"a" / "b" (that solver needs fewer guesses), "same", or None (undecided)."""
+        r = self.radius()
+        if abs(self.mean) > r:
+            return "a" if self.mean > 0 else "b"
+        if abs(self.mean) + r < self.margin:
+            return "same"
+        return None
+
+
+@functools.lru_cache(maxsize=None)
+def _cached_solver(spec):
+    return _load_solver(spec)
+
+
+def _compare_chunk(task):
+    """Guesses of both solvers on rows start..start+count-1 (unsolved count as
+    `cap`), plus which rows each left unsolved."""
+    spec_a, spec_b, seed, difficulty, start, count, corpus, cap = task
+    rows = load_assignments(seed, count, difficulty, corpus, start=start)
+    out = []
+    for spec in (spec_a, spec_b):
+        fn = _cached_solver(spec)
+        g = np.empty(count, dtype=np.int64)
+        unsolved = np.zeros(count, dtype=bool)
+        for i, r in enumerate(rows):
+            res = fn(r, cap=cap)
+            unsolved[i] = not res["solved"]
+            g[i] = cap if unsolved[i] else res["guesses"]
+        out += [g, unsolved]
+    return start, rows, out
+
+
+def run_comparison(spec_a, spec_b, n=100000, seed=DEFAULT_SEED, difficulty=DEFAULT_DIFFICULTY, cap=400,
+                   corpus=DEFAULT_CORPUS, alpha=0.05, margin=0.05, min_n=1000, chunk=500, workers=1,
+                   top=10, verbose=True, progress=False):
+    """Paired A/B run of two solvers ("module:function" specs) on the same rows,
+    stopped by PairedTest as soon as it is decided (checked per chunk, after
+    `min_n` rows) or after `n` rows.  `workers` > 1 solves chunks on a process
+    pool, consumed in row order so the stopping point does not depend on timing.
+
+    Returns the PairedTest, both GuessStats, the decision and the `top` rows
+    with the largest |guesses_b - guesses_a|.  `progress` prints the running
+    interval after every chunk.
+    """
+    import heapq
+    import multiprocessing
+    test = PairedTest(alpha, margin)
+    stats = {"a": GuessStats(), "b": GuessStats()}
+    largest = []        # min-heap of (|d|, -index, index, password, ga, gb)
+    tasks = [(spec_a, spec_b, seed, difficulty, start, min(chunk, n - start + 1), corpus, cap)
+             for start in range(1, n + 1, chunk)]
+    decision = None
+    t0 = time.time()
+    pool = multiprocessing.Pool(workers) if workers > 1 else None
+    try:
+        results = pool.imap(_compare_chunk, tasks) if pool else map(_compare_chunk, tasks)
+        for start, rows, (ga, ua, gb, ub) in results:
+            for key, g, u in (("a", ga, ua), ("b", gb, ub)):
+                stats[key].add_many(g[~u])
+                stats[key].unsolved += int(u.sum())
+            d = gb - ga
+            test.add_many(d)
+            for i in np.flatnonzero(d):
+                item = (abs(int(d[i])), -(start + int(i)), start + int(i), rows[int(i)]["password"],
+                        int(ga[i]), int(gb[i]))
+                if len(largest) < top:
+                    heapq.heappush(largest, item)
+                elif item > largest[0]:
+                    heapq.heapreplace(largest, item)
+            if verbose and progress:
+                print(f"  n={test.n:>7}  b-a={test.mean:+.4f} +/- {test.radius():.4f}  "
+                      f"{time.time() - t0:6.1f}s", flush=True)
+            if test.n >= min_n:
+                decision = test.decision()
+                if decision:
+                    break
+    finally:
+        if pool is not None:
+            pool.terminate()
+    dt = time.time() - t0
+    largest = sorted(largest, reverse=True)
+
+    if verbose:
+        verdict = {"a": f"a is better ({spec_a})", "b": f"b is better ({spec_b})",
+                   "same": f"no difference beyond +/-{margin} guesses"}.get(decision, "undecided at max N")
+        print(f"a={spec_a}  b={spec_b}  seed={hex(seed)}  difficulty={difficulty}  cap={cap}")
+        print(f"n={test.n} of max {n}  time={dt:.1f}s  -> {verdict}  "
+              f"(always-valid {1 - alpha:.0%} interval)")
+        for key, spec in (("a", spec_a), ("b", spec_b)):
+            s = stats[key]
+            print(f"  {key}: avg={s.mean():.3f}  p99={s.percentile(0.99)}  max={s.max()}  "
+                  f"unsolved={s.unsolved}" if s.solved else f"  {key}: nothing solved")
+        print(f"  b-a per problem: {test.mean:+.4f} +/- {test.radius():.4f}  "
+              f"(a fewer: {test.wins_a}  b fewer: {test.wins_b}  "
+              f"ties: {test.n - test.wins_a - test.wins_b})")
+        if largest:
+            print("  largest differences (index  password  a  b):")
+            for _, _, idx, pw, a, b in largest:
+                print(f"    {idx:>7}  {pw}  {a:>4}  {b:>4}")
+    return {"test": test, "a": stats["a"], "b": stats["b"], "decision": decision, "n": test.n,
+            "time_s": dt, "largest": [(idx, pw, a, b) for _, _, idx, pw, a, b in largest]}
+
+
+def self_check(n=10000, seed=DEFAULT_SEED, difficulty=DEFAULT_DIFFICULTY, verbose=True,
+               corpus=DEFAULT_CORPUS):
     """Validate the oracle and the 7-point coarse-scan guarantee (no solver needed).
 
     Confirms:
@@ -295,7 +1280,7 @@ def self_check(n=10000, seed=DEFAULT_SEED, difficulty=DEFAULT_DIFFICULTY, verbos
       * the max-altitude grid point is always positive,
       * geometry invariants: range/width == 90 and cluster-span/grid-spacing > 1.
     """
-    rows = generate_assignments(seed, n, difficulty)
+    rows = load_assignments(seed, n, difficulty, corpus)
 
     peak_fail = 0
     for r in rows[:200]:
@@ -313,12 +1298,12 @@ def self_check(n=10000, seed=DEFAULT_SEED, difficulty=DEFAULT_DIFFICULTY, verbos
         w = gaussian_width(L)
         range_over_width.add(round((hi - lo) / w))
         span = hi - lo
-        alts = [altitude(r["password"], r["difficulty"], round(lo + span * f)) for f in fracs]
-        best_abs = max(abs(a) for a in alts)
+        alts = altitude_many(r["password"], r["difficulty"], [round(lo + span * f) for f in fracs])
+        best_abs = float(np.abs(alts).max())
         worst_best_abs = min(worst_best_abs, best_abs)
         if best_abs == 0.0:
             no_curvature += 1
-        if max(alts) <= 0:
+        if alts.max() <= 0:
             only_valleys += 1
 
     result = {
@@ -341,14 +1326,38 @@ def self_check(n=10000, seed=DEFAULT_SEED, difficulty=DEFAULT_DIFFICULTY, verbos
 
 
 def _load_solver(spec):
-    """spec like 'module:function' or 'module' (function defaults to 'solve')."""
+    """spec like 'module:function' or 'module' (function defaults to 'solve'), or
+    'cpp:<variant>' for a C++ solver variant through koth_cpp.  A '@PATH' suffix
+    applies a tuning file (see _with_tuning), e.g. 'solver:solve@tuned.json'."""
     import importlib
+    spec, _, tuning = spec.partition("@")
+    if tuning:
+        return _with_tuning(_load_solver(spec), spec, tuning)
     mod_name, _, fn_name = spec.partition(":")
+    if mod_name == "cpp":
+        import koth_cpp
+        return koth_cpp.solver(fn_name or "ladder_snipe")
     fn_name = fn_name or "solve"
     mod = importlib.import_module(mod_name)
     return getattr(mod, fn_name)
 
 
+def _with_tuning(solve_fn, spec, path):
+    """`solve_fn` running with the tuning file at `path`.  C++ variants load it
+    into ladder_snipe_tuned; Python solvers opt in with a module-level
+    load_tuning(path) and a `tuning` argument (solver.py, ladder_snipe.py)."""
+    if spec.partition(":")[0] == "cpp":
+        import koth_cpp
+        koth_cpp.set_tuned_config(path)
+        return solve_fn
+    load = getattr(sys.modules.get(getattr(solve_fn, "__module__", None)), "load_tuning", None)
+    if load is None:
+        raise ValueError(f"{spec} has no load_tuning()")
+    tuned = functools.partial(solve_fn, tuning=load(path))
+    tuned.__module__ = solve_fn.__module__
+    return tuned
+
+
 if __name__ == "__main__":
     import argparse
     ap = argparse.ArgumentParser(description="KotH assignment generator + benchmark harness (no solver).")
@@ -356,22 +1365,74 @@ if __name__ == "__main__":
                     help="validate the oracle and the 7-point coarse-scan guarantee")
     ap.add_argument("--solver", metavar="module:function",
                     help="import path to your solver callable, e.g. my_solver:solve")
+    ap.add_argument("--compare", nargs=2, metavar=("A", "B"),
+                    help="paired A/B run of two solvers (module:function) on the same rows, "
+                         "stopped once a sequential test decides; --n is the max N")
+    ap.add_argument("--alpha", type=float, default=0.05, help="--compare error rate")
+    ap.add_argument("--margin", type=float, default=0.05,
+                    help="--compare: stop as 'same' once |b-a| is surely below this many guesses")
+    ap.add_argument("--workers", type=int, default=1, help="--compare: solve chunks on this many processes")
+    ap.add_argument("--oracle", choices=("python", "cpp"), default="python",
+                    help="altitude backend: this port, or the C++ oracle via koth_cpp")
+    ap.add_argument("--tuning", metavar="PATH",
+                    help="*.best.json: for --solver cpp:ladder_snipe_tuned, or a solver.py tuning (tune.py)")
     ap.add_argument("--n", type=int, default=10000)
     ap.add_argument("--seed", type=lambda s: int(s, 0), default=DEFAULT_SEED)
     ap.add_argument("--difficulty", type=int, default=DEFAULT_DIFFICULTY)
     ap.add_argument("--cap", type=int, default=400)
     ap.add_argument("--sample", type=int, default=0,
                     help="print this many generated assignments and exit")
+    ap.add_argument("--corpus", metavar="PATH", default=DEFAULT_CORPUS,
+                    help="memory-mapped corpus file; used when it covers seed/n/difficulty")
+    ap.add_argument("--build-corpus", action="store_true",
+                    help="write --n rows per difficulty in --diff-min..--diff-max to --corpus")
+    ap.add_argument("--diff-min", type=int, default=1)
+    ap.add_argument("--diff-max", type=int, default=60)
+    ap.add_argument("--hills", action="store_true",
+                    help="with --build-corpus: also store every row's true hill layout")
+    ap.add_argument("--progress-every", type=int, default=0, metavar="K",
+                    help="print a rolling solved/avg/p99/throughput line every K problems")
+    ap.add_argument("--progress-secs", type=float, default=0.0, metavar="T",
+                    help="... and/or every T seconds")
+    ap.add_argument("--stop-on-unsolved", action="store_true",
+                    help="abort at the first unsolved problem")
+    ap.add_argument("--max-avg", type=float, default=None,
+                    help="abort once the final average is certain to exceed this")
+    ap.add_argument("--profile", action="store_true",
+                    help="report perf_counter_ns timings (generate / solve / oracle / solver phases)")
+    ap.add_argument("--cprofile", metavar="PATH", help="write a cProfile pstats file of the run")
     args = ap.parse_args()
 
-    if args.sample:
+    solve_fn = _load_solver(args.solver) if args.solver else None
+    if args.oracle != "python":
+        set_oracle(args.oracle)
+        # Solvers built on koth_gen (solver.py) probe through its copy of the oracle.
+        if "koth_gen" in sys.modules:
+            sys.modules["koth_gen"].set_oracle(args.oracle)
+    if args.tuning:
+        try:
+            solve_fn = _with_tuning(solve_fn, args.solver or "cpp", args.tuning)
+        except ValueError as e:
+            raise SystemExit(f"--tuning: {e}")
+
+    if args.build_corpus:
+        build_corpus(args.corpus, seed=args.seed, count=args.n, diff_min=args.diff_min,
+                     diff_max=args.diff_max, hills=args.hills)
+    elif args.sample:
         for r in generate_assignments(args.seed, args.sample, args.difficulty):
             print(r)
     elif args.self_check:
-        self_check(n=args.n, seed=args.seed, difficulty=args.difficulty)
+        self_check(n=args.n, seed=args.seed, difficulty=args.difficulty, corpus=args.corpus)
+    elif args.compare:
+        run_comparison(args.compare[0], args.compare[1], n=args.n, seed=args.seed,
+                       difficulty=args.difficulty, cap=args.cap, corpus=args.corpus, alpha=args.alpha,
+                       margin=args.margin, workers=args.workers,
+                       progress=bool(args.progress_every or args.progress_secs))
     elif args.solver:
-        solve_fn = _load_solver(args.solver)
         run_benchmark(solve_fn, n=args.n, seed=args.seed,
-                      difficulty=args.difficulty, cap=args.cap)
+                      difficulty=args.difficulty, cap=args.cap, corpus=args.corpus,
+                      progress_every=args.progress_every, progress_secs=args.progress_secs,
+                      stop_on_unsolved=args.stop_on_unsolved, max_avg=args.max_avg,
+                      profile=args.profile, cprofile=args.cprofile)
     else:
         ap.print_help()
@@ -0,0 +1,468 @@
+"""
+Python port of the C++ ladder_snipe solver variant (tests/koth_tune/src/
+koth_solver.cpp, runSolverCoreLadder with the sqrt snipe), probe for probe:
+with the same tuning it spends the same guesses as `koth_cpp.solver(
+"ladder_snipe")`, or "ladder_snipe_tuned" when given that variant's JSON.
+
+Beyond solver.py's pipeline it uses two more model facts:
+
+* Ladder climb: a pair of same-sign probes pairProbeOffsetW*w apart inverts
+  the dominating hill's centre (even from denormal far-tail readings); its
+  height gives the rung k to the password hill, so jump k*3w toward the taller
+  side and repeat.  Readings that fail the height bands / log-residual check are
+  saddles: take a half step uphill instead.
+* Sqrt snipe: inside the near zone the altitude is exactly 10000*exp(-d^2/w^2),
+  so one reading above sqrtSnipeMinAlt pins |x-p| = w*sqrt(ln(10000/a)); try
+  both candidates before pinpointing.
+
+Whatever the ladder does not finish falls through to the solver.py pipeline
+(walk, fallback grid, gallop, cluster sweep, backstop), which shares solver.py's
+steps where the C++ is the same and has its own pinpoint / backstop where not.
+
+    python koth_harness.py --solver ladder_snipe:solve --n 10000
+    python koth_harness.py --solver ladder_snipe:solve --tuning ../ladder_snipe.diff60.best.json
+"""
+import json
+import math
+
+from koth_gen import KOTH_HEIGHT_OFFSET_BASE, KOTH_NEAR_ZONE_FRACTION, gaussian_width, hill_count, numeric_range
+import solver
+from solver import (
+    H_PEAK, MAIN_TH, PHASE_BACKSTOP, PHASE_FALLBACK, PHASE_PINPOINT, PHASE_SCAN, Session, _clamp, _cluster_sweep,
+    _gallop, _invert_center, _iround, _phase, _res, _scan_grid, _spread_order, _walk_and_pinpoint,
+)
+
+PHASES = solver.PHASES + ("ladder", "snipe")
+PHASE_LADDER, PHASE_SNIPE = range(len(solver.PHASES), len(PHASES))
+
+# LADDER_SNIPE_GENE_SPECS of koth_config.cpp: (name, min, max, is_int).  A
+# *.best.json is read through these, clamped, exactly as the C++ loads it.
+GENE_SPECS = (
+    ("farTailAnchorMaxAbs", 80.0, 400.0, False),
+    ("ladderEntryMaxAbs", 4000.0, 9000.0, False),
+    ("positiveLadderSkipRangeFraction", 0.0, 0.75, False),
+    ("pairProbeOffsetW", 0.15, 0.45, False),
+    ("signCrossMarchW", 0.75, 2.5, False),
+    ("centerSanityMaxDistW", 12.0, 45.0, False),
+    ("ladderMaxIters", 4, 12, True),
+    ("orbitDistW", 0.5, 2.0, False),
+    ("heightBandSlack", 50.0, 300.0, False),
+    ("logResidualMax", 0.03, 0.35, False),
+    ("logResidualMaxDistW", 1.0, 6.0, False),
+    ("halfStepW", 0.75, 2.5, False),
+    ("outsideClusterDistW", 1.0, 4.0, False),
+    ("bareTailFrac", 0.002, 0.05, False),
+    ("postJumpCapScale", 0.1, 0.6, False),
+    ("postJumpCapBias", 0.3, 1.5, False),
+    ("sqrtSnipeMinAlt", 7400.0, 7900.0, False),
+    ("sqrtSnipeNearZoneExtra", 0.0, 0.01, False),
+    ("gallopStepW", 1.0, 2.5, False),
+    ("gallopStopW", 0.05, 0.25, False),
+    ("clusterReachW", 18.0, 36.0, False),
+    ("clusterStepW", 0.8, 1.8, False),
+)
+
+# LadderSnipeTuning defaults (koth_tuning.hpp).  The last block are not genes:
+# fixed in the C++, and named as solver.TUNING_DEFAULTS names them so the shared
+# crest / walk steps read them from the same session.
+LADDER_SNIPE_DEFAULTS = {
+    "farTailAnchorMaxAbs": 200.0,
+    "ladderEntryMaxAbs": 6000.0,
+    "positiveLadderSkipRangeFraction": 0.0,
+    "pairProbeOffsetW": 0.25,
+    "signCrossMarchW": 1.5,
+    "centerSanityMaxDistW": 30.0,
+    "ladderMaxIters": 8,
+    "orbitDistW": 1.0,
+    "heightBandSlack": 150.0,
+    "logResidualMax": 0.1,
+    "logResidualMaxDistW": 3.0,
+    "halfStepW": 1.5,
+    "outsideClusterDistW": 2.0,
+    "bareTailFrac": 0.01,
+    "postJumpCapScale": 0.3,
+    "postJumpCapBias": 0.9,
+    "sqrtSnipeMinAlt": 7600.0,
+    "sqrtSnipeNearZoneExtra": 0.002,
+    "gallopStepW": 1.5,
+    "gallopStopW": 0.1,
+    "clusterReachW": 28.0,
+    "clusterStepW": 1.2,
+    "pinpointRounds": 5,
+    "pinpointFinalRadius": 8,
+    "pinpointFinalRadiusWide": 20,
+    "crestOffsetW": 0.5,
+    "crestRefineRatio": 1.02,
+    "mainHillMinAlt": MAIN_TH,
+    "walkMaxHops": 10,
+}
+
+
+class LadderSnipeTuning:
+    """One setting of LADDER_SNIPE_DEFAULTS; genes are clamped to GENE_SPECS."""
+    __slots__ = tuple(LADDER_SNIPE_DEFAULTS)
+
+    def __init__(self, **knobs):
+        unknown = sorted(set(knobs) - set(LADDER_SNIPE_DEFAULTS))
+        if unknown:
+            raise ValueError(f"unknown ladder_snipe knobs: {', '.join(unknown)}")
+        for name, default in LADDER_SNIPE_DEFAULTS.items():
+            setattr(self, name, type(default)(knobs.get(name, default)))
+        for name, lo, hi, is_int in GENE_SPECS:
+            v = max(lo, min(hi, float(knobs.get(name, LADDER_SNIPE_DEFAULTS[name]))))
+            setattr(self, name, _iround(v) if is_int else v)
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in LADDER_SNIPE_DEFAULTS}
+
+
+DEFAULT_TUNING = LadderSnipeTuning()
+
+
+def load_tuning(path):
+    """LadderSnipeTuning from a *.best.json; like the C++ reader, only the genes
+    are read and missing ones keep their defaults."""
+    with open(path) as f:
+        data = json.load(f)
+    knobs = data.get("tuning", data)
+    return LadderSnipeTuning(**{name: knobs[name] for name, *_ in GENE_SPECS if name in knobs})
+
+
+class LadderSession(Session):
+    """Session whose probes clamp into [lo, hi] (ProbeSession::probe) instead of
+    skipping out-of-range integers, and with the ladder phases."""
+    PHASES = PHASES
+
+    def probe(self, x):
+        return super().probe(max(self.lo, min(self.hi, _iround(x))))
+
+
+# ---------------------------------------------------------------------------
+# steps that differ from solver.py's
+# ---------------------------------------------------------------------------
+@_phase(PHASE_SNIPE)
+def _sqrt_snipe(sess, x, a, w, lo, hi):
+    """Near-zone finisher: one reading a pins |x-p| = w*sqrt(ln(10000/a));
+    probe both candidates.  Returns True if one was the password."""
+    t = sess.tuning
+    # Side hills top out at ~7530 (10000 - 2600*0.95); sqrtSnipeMinAlt is a slack floor.
+    if not (a > t.sqrtSnipeMinAlt) or not (a < H_PEAK):
+        return False
+    d = w * math.sqrt(math.log(H_PEAK / a))
+    if not math.isfinite(d) or d > (KOTH_NEAR_ZONE_FRACTION + t.sqrtSnipeNearZoneExtra) * x:
+        return False
+    dd = max(1, _iround(d))
+    yield from sess.probe(_clamp(x + dd, lo, hi))
+    if sess.solved:
+        return True
+    yield from sess.probe(_clamp(x - dd, lo, hi))
+    return sess.solved
+
+
+@_phase(PHASE_PINPOINT)
+def _pinpoint(sess, seed_x, w, lo, hi, final_radius=None, snipe=True):
+    """solver._pinpoint with the sqrt snipe first and a pairProbeOffsetW first
+    offset (later rounds cap it at 0.25w, as the C++ does)."""
+    t = sess.tuning
+    if final_radius is None:
+        final_radius = t.pinpointFinalRadius
+    pc = _clamp(seed_x, lo, hi)
+    if snipe:
+        a = sess.samples.get(pc)
+        if a is None:
+            a = yield from sess.probe(pc)
+            if sess.solved:
+                return
+        if a is not None and (yield from _sqrt_snipe(sess, pc, a, w, lo, hi)):
+            return
+    off = max(1, _iround(t.pairProbeOffsetW * w))
+    for _ in range(t.pinpointRounds):
+        a0 = sess.samples.get(pc)
+        if a0 is None:
+            a0 = yield from sess.probe(pc)
+            if sess.solved:
+                return
+        if a0 is None or a0 <= 0:
+            break
+        x1 = pc + off if (pc + off) <= hi else pc - off
+        a1 = yield from sess.probe(x1)
+        if sess.solved:
+            return
+        if a1 is None or a1 <= 0 or x1 == pc:
+            break
+        nc = _clamp(_invert_center(pc, a0, x1, a1, w), lo, hi)
+        if nc == pc:
+            if off == 1:
+                break
+            off = max(1, off // 4)
+            continue
+        pc = nc
+        off = max(1, min(off, _iround(0.25 * w)))
+    yield from sess.probe(pc)
+    if sess.solved:
+        return
+    for d in range(1, final_radius + 1):
+        for sgn in (-1, 1):
+            yield from sess.probe(pc + sgn * d)
+            if sess.solved:
+                return
+
+
+@_phase(PHASE_BACKSTOP)
+def _backstop(sess, w, lo, hi):
+    """Fine full-range scan (round(0.7w) steps), then an unsniped pinpoint."""
+    step = max(1, _iround(0.7 * w))
+    x = lo
+    while x <= hi and not sess.solved:
+        yield from sess.probe(x); x += step
+    if not sess.solved:
+        yield from _pinpoint(sess, sess.best_x, w, lo, hi, final_radius=30, snipe=False)
+
+
+@_phase(PHASE_LADDER)
+def _ladder_climb(sess, x0, a0, w, hc, lo, hi):
+    """Pair inversion -> hill centre -> height rung k -> jump k*3w; repeat."""
+    t = sess.tuning
+    prev_k = post_jump_cap_k = 1 << 20
+    seen_centers = []
+    for _ in range(t.ladderMaxIters):
+        if sess.solved or a0 == 0.0 or not math.isfinite(a0):
+            return
+        # 0.25w keeps both pair samples inside the single-hill-dominated region even
+        # on a flank ~1.5w out; 0.5w pairs get contaminated by the neighbour hill.
+        off = max(1, _iround(t.pairProbeOffsetW * w))
+        x1 = x0 + off if x0 + off <= hi else x0 - off
+        if x1 == x0:
+            return
+        a1 = yield from sess.probe(x1)
+        if sess.solved:
+            return
+        if a1 is not None and a1 != 0.0 and (a0 > 0.0) != (a1 > 0.0):
+            # The pair straddles a sign crossing (core vs negative fringe): the
+            # positive sample points into the cluster, so march that way and re-anchor.
+            dir_in = 1 if (a1 > 0.0) == (x1 > x0) else -1
+            base = x1 if a1 > 0.0 else x0
+            xn = _clamp(base + dir_in * max(1, _iround(t.signCrossMarchW * w)), lo, hi)
+            an = yield from sess.probe(xn)
+            if sess.solved or an is None or an == 0.0:
+                return
+            x0, a0 = xn, an
+            continue
+        if a1 is None or a1 == 0.0:
+            # Deep-tail anchor: the step away underflowed; retry on the other side once.
+            x1 = x0 - (x1 - x0)
+            if x1 < lo or x1 > hi or x1 == x0:
+                return
+            a1 = yield from sess.probe(x1)
+            if sess.solved or a1 is None or a1 == 0.0 or (a0 > 0.0) != (a1 > 0.0):
+                return
+
+        try:
+            c = _invert_center(x0, a0, x1, a1, w)
+        except ValueError:      # a ratio that underflowed to 0: C++ gets a non-finite c
+            return
+        if not math.isfinite(c) or abs(c - x0) > t.centerSanityMaxDistW * w:
+            return
+        ci = _clamp(c, lo, hi)
+        # Re-inverting to a visited centre means orbiting one hill; hand off.
+        if any(abs(ci - seen) < _iround(t.orbitDistW * w) for seen in seen_centers):
+            return
+        seen_centers.append(ci)
+        ac = yield from sess.probe(ci)
+        if sess.solved or ac is None:
+            return
+
+        # Possibly on the main hill flank already; near-zone sqrt candidates are cheap.
+        if ac > t.ladderEntryMaxAbs and (yield from _sqrt_snipe(sess, ci, ac, w, lo, hi)):
+            return
+        if ac >= MAIN_TH:
+            yield from _pinpoint(sess, sess.best_x, w, lo, hi)
+            return
+
+        # A genuine centre is unclamped, reads a height on the ladder
+        # 10000 - k*2600*[0.95, 1.05], and matches H*exp(-d^2/w^2) against the
+        # anchor; saddles between hills fail these and would alias to a bogus rung.
+        dxa = x0 - ci
+        trusted = ac != 0.0 and (a0 > 0.0) == (ac > 0.0) and lo <= c <= hi
+        k = min(max(_iround((H_PEAK - ac) / KOTH_HEIGHT_OFFSET_BASE), 1), hc - 1)
+        if trusted:
+            band_hi = H_PEAK - k * KOTH_HEIGHT_OFFSET_BASE * 0.95 + t.heightBandSlack
+            band_lo = H_PEAK - k * KOTH_HEIGHT_OFFSET_BASE * 1.05 - t.heightBandSlack
+            trusted = band_lo <= ac <= band_hi
+        # After a trusted jump of k rungs the landing is at most a rung or two
+        # off; a larger rank here is flank contamination, not a hill.
+        if trusted and k > post_jump_cap_k:
+            trusted = False
+        if trusted and abs(dxa) <= t.logResidualMaxDistW * w:
+            residual = math.log(abs(a0)) - (math.log(abs(ac)) - (dxa * dxa) / (w * w))
+            trusted = abs(residual) <= t.logResidualMax
+        if not trusted and ac > 0.0:
+            # Positive saddle: a 3w hop would leap over the main hill; half-step
+            # uphill (pair gradient first) so the next pair anchors on one hill.
+            half = max(1, _iround(t.halfStepW * w))
+            grad = 1 if (a1 > a0) == (x1 > x0) else -1
+            for sgn in (grad, -grad):
+                xs = _clamp(ci + sgn * half, lo, hi)
+                a_s = yield from sess.probe(xs)
+                if sess.solved:
+                    return
+                if a_s is not None and a_s > ac:
+                    x0, a0 = xs, a_s
+                    break
+            else:
+                return      # local max that fails the bands; hand off to the walk
+            continue
+        if trusted:
+            if k >= prev_k:
+                return      # not converging
+            prev_k = k
+        # (Untrusted negatives keep k: H < 0 needs k >= 4, so the rank stays useful.)
+
+        step3 = 3 * w
+        if abs(ci - x0) > t.outsideClusterDistW * w:
+            # Farther from the centre than any intra-cluster point: came from outside.
+            direction = 1 if ci >= x0 else -1
+        elif ci + step3 > hi:
+            direction = -1
+        elif ci - step3 < lo:
+            direction = 1
+        else:
+            ar = yield from sess.probe(ci + step3)
+            if sess.solved:
+                return
+            if ar is None:
+                direction = -1
+            elif abs(ar) < t.bareTailFrac * (abs(ac) + KOTH_HEIGHT_OFFSET_BASE):
+                direction = -1      # off the cluster edge: only the anchor's own tail
+            else:
+                direction = 1 if ar > ac else -1
+
+        target = _clamp(ci + direction * k * 3.0 * w, lo, hi)
+        at = yield from sess.probe(target)
+        if sess.solved or at is None:
+            return
+        if at <= 0.0:
+            # A correct jump lands within ~2w of the main peak, which reads positive.
+            target2 = _clamp(ci - direction * k * 3.0 * w, lo, hi)
+            at2 = yield from sess.probe(target2)
+            if sess.solved:
+                return
+            # Keep the higher landing even if both are negative (fewer rungs out).
+            if at2 is not None and at2 > at:
+                target, at = target2, at2
+            if at == 0.0:
+                return
+        post_jump_cap_k = max(1, _iround(t.postJumpCapScale * k + t.postJumpCapBias))
+        x0, a0 = target, at
+
+
+# ---------------------------------------------------------------------------
+# pipeline
+# ---------------------------------------------------------------------------
+def _coarse_scan(sess, xs, stop):
+    """Probe the grid in spread order until `stop(alt)`; returns (x, alt) or None."""
+    for idx in _spread_order(len(xs)):
+        x = xs[idx]
+        a = yield from sess.probe(x)
+        if sess.solved:
+            return None
+        if a is not None and stop(a):
+            return x, a
+    return None
+
+
+def _post_coarse(sess, xs, w, lo, hi):
+    """runPostCoarsePipeline: walk, complete grid + walk, gallop, cluster sweep, backstop."""
+    t = sess.tuning
+    sess.stage = "fast"
+    yield from _walk_and_pinpoint(sess, w, lo, hi, pinpoint=_pinpoint)
+    if sess.solved:
+        return
+    sess.stage = "fallback"; sess.set_phase(PHASE_FALLBACK)
+    for x in xs:
+        yield from sess.probe(x)
+        if sess.solved:
+            return
+    yield from _walk_and_pinpoint(sess, w, lo, hi, pinpoint=_pinpoint)
+    if sess.solved:
+        return
+    sess.stage = "recovery"
+    yield from _gallop(sess, sess.best_x, w, lo, hi)
+    if sess.solved:
+        return
+    yield from _pinpoint(sess, sess.best_x, w, lo, hi)
+    if sess.solved:
+        return
+    yield from _cluster_sweep(sess, w, lo, hi)
+    if sess.solved:
+        return
+    yield from _pinpoint(sess, sess.best_x, w, lo, hi, final_radius=t.pinpointFinalRadiusWide)
+    if sess.solved:
+        return
+    sess.stage = "backstop"
+    yield from _backstop(sess, w, lo, hi)
+
+
+def solve_steps(password_length, difficulty, cap=600, trace=None, prof=None, tuning=None):
+    """ladder_snipe as a solver.solve_steps-style generator (see solver.drive)."""
+    L = password_length
+    lo, hi = numeric_range(L)
+    w = gaussian_width(L); hc = hill_count(difficulty)
+    t = DEFAULT_TUNING if tuning is None else tuning
+    sess = LadderSession(lo, hi, cap=cap, trace=trace, prof=prof, tuning=t)
+    xs = _scan_grid(lo, hi, w, hc)
+
+    if hc < 5:
+        # Too few rungs for the ladder: positive-stop scan, then the pipeline.
+        yield from _coarse_scan(sess, xs, lambda a: a > 0.0)
+        if not sess.solved:
+            yield from _post_coarse(sess, xs, w, lo, hi)
+        return _res(sess)
+
+    # Stop on the first far-tail reading (any sign, denormals included), else the
+    # first positive; strongly negative readings are skipped.
+    hit = yield from _coarse_scan(sess, xs, lambda a: a != 0.0 and (abs(a) < t.farTailAnchorMaxAbs or a > 0.0))
+    if sess.solved:
+        return _res(sess)
+    restore = None
+    if hit is not None:
+        hx, ha = hit
+        if ha > 0.0:
+            restore = hit
+        skip = (ha > 0.0 and t.positiveLadderSkipRangeFraction > 0.0
+                and hx > lo + int(t.positiveLadderSkipRangeFraction * (hi - lo)))
+        sess.stage = "ladder"
+        if abs(ha) < t.ladderEntryMaxAbs and not skip:
+            yield from _ladder_climb(sess, hx, ha, w, hc, lo, hi)
+        elif ha > 0.0:
+            yield from _sqrt_snipe(sess, hx, ha, w, lo, hi)
+        if sess.solved:
+            return _res(sess)
+
+    if restore is None:
+        # Negative far-tail entry with no positive stop: re-anchor on a positive probe.
+        sess.stage = "scan"; sess.set_phase(PHASE_SCAN)
+        yield from _coarse_scan(sess, xs, lambda a: a > 0.0)
+        if sess.solved:
+            return _res(sess)
+        if sess.best_alt > 0.0:
+            restore = (sess.best_x, sess.best_alt)
+    if restore is not None:
+        sess.best_x, sess.best_alt = restore
+    yield from _post_coarse(sess, xs, w, lo, hi)
+    return _res(sess)
+
+
+def solve(assignment, cap=600, trace=None, prof=None, tuning=None):
+    if prof is None:
+        return solver.drive(assignment, lambda L, d: solve_steps(L, d, cap, trace, None, tuning))
+    prof.switch(PHASES[PHASE_SCAN])
+    try:
+        return solver.drive(assignment, lambda L, d: solve_steps(L, d, cap, trace, prof, tuning), prof)
+    finally:
+        prof.switch(None)
+
+
+def solve_many(assignments, cap=600, exact=True, tuning=None):
+    """Lockstep batch solve (solver.drive_many); same results as solve()."""
+    return solver.drive_many(assignments, lambda L, d: solve_steps(L, d, cap, tuning=tuning), exact)
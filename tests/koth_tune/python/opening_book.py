@@ -0,0 +1,175 @@
+"""
+Builds solver.py's opening book: per (password length, hill count), a small
+decision tree over the first Phase-1 probes, keyed by the altitude bucket of
+each answer (solver.OpeningBook; the buckets are solver.BOOK_EDGES).
+
+Trees are grown greedily on corpus rows.  At a node (the rows whose answers
+followed its path), every x of a pool (an even grid over the range plus the
+scan grid) is scored by actually solving those rows with the path + x as the
+opening, and the best x becomes the node if it saves at least --min-gain
+guesses per row over ending the book there.  Its rows are then split by the
+bucket of their answer at x and each bucket with --min-rows rows is grown the
+same way, down to --max-depth probes.  A tree is kept only if it also beats
+the plain scan on held-out rows without a worse tail (tail_ok: no more
+unsolved, p99 and max no higher); the book is written as compact JSON.
+solver.solve still runs the plain scan; solver.solve_book (or book=load_book())
+uses the book.
+
+    python opening_book.py --n 2000 --max-depth 3
+    python opening_book.py --diff-min 30 --diff-max 35 --out /tmp/book.json
+    python koth_harness.py --compare solver:solve solver:solve_book --difficulty 18
+"""
+import argparse
+import json
+import math
+import time
+
+import numpy as np
+
+from koth_gen import (
+    DEFAULT_SEED, LayoutBatch, assignment_password_length, gaussian_width, hill_count, numeric_range,
+)
+from koth_harness import DEFAULT_CORPUS, GuessStats, load_assignment_batches
+from solver import BOOK_EDGES, BOOK_PATH, NO_BOOK, OpeningBook, _scan_plan, solve_many
+
+POOL = 24
+
+
+def group_rows(seed, n, difficulties, corpus, start):
+    """{(password length, hill count): rows}, n rows per key spread over the
+    difficulties that share it (the oracle depends on nothing else)."""
+    keys = {}
+    for d in difficulties:
+        keys.setdefault((assignment_password_length(d), hill_count(d)), []).append(d)
+    out = {}
+    for key, diffs in sorted(keys.items()):
+        per = -(-n // len(diffs))
+        batches = load_assignment_batches(seed, per, diffs, corpus, start=start)
+        rows = [r for d in diffs for r in batches[d]]
+        out[key] = [r for r in rows if r["passwordLength"] == key[0]][:n]
+    return out
+
+
+def path_book(key, path, x=None):
+    """OpeningBook whose only branch is `path` [(x, bucket), ...], then x."""
+    node = None if x is None else (x, {})
+    for px, b in reversed(path):
+        node = (px, {} if node is None else {b: node})
+    if node is None:
+        return NO_BOOK
+    return OpeningBook(BOOK_EDGES, {key: node})
+
+
+class Grower:
+    """Grows one (password length, hill count) tree on its training rows."""
+
+    def __init__(self, key, rows, args):
+        self.key = key; self.rows = rows; self.args = args
+        L, hc = key
+        lo, hi = numeric_range(L)
+        grid = np.linspace(lo, hi, args.pool).round().astype(np.int64).tolist()
+        self.pool = sorted(set(grid) | set(_scan_plan(lo, hi, gaussian_width(L), hc)[0]))
+        self.layouts = LayoutBatch.from_passwords([int(r["password"]) for r in rows],
+                                                  [r["passwordLength"] for r in rows],
+                                                  [hill_count(r["difficulty"]) for r in rows])
+        self.solves = 0
+
+    def guesses(self, idx, book):
+        """Guesses per row of `idx` (unsolved rows count cap * 10)."""
+        self.solves += len(idx)
+        res = solve_many([self.rows[i] for i in idx], self.args.cap, exact=False, book=book)
+        return np.array([r["guesses"] if r["solved"] else self.args.cap * 10 for r in res], dtype=np.int64)
+
+    def answers(self, idx, x):
+        alts = self.layouts.altitude(idx, np.full(idx.size, x, dtype=np.int64), exact=False)
+        alts[self.layouts.p[idx] == x] = math.inf
+        return alts
+
+    def grow(self, idx, path, stop, depth):
+        """Node for the rows `idx` reached by `path`, or None to end the book;
+        `stop` is their guesses if the book ends here."""
+        if depth >= self.args.max_depth or idx.size < self.args.min_rows:
+            return None
+        used = {x for x, _ in path}
+        best = None
+        for x in self.pool:
+            if x in used:
+                continue
+            g = self.guesses(idx, path_book(self.key, path, x))
+            if best is None or g.sum() < best[1].sum():
+                best = (x, g)
+        x, g = best
+        if stop.sum() - g.sum() < self.args.min_gain * idx.size:
+            return None
+        alts = self.answers(idx, x)
+        children = {}
+        buckets = np.searchsorted(BOOK_EDGES, alts, side="right")
+        buckets[alts == math.inf] = -1
+        for b in np.unique(buckets[buckets >= 0]).tolist():
+            sel = np.flatnonzero(buckets == b)
+            child = self.grow(idx[sel], path + [(x, b)], g[sel], depth + 1)
+            if child is not None:
+                children[b] = child
+        return (x, children)
+
+    def tree(self):
+        idx = np.arange(len(self.rows))
+        return self.grow(idx, [], self.guesses(idx, NO_BOOK), 0)
+
+
+def evaluate(rows, book, cap):
+    """(average guesses, GuessStats of the solved rows); unsolved rows count
+    cap * 10 in the average."""
+    res = solve_many(rows, cap, book=book)
+    stats = GuessStats()
+    stats.add_many([r["guesses"] for r in res if r["solved"]])
+    stats.unsolved = sum(not r["solved"] for r in res)
+    return sum(r["guesses"] if r["solved"] else cap * 10 for r in res) / max(1, len(rows)), stats
+
+
+def tail_ok(plain, booked):
+    """The booked GuessStats has no more unsolved rows and no higher p99 or max."""
+    return (booked.unsolved <= plain.unsolved and booked.percentile(0.99) <= plain.percentile(0.99)
+            and booked.max() <= plain.max())
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Build solver.py's opening book from corpus rows.")
+    ap.add_argument("--seed", type=lambda s: int(s, 0), default=DEFAULT_SEED)
+    ap.add_argument("--diff-min", type=int, default=1)
+    ap.add_argument("--diff-max", type=int, default=60)
+    ap.add_argument("--start", type=int, default=200001,
+                    help="first training row (off the benchmark rows by default)")
+    ap.add_argument("--n", type=int, default=2000, help="training rows per (length, hill count)")
+    ap.add_argument("--holdout", type=int, default=10000, help="held-out rows per key, after the training rows")
+    ap.add_argument("--pool", type=int, default=POOL, help="evenly spaced candidate probes per node")
+    ap.add_argument("--max-depth", type=int, default=3, help="book probes per path")
+    ap.add_argument("--min-rows", type=int, default=100, help="rows a node needs to be grown")
+    ap.add_argument("--min-gain", type=float, default=0.02, help="guesses per row a node must save")
+    ap.add_argument("--cap", type=int, default=600)
+    ap.add_argument("--corpus", default=DEFAULT_CORPUS)
+    ap.add_argument("--out", metavar="PATH", default=BOOK_PATH)
+    args = ap.parse_args()
+
+    diffs = range(args.diff_min, args.diff_max + 1)
+    train = group_rows(args.seed, args.n, diffs, args.corpus, args.start)
+    held = group_rows(args.seed, args.holdout, diffs, args.corpus, args.start + args.n)
+    book = OpeningBook(BOOK_EDGES)
+    for key, rows in train.items():
+        t0 = time.time()
+        grower = Grower(key, rows, args)
+        node = grower.tree()
+        one = OpeningBook(BOOK_EDGES, {key: node} if node is not None else {})
+        plain, plain_s = evaluate(held[key], NO_BOOK, args.cap)
+        booked, booked_s = evaluate(held[key], one, args.cap)
+        kept = node is not None and booked < plain and tail_ok(plain_s, booked_s)
+        if kept:
+            book.trees[key] = node
+        print(f"length={key[0]:>2} hills={key[1]}  nodes={len(one):>3}  held-out avg "
+              f"{plain:.3f} -> {booked:.3f}  p99 {plain_s.percentile(0.99)} -> {booked_s.percentile(0.99)}  "
+              f"max {plain_s.max()} -> {booked_s.max()}  {'kept' if kept else 'no book':<7}  "
+              f"({grower.solves} solves, {time.time() - t0:.1f}s)")
+    with open(args.out, "w") as f:
+        json.dump(book.to_json(), f, separators=(",", ":"))
+        f.write("\n")
+    print(f"saved {args.out}  ({len(book)} nodes)")
@@ -15,17 +15,35 @@ Model facts exploited
   10000); it also dominates within ~1.55w of p -> inversion is exact there, so
   iterating the inversion converges to the exact integer p.
 
-Phase 1: 7-point coarse scan (0..6/6) -> always a non-zero positive anchor.
+Phase 1: opening book, opt-in (solve_book; solver.book.json, built by
+         opening_book.py: a few probes chosen per length/hill count from the
+         answers so far), then the 7-point coarse scan (0..6/6) -> always a
+         non-zero positive anchor.
 Phase 2: inversion crest of the anchor hill -> hop count k; hop toward the taller
          neighbour (monotone in height => reaches the password hill); pinpoint the
          integer centre from the highest probe by iterated inversion.
 Recovery (only if pinpoint from the best probe fails): a robust greedy gallop
          (large steps cross near-zone/superposition dips) then re-pinpoint; and a
          bounded cluster sweep as a final guarantee.
+
+Protocol: solve_steps() is the solver as a generator that yields each integer
+to try and is sent its altitude (math.inf on a hit), so it never needs the
+password.  solve() drives it with the scalar oracle; solve_many() advances a
+whole batch in lockstep and answers every round with one LayoutBatch call.  The
+drivers (drive / drive_many) take any generator of this shape, e.g.
+ladder_snipe.solve_steps.
 """
+import bisect
+import functools
+import json
 import math
+import os
+import time
+
+import numpy as np
+
 from koth_gen import (
-    altitude, gaussian_width, numeric_range, hill_count,
+    LayoutBatch, hill_layout, gaussian_width, numeric_range, hill_count,
     KOTH_PEAK_HEIGHT, KOTH_HILL_SPACING_WIDTHS, KOTH_HEIGHT_OFFSET_BASE,
 )
 
@@ -33,6 +51,124 @@ H_PEAK = float(KOTH_PEAK_HEIGHT)                  # 10000
 STEP_W = KOTH_HILL_SPACING_WIDTHS                # 3 widths between adjacent hills
 MAIN_TH = H_PEAK - 0.5 * KOTH_HEIGHT_OFFSET_BASE  # 8700
 
+# Phase ids attributed to each probe (Session.phase; innermost phase wins).
+PHASES = ("scan", "walk", "crest", "pinpoint", "fallback", "gallop", "cluster_sweep", "backstop")
+(PHASE_SCAN, PHASE_WALK, PHASE_CREST, PHASE_PINPOINT, PHASE_FALLBACK,
+ PHASE_GALLOP, PHASE_CLUSTER_SWEEP, PHASE_BACKSTOP) = range(len(PHASES))
+# Top-level stages of solve(); the result's "exit_stage" is the one it ended in.
+STAGES = ("scan", "fast", "fallback", "recovery", "backstop")
+
+# Heuristic knobs, named like the C++ LadderSnipeTuning fields where they mean
+# the same thing; "...W" values are multiples of the width w.  The defaults are
+# the hand-picked values; tune.py searches around them.
+TUNING_DEFAULTS = {
+    # Phase 1 stops once a probe's |altitude| exceeds this (near a hill core,
+    # not a faint tail).  0 would fire on ~1e-30 tails, so keep it meaningful.
+    "scanEarlyThresh": 400.0,
+    "crestOffsetW": 0.5,            # second crest probe, x +/- offset
+    "crestRefineRatio": 1.02,       # re-invert when the first inversion gains this much
+    "mainHillMinAlt": MAIN_TH,      # a crest this tall is taken as the password hill
+    "walkMaxHops": 10,
+    "pinpointOffsetW": 0.25,
+    "pinpointRounds": 5,
+    "pinpointFinalRadius": 8,
+    "pinpointFinalRadiusWide": 20,  # after the cluster sweep
+    "gallopStepW": 1.5,
+    "gallopStopW": 0.1,
+    "clusterReachW": 28.0,
+    "clusterStepW": 1.2,
+    "backstopStepW": 0.7,
+    "backstopFinalRadius": 30,
+}
+
+
+class Tuning:
+    """One setting of TUNING_DEFAULTS; unspecified knobs keep their default."""
+    __slots__ = tuple(TUNING_DEFAULTS)
+
+    def __init__(self, **knobs):
+        unknown = sorted(set(knobs) - set(TUNING_DEFAULTS))
+        if unknown:
+            raise ValueError(f"unknown tuning knobs: {', '.join(unknown)}")
+        for name, default in TUNING_DEFAULTS.items():
+            setattr(self, name, type(default)(knobs.get(name, default)))
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in TUNING_DEFAULTS}
+
+    def __repr__(self):
+        changed = {k: v for k, v in self.to_dict().items() if v != TUNING_DEFAULTS[k]}
+        return f"Tuning({', '.join(f'{k}={v!r}' for k, v in changed.items())})"
+
+
+DEFAULT_TUNING = Tuning()
+
+
+def load_tuning(path):
+    """Tuning from a *.best.json (its "tuning" object) or a bare knob object."""
+    with open(path) as f:
+        data = json.load(f)
+    return Tuning(**data.get("tuning", data))
+
+
+# Opening book (opening_book.py): per (password length, hill count), a decision
+# tree over the first Phase-1 probes keyed by the altitude bucket
+# bisect_right(edges, a).  The edges separate "nothing here" (|a| <= 1), faint
+# tails, and the crest heights of 3, 2, 1 and 0 hops from the password hill.
+BOOK_PATH = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "solver.book.json"))
+BOOK_EDGES = (-2000.0, -1.0, 1.0, 400.0, 2200.0, 4800.0, 7400.0)
+
+
+class OpeningBook:
+    """Decision trees for the first probes.  A node is (x, {bucket: node}); a
+    bucket with no child ends the book and the ordinary Phase 1 takes over."""
+    __slots__ = ("edges", "trees")
+
+    def __init__(self, edges=BOOK_EDGES, trees=None):
+        self.edges = tuple(float(e) for e in edges)
+        self.trees = dict(trees or {})      # {(password_length, hill_count): node}
+
+    def root(self, password_length, hc):
+        return self.trees.get((password_length, hc))
+
+    def bucket(self, a):
+        return bisect.bisect_right(self.edges, a)
+
+    def to_json(self):
+        def enc(node):
+            x, children = node
+            return [x, {str(b): enc(c) for b, c in sorted(children.items())}] if children else [x]
+        return {"edges": list(self.edges),
+                "trees": {f"{L},{hc}": enc(node) for (L, hc), node in sorted(self.trees.items())}}
+
+    @classmethod
+    def from_json(cls, data):
+        def dec(node):
+            return (int(node[0]), {int(b): dec(c) for b, c in (node[1] if len(node) > 1 else {}).items()})
+        trees = {}
+        for key, node in data.get("trees", {}).items():
+            L, hc = (int(v) for v in key.split(","))
+            trees[(L, hc)] = dec(node)
+        return cls(data.get("edges", BOOK_EDGES), trees)
+
+    def __len__(self):
+        def count(node):
+            return 1 + sum(count(c) for c in node[1].values())
+        return sum(count(node) for node in self.trees.values())
+
+
+NO_BOOK = OpeningBook()
+
+
+@functools.lru_cache(maxsize=None)
+def load_book(path=BOOK_PATH):
+    """OpeningBook from a file written by opening_book.py, read once per path;
+    NO_BOOK if the file does not exist."""
+    if not os.path.exists(path):
+        return NO_BOOK
+    with open(path) as f:
+        return OpeningBook.from_json(json.load(f))
+
 
 def _iround(x):
     """Round half away from zero (matches Math.round / std::llround)."""
@@ -42,11 +178,25 @@ def _iround(x):
 
 
 class Session:
-    def __init__(self, password, difficulty, lo, hi, cap=400):
-        self.p = int(password); self.pw = password
-        self.diff = difficulty; self.lo = lo; self.hi = hi; self.cap = cap
+    """Solver-side probe bookkeeping.  It never sees the password: `probe` is a
+    generator that yields the integer to try and is sent back its altitude
+    (math.inf on an exact hit).  Subclasses with extra phases override PHASES."""
+    PHASES = PHASES
+
+    def __init__(self, lo, hi, cap=400, trace=None, prof=None, tuning=DEFAULT_TUNING):
+        self.lo = lo; self.hi = hi; self.cap = cap; self.tuning = tuning
         self.samples = {}; self.guesses = 0; self.solved = False
         self.best_x = lo; self.best_alt = -math.inf
+        self.phase = PHASE_SCAN; self.stage = "scan"
+        self.phase_guesses = [0] * len(self.PHASES); self.last_phase = PHASE_SCAN
+        self.trace = trace          # e.g. koth_harness.ProbeTrace; None = no tracing
+        self.prof = prof            # e.g. koth_harness.PerfCounters; None = no timing
+
+    def set_phase(self, phase):
+        prev = self.phase; self.phase = phase
+        if self.prof is not None:
+            self.prof.switch(self.PHASES[phase])
+        return prev
 
     def probe(self, x):
         xi = _iround(x)
@@ -57,17 +207,32 @@ class Session:
         if self.guesses >= self.cap:
             return None
         self.guesses += 1
-        if xi == self.p:
-            self.solved = True; self.samples[xi] = math.inf
-            self.best_x = xi; self.best_alt = math.inf
-            return math.inf
-        a = altitude(self.pw, self.diff, xi)
+        self.phase_guesses[self.phase] += 1; self.last_phase = self.phase
+        a = yield xi
         self.samples[xi] = a
+        if a == math.inf:
+            self.solved = True
         if a > self.best_alt:
             self.best_alt = a; self.best_x = xi
+        if self.trace is not None:
+            self.trace.record(self.phase, xi, a, self.guesses)
         return a
 
 
+def _phase(phase):
+    """Attribute the probes made inside the wrapped step to `phase`."""
+    def wrap(fn):
+        @functools.wraps(fn)
+        def inner(sess, *args, **kwargs):
+            prev = sess.set_phase(phase)
+            try:
+                return (yield from fn(sess, *args, **kwargs))
+            finally:
+                sess.set_phase(prev)
+        return inner
+    return wrap
+
+
 def _clamp(x, lo, hi):
     return max(lo, min(hi, _iround(x)))
 
@@ -89,17 +254,19 @@ def _pick_best(*cands):
     return best
 
 
+@_phase(PHASE_CREST)
 def _crest(sess, x_seed, w, lo, hi):
     """Cheap inversion-based crest localisation (~3-5 probes). Returns (x, alt)."""
     x = _clamp(x_seed, lo, hi)
     a = sess.samples.get(x)
     if a is None:
-        a = sess.probe(x)
+        a = yield from sess.probe(x)
         if sess.solved:
             return x, a
-    off = max(1, _iround(0.5 * w))
+    t = sess.tuning
+    off = max(1, _iround(t.crestOffsetW * w))
     xb = x + off if (x + off) <= hi else x - off
-    ab = sess.probe(xb)
+    ab = yield from sess.probe(xb)
     if sess.solved:
         return xb, ab
     if a is not None and ab is not None and a > 0 and ab > 0 and xb != x:
@@ -108,22 +275,22 @@ def _crest(sess, x_seed, w, lo, hi):
             cx = _clamp(c, lo, hi)
             ac = sess.samples.get(cx)
             if ac is None:
-                ac = sess.probe(cx)
+                ac = yield from sess.probe(cx)
                 if sess.solved:
                     return cx, ac
             best = _pick_best((a, x), (ab, xb), (ac if ac is not None else -1e18, cx))
-            if best[1] != x and best[0] > a * 1.02:
+            if best[1] != x and best[0] > a * t.crestRefineRatio:
                 bx = best[1]
                 xb2 = bx + max(1, off // 2)
                 xb2 = xb2 if xb2 <= hi else bx - max(1, off // 2)
-                ab2 = sess.probe(xb2)
+                ab2 = yield from sess.probe(xb2)
                 if sess.solved:
                     return xb2, ab2
                 if ab2 is not None and ab2 > 0 and xb2 != bx and best[0] > 0:
                     try:
                         c2 = _invert_center(bx, best[0], xb2, ab2, w)
                         cx2 = _clamp(c2, lo, hi)
-                        ac2 = sess.probe(cx2)
+                        ac2 = yield from sess.probe(cx2)
                         if sess.solved:
                             return cx2, ac2
                         cand = _pick_best(best, (ab2, xb2), (ac2 if ac2 is not None else -1e18, cx2))
@@ -134,7 +301,7 @@ def _crest(sess, x_seed, w, lo, hi):
         except (ValueError, ZeroDivisionError):
             pass
     xc = _clamp(x - off if (x - off) >= lo else x + 2 * off, lo, hi)
-    ac = sess.probe(xc)
+    ac = yield from sess.probe(xc)
     if sess.solved:
         return xc, ac
     cand = [(a if a is not None else -1e18, x),
@@ -144,25 +311,26 @@ def _crest(sess, x_seed, w, lo, hi):
     return best[1], best[0]
 
 
+@_phase(PHASE_GALLOP)
 def _gallop(sess, x_seed, w, lo, hi):
     """Robust greedy climb; large steps cross near-zone/superposition dips."""
     x = _clamp(x_seed, lo, hi)
     a = sess.samples.get(x)
     if a is None:
-        a = sess.probe(x)
+        a = yield from sess.probe(x)
         if sess.solved:
             return x, a
     if a is None:
         a = -1e18
-    step = max(1, _iround(1.5 * w))
-    stop = max(1, _iround(0.1 * w))
+    step = max(1, _iround(sess.tuning.gallopStepW * w))
+    stop = max(1, _iround(sess.tuning.gallopStopW * w))
     while step >= stop:
         bd, ba, bx = 0, a, x
         for d in (1, -1):
             xn = _clamp(x + d * step, lo, hi)
             if xn == x:
                 continue
-            an = sess.probe(xn)
+            an = yield from sess.probe(xn)
             if sess.solved:
                 return xn, an
             if an is not None and an > ba:
@@ -174,11 +342,6 @@ def _gallop(sess, x_seed, w, lo, hi):
     return x, a
 
 
-# Early-stop once a probe's |altitude| exceeds this (near a hill core, not a
-# faint tail).  0 would fire on ~1e-30 tails, so keep it meaningful.
-SCAN_EARLY_THRESH = 400.0
-
-
 def _spread_order(m):
     """Permutation of range(m): middle first, then both ends, then gap midpoints,
     so the range endpoints are probed early (edge clusters are found fast)."""
@@ -219,35 +382,45 @@ def _scan_grid(lo, hi, w, hc):
     return xs
 
 
+@functools.lru_cache(maxsize=None)
+def _scan_plan(lo, hi, w, hc):
+    """(_scan_grid, _spread_order of it) as tuples, computed once per shape."""
+    xs = _scan_grid(lo, hi, w, hc)
+    return tuple(xs), tuple(_spread_order(len(xs)))
+
+
+@_phase(PHASE_BACKSTOP)
 def _backstop(sess, w, lo, hi):
     """Guaranteed finisher: scan the whole range finely enough that some probe
     lands within ~0.35w of p (password hill dominates there), then pinpoint."""
-    step = max(1, int(0.7 * w))
+    step = max(1, int(sess.tuning.backstopStepW * w))
     x = lo
     while x <= hi and not sess.solved:
-        sess.probe(x); x += step
+        yield from sess.probe(x); x += step
     if not sess.solved:
-        _pinpoint(sess, sess.best_x, w, lo, hi, final_radius=30)
+        yield from _pinpoint(sess, sess.best_x, w, lo, hi, final_radius=sess.tuning.backstopFinalRadius)
 
 
-def _walk_and_pinpoint(sess, w, lo, hi):
-    """Initial crest from the best probe, hop to the tallest hill, then pinpoint.
-    Returns True if it reached the main hill (walk considered successful)."""
-    step = STEP_W * w
-    x, a = _crest(sess, sess.best_x, w, lo, hi)
+@_phase(PHASE_WALK)
+def _walk_and_pinpoint(sess, w, lo, hi, pinpoint=None):
+    """Initial crest from the best probe, hop to the tallest hill, then pinpoint
+    (`pinpoint(sess, x, w, lo, hi)`, default _pinpoint).  Returns True if it
+    reached the main hill (walk considered successful)."""
+    step = STEP_W * w; main_th = sess.tuning.mainHillMinAlt
+    x, a = yield from _crest(sess, sess.best_x, w, lo, hi)
     if sess.solved:
         return True
     last_dir = 1 if x <= lo else (-1 if x >= hi else None)
-    for _ in range(10):
-        if a >= MAIN_TH:
+    for _ in range(sess.tuning.walkMaxHops):
+        if a >= main_th:
             break
         k = _hopk(a)
         if last_dir is None:
             xR = _clamp(x + k * step, lo, hi); xL = _clamp(x - k * step, lo, hi)
-            aR = sess.probe(xR)
+            aR = yield from sess.probe(xR)
             if sess.solved:
                 return True
-            aL = sess.probe(xL)
+            aL = yield from sess.probe(xL)
             if sess.solved:
                 return True
             order = [1, -1] if (aR if aR is not None else -1e18) >= (aL if aL is not None else -1e18) else [-1, 1]
@@ -258,7 +431,7 @@ def _walk_and_pinpoint(sess, w, lo, hi):
             for kk in ((k,) if last_dir is None else (k, k - 1, k + 1, 1)):
                 if kk < 1:
                     continue
-                nx, na = _crest(sess, x + d * kk * step, w, lo, hi)
+                nx, na = yield from _crest(sess, x + d * kk * step, w, lo, hi)
                 if sess.solved:
                     return True
                 if na is not None and na > a + 1.0:
@@ -268,79 +441,207 @@ def _walk_and_pinpoint(sess, w, lo, hi):
         if best is None:
             break
         a, x, last_dir = best
-    reached_main = a >= MAIN_TH
-    _pinpoint(sess, sess.best_x, w, lo, hi)
+    reached_main = a >= main_th
+    yield from (pinpoint or _pinpoint)(sess, sess.best_x, w, lo, hi)
     return reached_main
 
 
-def solve(assignment, cap=600):
+def solve(assignment, cap=600, trace=None, prof=None, tuning=None, book=None):
+    if prof is None:
+        return _solve(assignment, cap, trace, None, tuning, book)
+    prof.switch(PHASES[PHASE_SCAN])
+    try:
+        return _solve(assignment, cap, trace, prof, tuning, book)
+    finally:
+        prof.switch(None)
+
+
+def solve_plain(assignment, cap=600, trace=None, prof=None, tuning=None):
+    """solve() without the opening book (Phase 1 is the plain coarse scan), as
+    solve() does by default."""
+    return solve(assignment, cap, trace, prof, tuning, NO_BOOK)
+
+
+def solve_book(assignment, cap=600, trace=None, prof=None, tuning=None):
+    """solve() with the shipped opening book (load_book()).  Opt-in: it lowers
+    the average at lengths 2-4 but can lengthen the slowest solves (d18, rows
+    1-10000: max 53 -> 55)."""
+    return solve(assignment, cap, trace, prof, tuning, load_book())
+
+
+def _solve(assignment, cap, trace, prof, tuning, book):
+    return drive(assignment, lambda L, diff: solve_steps(L, diff, cap, trace, prof, tuning, book), prof)
+
+
+def drive(assignment, make_steps, prof=None):
+    """Answer the generator `make_steps(password_length, difficulty)` with the
+    scalar (bit-exact) oracle; returns its result."""
     pw = assignment["password"]; diff = assignment["difficulty"]
     L = assignment["passwordLength"]
+    p = int(pw)
     lo, hi = numeric_range(L)
-    if L == 1:
-        lo = 0                      # a 1-digit password can be "0"
-    w = gaussian_width(L); hc = hill_count(diff)
-    sess = Session(pw, diff, lo, hi, cap=cap)
-    if sess.p < lo or sess.p > hi:
+    if p < lo or p > hi:
         return {"solved": False, "guesses": 0, "reason": "pw-out-of-range"}
-
-    # ---- PHASE 1: adaptive, ordered, early-stopping coarse scan ----
-    xs = _scan_grid(lo, hi, w, hc)
-    order = _spread_order(len(xs))
-    for idx in order:
-        a = sess.probe(xs[idx])
+    if prof is None:
+        layout = hill_layout(pw, diff)
+    else:
+        t0 = time.perf_counter_ns()
+        layout = hill_layout(pw, diff)
+        dt = time.perf_counter_ns() - t0
+        prof.add("layout", dt); prof.exclude(dt)
+    steps = make_steps(L, diff)
+    try:
+        x = next(steps)
+        while True:
+            if x == p:
+                a = math.inf
+            elif prof is None:
+                a = layout.altitude(x)
+            else:
+                t0 = time.perf_counter_ns()
+                a = layout.altitude(x)
+                dt = time.perf_counter_ns() - t0
+                prof.add("oracle", dt); prof.exclude(dt)
+            x = steps.send(a)
+    except StopIteration as done:
+        return done.value
+
+
+def solve_many(assignments, cap=600, exact=True, tuning=None, book=None):
+    """Solve a batch in lockstep: every round sends each unfinished problem the
+    answer to its pending probe, all computed by one LayoutBatch.altitude call.
+
+    Results are in input order and, with `exact`, identical to solve()'s; with
+    exact=False the oracle uses np.exp, which can differ from math.exp in the
+    last ulp and so, rarely, change a solve.
+    """
+    return drive_many(assignments, lambda L, diff: solve_steps(L, diff, cap, tuning=tuning, book=book), exact)
+
+
+def drive_many(assignments, make_steps, exact=True):
+    """drive() for a whole batch in lockstep (see solve_many)."""
+    results = [None] * len(assignments)
+    rows, gens, xs = [], [], []
+    passwords, lengths, hcs = [], [], []
+    for i, asg in enumerate(assignments):
+        L = asg["passwordLength"]; p = int(asg["password"])
+        lo, hi = numeric_range(L)
+        if p < lo or p > hi:
+            results[i] = {"solved": False, "guesses": 0, "reason": "pw-out-of-range"}
+            continue
+        steps = make_steps(L, asg["difficulty"])
+        try:
+            xs.append(next(steps))
+        except StopIteration as done:
+            results[i] = done.value
+            continue
+        rows.append(i); gens.append(steps)
+        passwords.append(p); lengths.append(len(asg["password"])); hcs.append(hill_count(asg["difficulty"]))
+    batch = LayoutBatch.from_passwords(passwords, lengths, hcs)
+    active = list(range(len(rows)))
+    while active:
+        ks = np.array(active); x = np.array(xs, dtype=np.int64)
+        alts = batch.altitude(ks, x, exact=exact)
+        alts[x == batch.p[ks]] = math.inf
+        still, next_xs = [], []
+        for k, a in zip(active, alts.tolist()):
+            try:
+                next_xs.append(gens[k].send(a))
+                still.append(k)
+            except StopIteration as done:
+                results[rows[k]] = done.value
+        active, xs = still, next_xs
+    return results
+
+
+def solve_steps(password_length, difficulty, cap=600, trace=None, prof=None, tuning=None, book=None):
+    """The solver as a generator: yields the next integer to try and expects the
+    oracle's altitude back via send() (math.inf on the password); returns the
+    result dict.  Needs no password, so any oracle (scalar, batched, remote) can
+    drive it.  `tuning` is a Tuning (None = DEFAULT_TUNING); `book` an
+    OpeningBook (None = NO_BOOK, the plain scan; load_book() for the shipped
+    solver.book.json)."""
+    L = password_length; diff = difficulty
+    lo, hi = numeric_range(L)
+    w = gaussian_width(L); hc = hill_count(diff)
+    t = DEFAULT_TUNING if tuning is None else tuning
+    bk = NO_BOOK if book is None else book
+    sess = Session(lo, hi, cap=cap, trace=trace, prof=prof, tuning=t)
+
+    # ---- PHASE 1: opening book, then the adaptive, ordered, early-stopping
+    # coarse scan (skipped if the book already found a hill core) ----
+    node = bk.root(L, hc)
+    while node is not None:
+        a = yield from sess.probe(node[0])
         if sess.solved:
             return _res(sess)
-        if a is not None and abs(a) > SCAN_EARLY_THRESH:
+        if a is None:
             break
+        node = node[1].get(bk.bucket(a))
+    xs, order = _scan_plan(lo, hi, w, hc)
+    if not any(abs(a) > t.scanEarlyThresh for a in sess.samples.values()):
+        for idx in order:
+            a = yield from sess.probe(xs[idx])
+            if sess.solved:
+                return _res(sess)
+            if a is not None and abs(a) > t.scanEarlyThresh:
+                break
 
     # ---- PHASE 2 (fast attempt) ----
-    _walk_and_pinpoint(sess, w, lo, hi)
+    sess.stage = "fast"
+    yield from _walk_and_pinpoint(sess, w, lo, hi)
     if sess.solved:
         return _res(sess)
 
     # ---- FALLBACK: complete the grid for the true global-best anchor ----
+    sess.stage = "fallback"; sess.set_phase(PHASE_FALLBACK)
     for x in xs:
-        sess.probe(x)
+        yield from sess.probe(x)
         if sess.solved:
             return _res(sess)
-    _walk_and_pinpoint(sess, w, lo, hi)
+    yield from _walk_and_pinpoint(sess, w, lo, hi)
     if sess.solved:
         return _res(sess)
 
     # ---- RECOVERY: gallop, bounded cluster sweep ----
-    _gallop(sess, sess.best_x, w, lo, hi)
+    sess.stage = "recovery"
+    yield from _gallop(sess, sess.best_x, w, lo, hi)
     if sess.solved:
         return _res(sess)
-    _pinpoint(sess, sess.best_x, w, lo, hi)
+    yield from _pinpoint(sess, sess.best_x, w, lo, hi)
     if sess.solved:
         return _res(sess)
-    _cluster_sweep(sess, w, lo, hi)
+    yield from _cluster_sweep(sess, w, lo, hi)
     if sess.solved:
         return _res(sess)
-    _pinpoint(sess, sess.best_x, w, lo, hi, final_radius=20)
+    yield from _pinpoint(sess, sess.best_x, w, lo, hi, final_radius=t.pinpointFinalRadiusWide)
     if sess.solved:
         return _res(sess)
 
     # ---- GUARANTEED BACKSTOP: fine full-range scan ----
-    _backstop(sess, w, lo, hi)
+    sess.stage = "backstop"
+    yield from _backstop(sess, w, lo, hi)
     return _res(sess)
 
 
-def _pinpoint(sess, seed_x, w, lo, hi, rounds=5, final_radius=8):
+@_phase(PHASE_PINPOINT)
+def _pinpoint(sess, seed_x, w, lo, hi, final_radius=None):
     """Iterated single-Gaussian inversion; exact once inside the near-zone."""
+    t = sess.tuning
+    if final_radius is None:
+        final_radius = t.pinpointFinalRadius
     pc = _clamp(seed_x, lo, hi)
-    off = max(1, _iround(0.25 * w))
-    for _ in range(rounds):
+    off0 = max(1, _iround(t.pinpointOffsetW * w)); off = off0
+    for _ in range(t.pinpointRounds):
         a0 = sess.samples.get(pc)
         if a0 is None:
-            a0 = sess.probe(pc)
+            a0 = yield from sess.probe(pc)
             if sess.solved:
                 return
         if a0 is None or a0 <= 0:
             break
         x1 = pc + off if (pc + off) <= hi else pc - off
-        a1 = sess.probe(x1)
+        a1 = yield from sess.probe(x1)
         if sess.solved:
             return
         if a1 is None or a1 <= 0 or x1 == pc:
@@ -356,27 +657,30 @@ def _pinpoint(sess, seed_x, w, lo, hi, rounds=5, final_radius=8):
             off = max(1, off // 4)
             continue
         pc = nc
-        off = max(1, min(off, _iround(0.25 * w)))
-    sess.probe(pc)
+        off = max(1, min(off, off0))
+    yield from sess.probe(pc)
     if sess.solved:
         return
     for d in range(1, final_radius + 1):
         for sgn in (-1, 1):
-            sess.probe(pc + sgn * d)
+            yield from sess.probe(pc + sgn * d)
             if sess.solved:
                 return
 
 
+@_phase(PHASE_CLUSTER_SWEEP)
 def _cluster_sweep(sess, w, lo, hi):
     """Guaranteed: sample every hill around the best point (step < spacing)."""
     center = sess.best_x
-    reach = _iround(28 * w)
-    step = max(1, _iround(1.2 * w))
+    reach = _iround(sess.tuning.clusterReachW * w)
+    step = max(1, _iround(sess.tuning.clusterStepW * w))
     x = max(lo, center - reach); b = min(hi, center + reach)
     while x <= b and not sess.solved:
-        sess.probe(x); x += step
+        yield from sess.probe(x); x += step
 
 
 def _res(sess):
     return {"solved": sess.solved, "guesses": sess.guesses,
-            "best_x": sess.best_x, "best_alt": sess.best_alt}
+            "best_x": sess.best_x, "best_alt": sess.best_alt,
+            "phase_guesses": dict(zip(sess.PHASES, sess.phase_guesses)),
+            "exit_phase": sess.PHASES[sess.last_phase], "exit_stage": sess.stage}
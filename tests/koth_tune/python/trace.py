@@ -1,27 +1,129 @@
-import math
-from koth_gen import (generate_assignments, altitude, true_layout, gaussian_width,
-                      numeric_range, DEFAULT_SEED, DEFAULT_DIFFICULTY)
-from solver import solve, Session, _find_crest, _walk_to_main, _pinpoint
-
-pw = "9038143964"
-diff = 60
-L = len(pw)
-lo, hi = numeric_range(L)
-w = gaussian_width(L)
-lay = true_layout(pw, diff)
-print("p=", pw, "lo=", lo, "hi=", hi, "w=", w)
-print("pw_hill_index=", lay["pw_hill_index"])
-for h in lay["hills"]:
-    print(f"  hill i={h['i']} center={h['center']:.1f} height={h['height']:.1f}  (offset_w={(h['center']-int(pw))/w:+.2f})")
-print("cluster spans:", min(h['center'] for h in lay['hills']), "->", max(h['center'] for h in lay['hills']))
-print("near-zone half-width in w:", 0.03*int(pw)/w)
-
-# manual grid
-span = hi - lo
-print("\ngrid:")
-for k in range(7):
-    x = round(lo + span*k/6)
-    print(f"  k={k} x={x} alt={altitude(pw,diff,x):.3f}")
-
-res = solve({"password": pw, "difficulty": diff, "passwordLength": L})
-print("\nresult:", res)
+"""
+Probe-level traces of solver.solve (or --solver module:function, e.g.
+ladder_snipe:solve; its module's PHASES name the phases).
+
+    python trace.py --index 17                    # replay assignment #17 (1-based), print every probe
+    python trace.py --password 9038143964         # same for an explicit password
+    python trace.py --dump d60.trace --n 100000   # trace N problems into a compact binary file
+    python trace.py --summary d60.trace           # which phase burns the guesses
+    python trace.py --show d60.trace --index 17   # print one problem from a dump, without re-solving
+    python trace.py --solver ladder_snipe --index 17
+"""
+import argparse
+import sys
+
+import numpy as np
+
+from koth_gen import DEFAULT_DIFFICULTY, DEFAULT_SEED, gaussian_width, numeric_range, true_layout
+from koth_harness import DEFAULT_CORPUS, ProbeTrace, _load_solver, load_assignments, read_traces, write_traces
+import solver
+
+solve = solver.solve
+PHASES = solver.PHASES
+
+
+def print_layout(pw, diff):
+    L = len(pw)
+    lo, hi = numeric_range(L)
+    w = gaussian_width(L)
+    lay = true_layout(pw, diff)
+    print("p=", pw, "lo=", lo, "hi=", hi, "w=", w)
+    print("pw_hill_index=", lay["pw_hill_index"])
+    for h in lay["hills"]:
+        print(f"  hill i={h['i']} center={h['center']:.1f} height={h['height']:.1f}  "
+              f"(offset_w={(h['center'] - int(pw)) / w:+.2f})")
+    print("near-zone half-width in w:", 0.03 * int(pw) / w)
+
+
+def print_records(records, pw):
+    w = gaussian_width(len(pw))
+    p = int(pw)
+    print(f"{'#':>4}  {'phase':<13}  {'x':>12}  {'(x-p)/w':>9}  {'altitude':>12}")
+    for r in records:
+        print(f"{int(r['guess']):>4}  {PHASES[r['phase']]:<13}  {int(r['x']):>12}  "
+              f"{(int(r['x']) - p) / w:>+9.3f}  {float(r['alt']):>12.3f}")
+
+
+def replay(assignment):
+    trace = ProbeTrace()
+    res = solve(assignment, trace=trace)
+    print_layout(assignment["password"], assignment["difficulty"])
+    print()
+    print_records(trace.records(), assignment["password"])
+    print("\nresult:", res)
+
+
+def dump(path, seed, n, diff, corpus):
+    rows = load_assignments(seed, n, diff, corpus)
+    trace = ProbeTrace()
+    traces = []
+    for r in rows:
+        trace.reset()
+        solve(r, trace=trace)
+        traces.append(trace.records().copy())
+    write_traces(path, traces, seed=seed, difficulty=diff)
+    print(f"wrote {path}: {n} problems, {sum(len(t) for t in traces)} probes")
+
+
+def summary(path):
+    header, offsets, records = read_traces(path)
+    count = header["count"]
+    per_problem = np.diff(offsets.astype(np.int64))
+    problem = np.repeat(np.arange(count), per_problem)
+    total = len(records)
+    print(f"{path}: seed={hex(header['seed'])} difficulty={header['difficulty']} "
+          f"problems={count} probes={total} avg={total / max(1, count):.3f}")
+    print(f"{'phase':<13}  {'guesses':>9}  {'share':>6}  {'problems':>8}  {'reach':>7}  {'avg/reached':>11}")
+    for pid, name in enumerate(PHASES):
+        mask = records["phase"] == pid
+        g = int(mask.sum())
+        reached = len(np.unique(problem[mask]))
+        if not g:
+            continue
+        print(f"{name:<13}  {g:>9}  {g / total:>6.1%}  {reached:>8}  {reached / count:>7.2%}  "
+              f"{g / reached:>11.2f}")
+    worst = np.argsort(per_problem, kind="stable")[::-1][:10]
+    print("most expensive problems (index:guesses):",
+          ", ".join(f"{header['start'] + int(k)}:{int(per_problem[k])}" for k in worst))
+
+
+def show(path, index, corpus):
+    header, offsets, records = read_traces(path)
+    k = index - header["start"]
+    r = load_assignments(header["seed"], 1, header["difficulty"], corpus, start=index)[0]
+    print_layout(r["password"], r["difficulty"])
+    print()
+    print_records(records[offsets[k]:offsets[k + 1]], r["password"])
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Probe-level traces of solver.solve.")
+    ap.add_argument("--index", type=int, help="1-based assignment index to replay / show")
+    ap.add_argument("--password", help="replay an explicit password instead of an index")
+    ap.add_argument("--dump", metavar="PATH", help="trace --n problems into PATH")
+    ap.add_argument("--summary", metavar="PATH", help="per-phase guess breakdown of a dump")
+    ap.add_argument("--show", metavar="PATH", help="print problem --index from a dump")
+    ap.add_argument("--n", type=int, default=10000)
+    ap.add_argument("--seed", type=lambda s: int(s, 0), default=DEFAULT_SEED)
+    ap.add_argument("--difficulty", type=int, default=DEFAULT_DIFFICULTY)
+    ap.add_argument("--corpus", default=DEFAULT_CORPUS)
+    ap.add_argument("--solver", metavar="module:function", default="solver:solve",
+                    help="traced solver (needs a `trace` argument); also names a dump's phases")
+    args = ap.parse_args()
+
+    solve = _load_solver(args.solver)
+    PHASES = sys.modules[solve.__module__].PHASES
+
+    if args.dump:
+        dump(args.dump, args.seed, args.n, args.difficulty, args.corpus)
+    elif args.summary:
+        summary(args.summary)
+    elif args.show and args.index:
+        show(args.show, args.index, args.corpus)
+    elif args.password:
+        replay({"password": args.password, "difficulty": args.difficulty,
+                "passwordLength": len(args.password)})
+    elif args.index:
+        replay(load_assignments(args.seed, 1, args.difficulty, args.corpus, start=args.index)[0])
+    else:
+        ap.print_help()
@@ -0,0 +1,218 @@
+"""
+Parameter tuner for solver.py (the Python counterpart of koth_tune_main.cpp).
+
+Candidate Tunings (the defaults or --load, plus mutations of it) are raced by
+successive halving: every candidate is scored on the first --min-n rows, the
+best 1/--eta go on to --eta times as many rows, and so on up to --n rows, so
+poor settings are dropped after a few hundred solves.  Rows are solved with
+solver.solve_many on a process pool, in chunks; a rung only solves the rows
+its survivors have not seen yet.  The starting tuning is kept in every rung as
+the reference, and the winner is written (same schema as the C++
+*.best.json, plus p99Guesses) only if it beats it on the full --n rows.
+
+Fitness follows the C++ tuner, totalGuesses + max-penalty * maxGuesses
++ unsolved * cap * 10 (lower is better), plus p99-weight * p99Guesses for every
+100 rows: with the default weight 1 the slowest 1% of solves count twice, so a
+lower average bought with a longer tail does not win.
+
+    python tune.py --difficulty 60 --candidates 32 --n 20000
+    python tune.py --load ../solver.diff60.best.json --brackets 4 --p99-weight 2
+    python koth_harness.py --solver solver:solve --tuning ../solver.diff60.best.json
+"""
+import argparse
+import functools
+import json
+import math
+import multiprocessing
+import os
+import random
+import time
+
+import numpy as np
+
+from koth_gen import DEFAULT_SEED
+from koth_harness import DEFAULT_CORPUS, GuessStats, load_assignment_batches
+from solver import TUNING_DEFAULTS, Tuning, load_tuning, solve_many
+
+CHUNK = 1000
+OUT_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+# (name, min, max); ints where TUNING_DEFAULTS has an int.  backstopStepW stays
+# <= 0.7 and clusterStepW <= 1.8 so the guaranteed phases keep their guarantee.
+GENE_SPECS = (
+    ("scanEarlyThresh", 50.0, 4000.0),
+    ("crestOffsetW", 0.15, 1.0),
+    ("crestRefineRatio", 1.0, 1.2),
+    ("mainHillMinAlt", 7500.0, 9800.0),
+    ("walkMaxHops", 4, 16),
+    ("pinpointOffsetW", 0.05, 0.6),
+    ("pinpointRounds", 2, 8),
+    ("pinpointFinalRadius", 2, 20),
+    ("pinpointFinalRadiusWide", 8, 40),
+    ("gallopStepW", 0.8, 3.0),
+    ("gallopStopW", 0.03, 0.3),
+    ("clusterReachW", 15.0, 35.0),
+    ("clusterStepW", 0.6, 1.8),
+    ("backstopStepW", 0.3, 0.7),
+    ("backstopFinalRadius", 10, 60),
+)
+assert [g[0] for g in GENE_SPECS] == list(TUNING_DEFAULTS)
+
+
+def mutate(knobs, rng, rate, scale=0.15):
+    """Copy of `knobs` with each gene, with probability `rate`, moved by a
+    Gaussian step of `scale` * its range (at least one gene always moves)."""
+    out = dict(knobs)
+    genes = [g for g in GENE_SPECS if rng.random() < rate] or [rng.choice(GENE_SPECS)]
+    for name, lo, hi in genes:
+        v = min(hi, max(lo, out[name] + rng.gauss(0.0, scale * (hi - lo))))
+        # 6 significant digits, as written to the JSON, so a saved tuning replays exactly.
+        out[name] = int(round(v)) if isinstance(lo, int) else float(f"{v:.6g}")
+    return out
+
+
+# ---------------------------------------------------------------------------
+# evaluation (pool workers)
+# ---------------------------------------------------------------------------
+@functools.lru_cache(maxsize=None)
+def chunk_rows(seed, difficulty, start, count, corpus):
+    return load_assignment_batches(seed, count, (difficulty,), corpus, start=start)[difficulty]
+
+
+def eval_chunk(task):
+    """Solve rows start..start+count-1 with one candidate's knobs -> (candidate, GuessStats)."""
+    cand, knobs, seed, difficulty, start, count, corpus, cap = task
+    stats = GuessStats()
+    for res in solve_many(chunk_rows(seed, difficulty, start, count, corpus), cap, tuning=Tuning(**knobs)):
+        if res["solved"]:
+            stats.add(res["guesses"])
+        else:
+            stats.unsolved += 1
+    return cand, stats.compact()
+
+
+class Score:
+    """A candidate's GuessStats over the rows seen so far, scored like the C++ tuner."""
+
+    def __init__(self, knobs):
+        self.knobs = knobs
+        self.stats = GuessStats()
+        self.rows = 0
+
+    def summary(self, cap):
+        s = self.stats
+        solved_total = int(np.dot(s.counts, np.arange(s.counts.size)))
+        return {
+            "total": solved_total + s.unsolved * cap,
+            "max": cap if s.unsolved else (s.max() or 0),
+            "p99": cap if s.unsolved > 0.01 * self.rows else (s.percentile(0.99) or 0),
+            "unsolved": s.unsolved,
+        }
+
+    def fitness(self, cap, max_penalty, p99_weight):
+        m = self.summary(cap)
+        return (m["total"] + max_penalty * m["max"] + p99_weight * m["p99"] * self.rows / 100
+                + m["unsolved"] * cap * 10.0)
+
+
+def evaluate(pool, scores, cands, rows, args):
+    """Bring every candidate in `cands` up to `rows` rows."""
+    tasks = []
+    for c in cands:
+        for start in range(scores[c].rows + 1, rows + 1, args.chunk):
+            count = min(args.chunk, rows - start + 1)
+            tasks.append((c, scores[c].knobs, args.seed, args.difficulty, args.start + start - 1, count,
+                          args.corpus, args.cap))
+    for c, stats in pool.imap_unordered(eval_chunk, tasks):
+        scores[c].stats.merge(stats)
+    for c in cands:
+        scores[c].rows = rows
+
+
+def rung_sizes(min_n, n, eta):
+    sizes = [min(min_n, n)]
+    while sizes[-1] < n:
+        sizes.append(min(n, sizes[-1] * eta))
+    return sizes
+
+
+def successive_halving(pool, seed_knobs, args, rng):
+    """One bracket; returns (winner Score, reference Score), both over args.n rows."""
+    scores = [Score(seed_knobs)] + [Score(mutate(seed_knobs, rng, args.mutation))
+                                    for _ in range(args.candidates - 1)]
+    fit = functools.partial(Score.fitness, cap=args.cap, max_penalty=args.max_penalty,
+                            p99_weight=args.p99_weight)
+    alive = list(range(len(scores)))
+    for rows in rung_sizes(args.min_n, args.n, args.eta):
+        t0 = time.time()
+        evaluate(pool, scores, sorted(set(alive) | {0}), rows, args)
+        alive.sort(key=lambda c: fit(scores[c]))
+        best, ref = scores[alive[0]], scores[0]
+        print(f"  rows={rows:>6}  candidates={len(alive):>3}  best fitness={fit(best):.1f} "
+              f"avg={best.summary(args.cap)['total'] / rows:.3f} p99={best.summary(args.cap)['p99']}  "
+              f"start avg={ref.summary(args.cap)['total'] / rows:.3f} p99={ref.summary(args.cap)['p99']}  "
+              f"{time.time() - t0:.1f}s")
+        if rows < args.n:
+            alive = alive[:max(1, math.ceil(len(alive) / args.eta))]
+    return scores[alive[0]], scores[0]
+
+
+def best_json(score, args):
+    m = score.summary(args.cap)
+    return {
+        "variant": "solver",
+        "difficulty": args.difficulty,
+        "fitness": float(f"{score.fitness(args.cap, args.max_penalty, args.p99_weight):.6g}"),
+        "avgGuesses": float(f"{m['total'] / score.rows:.6g}"),
+        "maxGuesses": m["max"],
+        "p99Guesses": m["p99"],
+        "totalGuesses": m["total"],
+        "unsolved": m["unsolved"],
+        "tuning": score.knobs,
+    }
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Successive-halving tuner for solver.py's knobs.")
+    ap.add_argument("--seed", type=lambda s: int(s, 0), default=DEFAULT_SEED)
+    ap.add_argument("--difficulty", type=int, default=60)
+    ap.add_argument("--start", type=int, default=1, help="first corpus row (keep benchmarks on other rows)")
+    ap.add_argument("--n", type=int, default=20000, help="rows the final rung (and the reference) is scored on")
+    ap.add_argument("--min-n", type=int, default=500, help="rows of the first rung")
+    ap.add_argument("--eta", type=int, default=3, help="keep 1/eta of the candidates per rung")
+    ap.add_argument("--candidates", type=int, default=27, help="per bracket, including the starting tuning")
+    ap.add_argument("--brackets", type=int, default=1, help="brackets, each seeded with the best so far")
+    ap.add_argument("--mutation", type=float, default=0.35, help="per-gene mutation probability")
+    ap.add_argument("--max-penalty", type=float, default=5.0)
+    ap.add_argument("--p99-weight", type=float, default=1.0, help="p99Guesses counted per 100 rows")
+    ap.add_argument("--cap", type=int, default=600)
+    ap.add_argument("--chunk", type=int, default=CHUNK, help="rows per pool task")
+    ap.add_argument("--workers", type=int, default=multiprocessing.cpu_count())
+    ap.add_argument("--corpus", default=DEFAULT_CORPUS)
+    ap.add_argument("--rng-seed", type=int, default=1)
+    ap.add_argument("--load", metavar="PATH", help="start from this tuning instead of the defaults")
+    ap.add_argument("--out", metavar="PATH", help="default: tests/koth_tune/solver.diff<D>.best.json")
+    args = ap.parse_args()
+    if args.eta < 2:
+        ap.error("--eta must be >= 2")
+    out = args.out or os.path.join(OUT_DIR, f"solver.diff{args.difficulty}.best.json")
+
+    rng = random.Random(args.rng_seed)
+    knobs = (load_tuning(args.load) if args.load else Tuning()).to_dict()
+    print(f"tuning difficulty={args.difficulty}  rows={args.start}..{args.start + args.n - 1}  "
+          f"rungs={rung_sizes(args.min_n, args.n, args.eta)}  candidates={args.candidates}  "
+          f"workers={args.workers}")
+    with multiprocessing.Pool(args.workers) as pool:
+        for bracket in range(1, args.brackets + 1):
+            print(f"bracket {bracket}/{args.brackets}")
+            winner, ref = successive_halving(pool, knobs, args, rng)
+            fit = functools.partial(Score.fitness, cap=args.cap, max_penalty=args.max_penalty,
+                                    p99_weight=args.p99_weight)
+            if winner is ref or fit(winner) >= fit(ref):
+                print("  no improvement over the starting tuning")
+                continue
+            knobs = winner.knobs
+            with open(out, "w") as f:
+                json.dump(best_json(winner, args), f, indent=2)
+                f.write("\n")
+            print(f"  >> saved {out}  {Tuning(**knobs)}")
@@ -0,0 +1,88 @@
+// Plain C entry points over koth_game / koth_solver for python/koth_cpp.py (ctypes).
+// Passwords cross the boundary as decimal strings or int64; results via out-pointers.
+
+#include "koth_capi.hpp"
+
+#include "koth_config.hpp"
+#include "koth_game.hpp"
+#include "koth_solver.hpp"
+
+#include <string>
+#include <vector>
+
+namespace {
+
+koth::Assignment makeAssignment(const std::string& password, int difficulty) {
+  koth::Assignment a;
+  a.difficulty = difficulty;
+  a.password = password;
+  a.passwordLength = static_cast<int>(password.size());
+  return a;
+}
+
+bool variantAt(int index, koth::SolverVariant* out) {
+  const std::vector<koth::SolverVariant> variants = koth::allSolverVariants();
+  if (index < 0 || index >= static_cast<int>(variants.size())) return false;
+  *out = variants[static_cast<size_t>(index)];
+  return true;
+}
+
+}  // namespace
+
+extern "C" {
+
+int koth_api_version() { return KOTH_CAPI_VERSION; }
+
+double koth_altitude(const char* password, int difficulty, int64_t attempted) {
+  return koth::getKingOfTheHillAltitude({password, difficulty}, attempted);
+}
+
+void koth_altitude_many(const char* password, int difficulty, const int64_t* xs, int64_t n,
+                        double* out) {
+  const koth::Server server{password, difficulty};
+  for (int64_t i = 0; i < n; ++i) out[i] = koth::getKingOfTheHillAltitude(server, xs[i]);
+}
+
+void koth_generate_passwords(uint32_t seed, int start, int count, int difficulty, int64_t* out) {
+  for (int i = 0; i < count; ++i) {
+    out[i] = koth::parsePasswordInt(koth::generateAssignmentAt(seed, start + i, difficulty).password);
+  }
+}
+
+int koth_solver_variant_count() { return static_cast<int>(koth::allSolverVariants().size()); }
+
+const char* koth_solver_variant_name(int index) {
+  koth::SolverVariant variant;
+  return variantAt(index, &variant) ? koth::solverVariantName(variant) : nullptr;
+}
+
+int koth_set_tuned_config(const char* path) {
+  koth::setTunedLadderSnipeConfigPath(path);
+  return koth::ensureTunedLadderSnipeConfigLoaded() ? 1 : 0;
+}
+
+int koth_solve(const char* password, int difficulty, int cap, int variant, int32_t* guesses,
+               int64_t* bestX, double* bestAlt) {
+  koth::SolverVariant v;
+  if (!variantAt(variant, &v)) return -1;
+  const koth::SolveResult res = koth::solve(makeAssignment(password, difficulty), cap, v);
+  if (guesses) *guesses = res.guesses;
+  if (bestX) *bestX = res.bestX;
+  if (bestAlt) *bestAlt = res.bestAlt;
+  return res.solved ? 1 : 0;
+}
+
+int koth_solve_many(const int64_t* passwords, int64_t n, int difficulty, int cap, int variant,
+                    int32_t* solved, int32_t* guesses) {
+  koth::SolverVariant v;
+  if (!variantAt(variant, &v)) return -1;
+  for (int64_t i = 0; i < n; ++i) {
+    const koth::SolveResult res =
+        koth::solve(makeAssignment(std::to_string(passwords[i]), difficulty), cap, v);
+    solved[i] = res.solved ? 1 : 0;
+    guesses[i] = res.guesses;
+  }
+  return 0;
+}
+
+}  // extern "C"
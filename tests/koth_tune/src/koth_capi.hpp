@@ -0,0 +1,39 @@
+#pragma once
+
+#include <cstdint>
+
+#ifdef _WIN32
+#define KOTH_CAPI __declspec(dllexport)
+#else
+#define KOTH_CAPI __attribute__((visibility("default")))
+#endif
+
+/** Bumped whenever a signature below changes; python/koth_cpp.py checks it. */
+#define KOTH_CAPI_VERSION 1
+
+extern "C" {
+
+KOTH_CAPI int koth_api_version();
+
+/** getKingOfTheHillAltitude for one / many attempted integers. */
+KOTH_CAPI double koth_altitude(const char* password, int difficulty, int64_t attempted);
+KOTH_CAPI void koth_altitude_many(const char* password, int difficulty, const int64_t* xs, int64_t n,
+                                  double* out);
+
+/** Passwords of rows start..start+count-1 (1-based), as in generateAssignmentAt. */
+KOTH_CAPI void koth_generate_passwords(uint32_t seed, int start, int count, int difficulty, int64_t* out);
+
+/** Solver variants by index into allSolverVariants(). */
+KOTH_CAPI int koth_solver_variant_count();
+KOTH_CAPI const char* koth_solver_variant_name(int index);
+
+/** Load a *.best.json for ladder_snipe_tuned; 1 on success. */
+KOTH_CAPI int koth_set_tuned_config(const char* path);
+
+/** 1 = solved, 0 = unsolved, -1 = bad variant. */
+KOTH_CAPI int koth_solve(const char* password, int difficulty, int cap, int variant, int32_t* guesses,
+                         int64_t* bestX, double* bestAlt);
+KOTH_CAPI int koth_solve_many(const int64_t* passwords, int64_t n, int difficulty, int cap, int variant,
+                              int32_t* solved, int32_t* guesses);
+
+}